@@ -0,0 +1,41 @@
+"""
+``GET .../hierarchy`` routes, one per service with dimension options.
+"""
+
+from typing import Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from src.utility.hierarchy import DimensionOptions
+from src.utility.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+
+def add_hierarchy_route(
+    router: APIRouter,
+    path: str,
+    get_service: Callable[[], DimensionOptions],
+    label: str,
+) -> None:
+    """
+    Serve ``get_service().hierarchy()`` at ``GET path``: the distinct
+    dimension tuples, dictionary-encoded, gzipped when accepted and
+    revalidated with ETag/304.
+    """
+
+    def hierarchy(
+        request: Request, service: DimensionOptions = Depends(get_service)
+    ) -> Response:
+        try:
+            return service.hierarchy().response(request)
+        except FileNotFoundError as exc:
+            logger.error(f"File was not found in {label}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(exc),
+            ) from exc
+
+    router.add_api_route(
+        path, hierarchy, methods=["GET"], name=f"{label.replace(' ', '_')}_hierarchy"
+    )
@@ -5,19 +5,37 @@ API routers, configuring middleware (e.g., CORS), and setting up global event
 handlers.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from src.utility.logger import AppLogger
+from src.utility.dataset_registry import DatasetRegistry
+from src.utility.dataset_watcher import DatasetWatcher
+from src.utility.response_cache import response_cache
+from src.utility.settings import settings
 from src.controller.price_controller import router as pricing_router
 from src.controller.promotion_controller import router as promotion_router
+from src.services.optimal_promotion_service.main import OptimalPromotion
 
 AppLogger.init(
     level=logging.INFO,
     log_to_file=True,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the long-lived promotion services (and load their data) once
+    OptimalPromotion.startup()
+    watcher = DatasetWatcher(settings.reload_poll_seconds)
+    watcher.start()
+    yield
+    watcher.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +43,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Dataset-Version", "ETag"],
 )
 
+
+@app.middleware("http")
+async def dataset_version_header(request: Request, call_next):
+    # Pin each dataset to one version for the whole request and report it
+    with DatasetRegistry.pinned() as used:
+        response = await call_next(request)
+    if used:
+        response.headers["X-Dataset-Version"] = ",".join(
+            f"{dataset.name}={dataset.version}" for dataset in used.values()
+        )
+    return response
+
+
 app.include_router(pricing_router)
 app.include_router(promotion_router)
 
@@ -39,3 +71,13 @@ def health_check():
 @app.get("/health", tags=["Health"])
 def health_check():
     return {"status": "ok", "message": "FastAPI server running!"}
+
+
+@app.get("/health/datasets", tags=["Health"])
+def dataset_stats():
+    return {"status": "ok", "datasets": DatasetRegistry.stats()}
+
+
+@app.get("/health/cache", tags=["Health"])
+def response_cache_stats():
+    return {"status": "ok", "cache": response_cache.stats()}
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from src.controller.hierarchy_routes import add_hierarchy_route
 from src.utility.logger import AppLogger
+from src.utility.response_cache import conditional
 from src.services.smart_pricing_service.summary import (
     SummaryFilters,
     SummaryResponse,
@@ -43,15 +45,22 @@ def get_simulation_service() -> SimulationAnalysisService:
 @router.post("/summary", response_model=SummaryResponse)
 def summary(
     payload: SummaryFilters,
+    request: Request,
+    response: Response,
     service: SummaryService = Depends(get_summary_service),
 ) -> SummaryResponse:
     try:
-        return service.build_summary(payload)
+        return conditional(request, response, service.build_summary, payload)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
 
 
 @router.post("/options", response_model=FilterOptions)
@@ -60,7 +69,7 @@ def options(
 ) -> FilterOptions:
     try:
         filters = payload
-        df = service.load_dataframe()
+        df = service.option_table()
         return service.build_options(df, filters)
     except FileNotFoundError as exc:
         raise HTTPException(
@@ -73,6 +82,9 @@ class SimulationRequest(SimulationAdjustments):
     filters: SimulationFilters | None = None
 
 
+add_hierarchy_route(router, "/hierarchy", get_summary_service, "summary")
+
+
 @router.post("/simulation", response_model=SimulationResponse)
 def simulation(
     payload: SimulationRequest,
@@ -113,7 +125,7 @@ def options(
 ) -> SimulationOptions:
     try:
         filters = payload
-        df = service._load_df()
+        df = service.option_table()
         return service.build_options(df, filters)
     except FileNotFoundError as exc:
         raise HTTPException(
@@ -127,14 +139,21 @@ def get_contribution_service() -> ContributionAnalysis:
     return ContributionAnalysis()
 
 
+add_hierarchy_route(
+    router, "/simulation/hierarchy", get_simulation_service, "simulation analysis"
+)
+
+
 @router.post("/contribution", response_model=ContributionResponse)
 def contribution_compute(
     payload: ContributionFilters,
+    request: Request,
+    response: Response,
     service: ContributionAnalysis = Depends(get_contribution_service),
 ):
     try:
         filters = payload
-        result = service.compute_contribution(filters=filters)
+        result = conditional(request, response, service.compute_contribution, filters)
         return result
     except FileNotFoundError as e:
         logger.error("File was not found in contribution analysis")
@@ -154,7 +173,7 @@ def options(
 ) -> ContributionOptions:
     try:
         filters = payload
-        df = service.load_and_clean_csv()
+        df = service.option_table()
         return service.build_options(df, filters)
     except FileNotFoundError as exc:
         logger.error("File Not Found at Contribution Analysis")
@@ -164,17 +183,24 @@ def options(
         ) from exc
 
 
+add_hierarchy_route(
+    router, "/contribution/hierarchy", get_contribution_service, "contribution analysis"
+)
+
+
 # ======================== Trend Tab ===============================
 def get_descriptive_service() -> DescriptiveAnalysis:
     return DescriptiveAnalysis()
 
 
 @router.post("/trend", response_model=DescriptiveResponse)
-def compute_descriptive_endpoint(payload: DescriptiveFilters):
+def compute_descriptive_endpoint(
+    payload: DescriptiveFilters, request: Request, response: Response
+):
     try:
         filters = payload
         service = get_descriptive_service()
-        result = service.compute_descriptive(filters)
+        result = conditional(request, response, service.compute_descriptive, filters)
         return result
     except FileNotFoundError as e:
         logger.error(f"Some error occurred in file not found :{e}")
@@ -191,7 +217,7 @@ def options(
 ) -> DescriptiveFilters:
     try:
         filters = payload
-        df = service.load_and_clean_csv()
+        df = service.option_table()
         options = service.build_options(df, filters)
         return options
     except FileNotFoundError as exc:
@@ -199,3 +225,6 @@ def options(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         ) from exc
+
+
+add_hierarchy_route(router, "/trend/hierarchy", get_descriptive_service, "trend")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import StreamingResponse
 from io import StringIO
 
@@ -28,7 +28,10 @@ from src.model.promotion.simulation import (
     SimulationOptions,
     SimulationResponse,
 )
+from src.utility.dataset_registry import DatasetRegistry
+from src.controller.hierarchy_routes import add_hierarchy_route
 from src.utility.logger import AppLogger
+from src.utility.response_cache import conditional
 
 router = APIRouter(prefix="/api/promotion", tags=["Promotion"])
 logger = AppLogger.get_logger(__name__)
@@ -37,10 +40,12 @@ logger = AppLogger.get_logger(__name__)
 @router.post("/performance", response_model=PerformanceResponse)
 def performance(
     payload: PerformanceFilters,
+    request: Request,
+    response: Response,
     service: PerformanceAnalysis = Depends(op.get_performance_analysis),
 ) -> PerformanceResponse:
     try:
-        result = service.build_performance(filters=payload)
+        result = conditional(request, response, service.build_performance, payload)
         return result
     except FileNotFoundError as exc:
         logger.error(f"File was not found in Performance:{exc}")
@@ -94,7 +99,7 @@ def options(
 ) -> FilterOptions:
     try:
         filters = payload
-        df = service._load_df()
+        df = service.option_table()
         response = service.build_options(df=df, filters=filters)
         return response
     except FileNotFoundError as exc:
@@ -104,16 +109,23 @@ def options(
         ) from exc
 
 
+add_hierarchy_route(
+    router, "/performance/hierarchy", op.get_performance_analysis, "performance"
+)
+
+
 # ======================= Past Promotion Routes ===========================
 
 
 @router.post("/past-promotion", response_model=PastPromotionResponse)
 def promotion(
     payload: PastPromotionFilters,
+    request: Request,
+    response: Response,
     service: PastPromotionAnalysis = Depends(op.get_past_performance_analysis),
 ) -> PastPromotionResponse:
     try:
-        result = service.build_past_performance(filters=payload)
+        result = conditional(request, response, service.build_past_performance, payload)
         return result
     except FileNotFoundError as exc:
         logger.error(f"File was not found in past promotion:{exc}")
@@ -133,7 +145,7 @@ def promotion_options(
 ) -> PastPromotionOptions:
     try:
         filters = payload
-        df = service._load_and_clean_df()
+        df = service.option_table()
         response = service.build_options(df=df, filters=filters)
         return response
     except FileNotFoundError as exc:
@@ -144,6 +156,11 @@ def promotion_options(
         ) from exc
 
 
+add_hierarchy_route(
+    router, "/past-promotion/hierarchy", op.get_past_performance_analysis, "promotion"
+)
+
+
 # ======================= Simulation Routes ===========================
 
 
@@ -186,3 +203,16 @@ def promotion_options(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         ) from exc
+
+
+add_hierarchy_route(router, "/simulation/hierarchy", op.get_simulation, "simulation")
+
+
+# ======================= Data Reload ===========================
+
+
+@router.post("/reload")
+def reload_datasets():
+    """Re-read the promotion data files without restarting the app."""
+    op.reload()
+    return {"status": "ok", "datasets": DatasetRegistry.stats()}
@@ -63,6 +63,10 @@ class PieChart(BaseModel):
 class EventROI(BaseModel):
     promo_index: int
     roi: float
+    # Set when no past event matched exactly and the figures blend the
+    # nearest ones (see SimulationAnalysis._estimate_event)
+    volume_uplift: Optional[float] = None
+    neighbours: int = 0
 
 
 class SimulationResponse(BaseModel):
@@ -0,0 +1,60 @@
+"""
+Value normalization rules shared by the promotion and pricing loaders. Bump
+the loaders' ``CLEANING_VERSION`` when a rule changes.
+"""
+
+from src.utility.normalization import Rule, RuleSet
+
+RETAILER_NAMES = {
+    "Target PT": "Target",
+    "Publix Total TA": "Publix",
+    "CVS Total Corp ex HI TA": "CVS",
+}
+
+# Spelling used by the consolidated pricing file read by the summary page
+SUMMARY_RETAILER_NAMES = {
+    "Target PT": "Target",
+    "Publix TOTAL TA": "Publix",
+    "CVS TOTAL Corp ex HI TA": "CVS",
+}
+
+
+def _underscores_to_spaces(value: str) -> str:
+    return value.replace("_", " ")
+
+
+PROMOTION_RULES = RuleSet(
+    "promotion",
+    [
+        Rule(
+            "promo_tactic",
+            (
+                {"unknown": "Display & TPR", "No Tactic": "Feature & TPR"},
+                {
+                    "Feature & TPR": "Feature",
+                    "Display & TPR": "Display",
+                    "Feature Only": "Feature",
+                    "Display Only": "Display",
+                    "TPR Only": "TPR",
+                },
+            ),
+        ),
+        Rule("retailer", (RETAILER_NAMES, str.upper)),
+        Rule("offer_mechanic", ({"unknown": "special x off"},)),
+        Rule(
+            "offer_type",
+            ({"unknown": "spend_reward"}, str.upper, _underscores_to_spaces),
+        ),
+    ],
+)
+
+# The pricing loaders upper-case retailer ids before mapping them
+PRICING_RULES = RuleSet(
+    "pricing",
+    [Rule("retailer_id", (str.upper, RETAILER_NAMES))],
+)
+
+SUMMARY_RULES = RuleSet(
+    "pricing.summary",
+    [Rule("retailer_id", (SUMMARY_RETAILER_NAMES, str.upper))],
+)
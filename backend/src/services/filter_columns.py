@@ -0,0 +1,31 @@
+"""Request filter field -> frame column, per page, for ``FilterSpec.from_model``."""
+
+# Brand/segment/PPG/retailer scope of the promotion pages
+PROMOTION_SCOPE = {
+    "brands": "brand_nm",
+    "segment": "segment",
+    "ppgs": "ppg_id",
+    "retailers": "retailer",
+}
+
+PROMOTION = {
+    **PROMOTION_SCOPE,
+    "offer_type": "offer_type",
+    "promo_tactics": "promo_tactic",
+    "year": "year",
+    "month": "month",
+}
+
+# One promotion event of the simulator
+PROMOTION_EVENT = {
+    "promo_tactic": "promo_tactic",
+    "offer_type": "offer_type",
+    "offer_mechanic": "offer_mechanic",
+}
+
+PRICING = {
+    "manufacturers": "manufacturer_nm",
+    "brands": "brand_nm",
+    "ppgs": "ppg_nm",
+    "retailers": "retailer_id",
+}
@@ -0,0 +1,139 @@
+"""
+Columns and dtypes each loader reads from its source CSV. Bump the loader's
+``CLEANING_VERSION`` when its schema changes.
+"""
+
+from src.utility.csv_schema import CODE, FLOAT, INTEGER, TEXT, CsvSchema
+
+# final_pricing_consolidated_file.csv
+PRICING_FILE = CsvSchema(
+    {
+        "category": TEXT,
+        "manufacturer_nm": TEXT,
+        "brand_nm": TEXT,
+        "ppg_nm": TEXT,
+        "retailer_id": TEXT,
+        "year": CODE,
+        "month": CODE,
+        "week": CODE,
+        "price": FLOAT,
+        "volume": FLOAT,
+        "revenue": FLOAT,
+        "acv_wtd_distribution": FLOAT,
+        "Distribution_coeff": FLOAT,
+        "Price_coeff": FLOAT,
+        "com_price_coef": FLOAT,
+        "xpi_final": FLOAT,
+        "re_intercept": FLOAT,
+        "d_intercept": FLOAT,
+        "baseline": FLOAT,
+        "price_driver": FLOAT,
+        "promo": FLOAT,
+        "distribution": FLOAT,
+        "holiday": FLOAT,
+        "cannibalization": FLOAT,
+        "seasonlaity": FLOAT,
+        "pantry loading": FLOAT,
+    }
+)
+
+_PRICING_DIMENSIONS = (
+    "category",
+    "manufacturer_nm",
+    "brand_nm",
+    "ppg_nm",
+    "retailer_id",
+    "year",
+    "month",
+)
+
+SUMMARY = PRICING_FILE.project(*_PRICING_DIMENSIONS, "revenue")
+
+DESCRIPTIVE = PRICING_FILE.project(
+    *_PRICING_DIMENSIONS, "price", "volume", "revenue", "acv_wtd_distribution"
+)
+
+CONTRIBUTION = PRICING_FILE.project(
+    *_PRICING_DIMENSIONS,
+    "Distribution_coeff",
+    "Price_coeff",
+    "com_price_coef",
+    "baseline",
+    "price_driver",
+    "promo",
+    "distribution",
+    "holiday",
+    "cannibalization",
+    "seasonlaity",
+    "pantry loading",
+)
+
+PRICING_SIMULATION = PRICING_FILE.project(
+    *_PRICING_DIMENSIONS,
+    "week",
+    "price",
+    "volume",
+    "acv_wtd_distribution",
+    "Distribution_coeff",
+    "Price_coeff",
+    "com_price_coef",
+    "xpi_final",
+    "re_intercept",
+    "d_intercept",
+    "distribution",
+)
+
+# df_hist_check.csv / simulation_data.csv
+PROMOTION_FILE = CsvSchema(
+    {
+        "category": TEXT,
+        "subsegment_name": TEXT,
+        "ppg_id": TEXT,
+        "retailer": TEXT,
+        "promo_tactic": TEXT,
+        "offer_mechanic": TEXT,
+        "offer_type": TEXT,
+        "year": CODE,
+        "start_date": TEXT,
+        # A 0-1 share in the history file, whole percent in the simulation file
+        "discount": FLOAT,
+        "promo_duration_days": INTEGER,
+        "baseline": FLOAT,
+        "incremental_volume": FLOAT,
+        "total_volume": FLOAT,
+        "promo_investment": FLOAT,
+        "incr_revenue": FLOAT,
+        "roi": FLOAT,
+        "volume_lift_pct": FLOAT,
+        "Redemption Rate": FLOAT,
+        "no_promo_price_unit": FLOAT,
+        "promo_price_unit": FLOAT,
+        "avg_price_unit": FLOAT,
+    }
+)
+
+PERFORMANCE = PROMOTION_FILE
+
+PAST_PROMOTION = PROMOTION_FILE.project(
+    "category",
+    "subsegment_name",
+    "ppg_id",
+    "retailer",
+    "promo_tactic",
+    "offer_mechanic",
+    "offer_type",
+    "year",
+    "start_date",
+    "discount",
+    "baseline",
+    "incremental_volume",
+    "total_volume",
+    "promo_investment",
+    "incr_revenue",
+    "roi",
+    "volume_lift_pct",
+)
+
+PROMOTION_SIMULATION = PROMOTION_FILE.project(
+    *(column for column in PROMOTION_FILE.columns if column != "year")
+)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from src.services.optimal_promotion_service.performance_analysis import (
     PerformanceAnalysis,
 )
@@ -7,17 +9,58 @@ from src.services.optimal_promotion_service.past_promotion_analysis import (
 from src.services.optimal_promotion_service.simulator import (
     SimulationAnalysis,
 )
+from src.utility.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
 
 
 class OptimalPromotion:
-    @staticmethod
-    def get_performance_analysis() -> PerformanceAnalysis:
-        return PerformanceAnalysis()
+    """
+    Owns one instance of each promotion service for the lifetime of the app.
+
+    ``startup`` is called from the FastAPI lifespan so the CSVs are parsed and
+    cleaned before the first request; the ``get_*`` methods are used as route
+    dependencies and always hand out the shared instances.
+    """
+
+    _performance: Optional[PerformanceAnalysis] = None
+    _past_performance: Optional[PastPromotionAnalysis] = None
+    _simulation: Optional[SimulationAnalysis] = None
+
+    @classmethod
+    def startup(cls) -> None:
+        cls._performance = PerformanceAnalysis()
+        cls._past_performance = PastPromotionAnalysis()
+        cls._simulation = SimulationAnalysis()
+        cls.reload()
+
+    @classmethod
+    def reload(cls) -> None:
+        """Re-read every promotion data file and swap the cleaned frames in."""
+        for service in (
+            cls.get_performance_analysis(),
+            cls.get_past_performance_analysis(),
+            cls.get_simulation(),
+        ):
+            try:
+                service.reload()
+            except FileNotFoundError as exc:
+                logger.warning(f"Skipping promotion dataset reload: {exc}")
+
+    @classmethod
+    def get_performance_analysis(cls) -> PerformanceAnalysis:
+        if cls._performance is None:
+            cls._performance = PerformanceAnalysis()
+        return cls._performance
 
-    @staticmethod
-    def get_past_performance_analysis() -> PastPromotionAnalysis:
-        return PastPromotionAnalysis()
+    @classmethod
+    def get_past_performance_analysis(cls) -> PastPromotionAnalysis:
+        if cls._past_performance is None:
+            cls._past_performance = PastPromotionAnalysis()
+        return cls._past_performance
 
-    @staticmethod
-    def get_simulation() -> SimulationAnalysis:
-        return SimulationAnalysis()
+    @classmethod
+    def get_simulation(cls) -> SimulationAnalysis:
+        if cls._simulation is None:
+            cls._simulation = SimulationAnalysis()
+        return cls._simulation
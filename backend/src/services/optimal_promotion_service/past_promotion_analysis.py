@@ -14,72 +14,84 @@ from src.model.promotion.past_promotion import (
     ComboChart,
     PastPromotionResponse,
 )
+from src.services import filter_columns, ingestion_schemas
+from src.services.cleaning_rules import PROMOTION_RULES
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.dimension_table import DimensionTable
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import FilterSpec
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.response_cache import cached_response
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "df_hist_check.csv"
+# Bump whenever the cleaning in _read_and_clean changes (invalidates snapshots)
+CLEANING_VERSION = 6
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "year",
+    "month",
+    "brand_nm",
+    "segment",
+    "ppg_id",
+    "retailer",
+    "offer_type",
+    "promo_tactic",
+)
 logger = AppLogger.get_logger(__name__)
 
 
-class PastPromotionAnalysis:
+class PastPromotionAnalysis(DimensionOptions):
+    option_columns = OPTION_COLUMNS
 
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
-        self.df_raw = self._load_and_clean_df()
+
+    @property
+    def df_raw(self) -> pd.DataFrame:
+        return self._load_and_clean_df()
+
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "promotion.past_promotion",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
 
     def _load_and_clean_df(self) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def reload(self) -> None:
+        """Re-read and re-clean the source file, then swap it in."""
+        DatasetRegistry.reload(
+            "promotion.past_promotion",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
+    def _read_and_clean(self) -> pd.DataFrame:
         if not self.data_path.exists():
             # Fallback or error handling
             msg = f"Data file not found: {self.data_path}"
             logger.error(msg)
             raise FileNotFoundError(msg)
 
-        df = pd.read_csv(self.data_path)
+        df = ingestion_schemas.PAST_PROMOTION.read(self.data_path)
 
-        # Promo Tactic Cleaning
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "unknown", "Display & TPR", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "No Tactic", "Feature & TPR", df["promo_tactic"]
-        )
-        df["segment"] = df["subsegment_name"].str.split("|").str[0]
-        df["month"] = pd.to_datetime(df["start_date"]).dt.month
+        # Promo tactic, retailer, offer mechanic & offer type cleaning
+        df = PROMOTION_RULES.apply(df)
 
-        # Standardizing Tactics
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature & TPR", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display & TPR", "Display", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature Only", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display Only", "Display", df["promo_tactic"]
+        df["segment"] = DimensionTable(df["subsegment_name"], {"segment": 0}).column(
+            "segment"
         )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "TPR Only", "TPR", df["promo_tactic"]
-        )
-
-        # Retailer Cleaning
-        df["retailer"] = np.where(
-            df["retailer"] == "Target PT", "Target", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "Publix Total TA", "Publix", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "CVS Total Corp ex HI TA", "CVS", df["retailer"]
-        )
-        df["retailer"] = df["retailer"].apply(lambda x: x.upper())
+        df["month"] = pd.to_datetime(df["start_date"]).dt.month
 
-        # ROI & Mechanics
+        # ROI
         df["ROI"] = df["roi"]
-        df["offer_mechanic"] = np.where(
-            df["offer_mechanic"] == "unknown", "special x off", df["offer_mechanic"]
-        )
 
         # Bins
         bins = [0, 0.10, 0.20, 0.30, 0.40, 0.50, 0.60, 0.70, 0.80]
@@ -97,13 +109,6 @@ class PastPromotionAnalysis:
             df["discount"], bins=bins, labels=labels, right=False
         )
 
-        # Offer Type
-        df["offer_type"] = np.where(
-            df["offer_type"] == "unknown", "spend_reward", df["offer_type"]
-        )
-        df["offer_type"] = df["offer_type"].str.upper()
-        df["offer_type"] = df["offer_type"].replace("_", " ", regex=True)
-
         # Year Standardization
         df["year"] = np.where(df["year"] == 2022, 2023, df["year"])
         df["year"] = np.where(df["year"] == 2021, 2022, df["year"])
@@ -112,10 +117,11 @@ class PastPromotionAnalysis:
         df["date"] = pd.to_datetime(
             df["year"].astype(str) + df["month"].astype(str), format="%Y%m"
         )
-        df["brand_nm"] = df["ppg_id"].str.split("|").str[2]
-        df["retailer"] = df["retailer"].apply(lambda x: x.upper())
+        df["brand_nm"] = DimensionTable(df["ppg_id"], {"brand_nm": 2}).column(
+            "brand_nm"
+        )
 
-        return df
+        return DimensionEncoder.encode(df)
 
     def _format_big_number(self, value: float) -> str:
         abs_value = abs(value)
@@ -132,30 +138,16 @@ class PastPromotionAnalysis:
     def _apply_filters(
         self, df: pd.DataFrame, filters: PastPromotionFilters
     ) -> pd.DataFrame:
-        df_fil = df.copy()
-
-        # Helper to check if filter is active (not None and not "All")
-        def is_active(f_val):
-            return f_val is not None and len(f_val) > 0 and "All" not in f_val
-
-        if is_active(filters.brands):
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-        if is_active(filters.segment):
-            df_fil = df_fil[df_fil["segment"].isin(filters.segment)]
-        if is_active(filters.ppgs):
-            df_fil = df_fil[df_fil["ppg_id"].isin(filters.ppgs)]
-        if is_active(filters.retailers):
-            df_fil = df_fil[df_fil["retailer"].isin(filters.retailers)]
-        if is_active(filters.offer_type):
-            df_fil = df_fil[df_fil["offer_type"].isin(filters.offer_type)]
-        if is_active(filters.promo_tactics):
-            df_fil = df_fil[df_fil["promo_tactic"].isin(filters.promo_tactics)]
-        if is_active(filters.year):
-            df_fil = df_fil[df_fil["year"].isin(filters.year)]
-        if is_active(filters.month):
-            df_fil = df_fil[df_fil["month"].isin(filters.month)]
-
-        return df_fil
+        dataset = self._dataset()
+        spec = FilterSpec.from_model(filters, filter_columns.PROMOTION)
+        return spec.apply(
+            df,
+            copy=False,
+            index=dataset.bitmaps,
+            partitions=dataset.partitions,
+            layout=dataset.layout,
+            selections=dataset.selections,
+        )
 
     def _calculate_metrics(self, df: pd.DataFrame) -> List[KPI]:
         df_filtered = df.copy()
@@ -241,14 +233,14 @@ class PastPromotionAnalysis:
     def _chart_uplift_vs_mechanic(self, df: pd.DataFrame) -> List[ComboChart]:
         # Filter top 5 logic
         top_offer = (
-            df.groupby("offer_mechanic")["volume_lift_pct"]
+            df.groupby("offer_mechanic", observed=True)["volume_lift_pct"]
             .mean()
             .nlargest(5)
             .reset_index()["offer_mechanic"]
             .unique()
             .tolist()
         )
-        df_mod = df.copy()
+        df_mod = DimensionEncoder.decode(df.copy(), ["offer_mechanic"])
         df_mod["offer_mechanic"] = df_mod["offer_mechanic"].apply(
             lambda x: x if x in top_offer else "Buy 5 get 2 free"
         )
@@ -283,7 +275,7 @@ class PastPromotionAnalysis:
 
     def _chart_uplift_vs_tactic(self, df: pd.DataFrame) -> List[ComboChart]:
         df3 = (
-            df.groupby(["promo_tactic"])
+            df.groupby(["promo_tactic"], observed=True)
             .agg(
                 {
                     "incr_revenue": "sum",
@@ -333,7 +325,7 @@ class PastPromotionAnalysis:
         self, df: pd.DataFrame, filters: PastPromotionFilters
     ) -> PastPromotionOptions:
         # Base scope for all dependent fields (except brand itself)
-        df_base = df.copy()
+        df_base = df
         categories = (
             df["category"].dropna().unique().tolist()
             if "category" in df.columns
@@ -350,7 +342,7 @@ class PastPromotionAnalysis:
         brands = sorted(df_base["brand_nm"].dropna().unique().tolist())
 
         # 2) Segment options -> filtered by selected brand, but NOT by segment itself
-        df_segment_scope = df_base.copy()
+        df_segment_scope = df_base
         if filters.brands:
             df_segment_scope = df_segment_scope[
                 df_segment_scope["brand_nm"].isin(filters.brands)
@@ -358,13 +350,13 @@ class PastPromotionAnalysis:
         segment = sorted(df_segment_scope["segment"].dropna().unique().tolist())
 
         # 3) PPG options -> filtered by brand + segment
-        df_ppg_scope = df_segment_scope.copy()
+        df_ppg_scope = df_segment_scope
         if filters.segment:
             df_ppg_scope = df_ppg_scope[df_ppg_scope["segment"].isin(filters.segment)]
         ppgs = sorted(df_ppg_scope["ppg_id"].dropna().unique().tolist())
 
         # 4) Retailer options -> filtered by brand + segment + ppg
-        df_retailer_scope = df_ppg_scope.copy()
+        df_retailer_scope = df_ppg_scope
         if filters.ppgs:
             df_retailer_scope = df_retailer_scope[
                 df_retailer_scope["ppg_id"].isin(filters.ppgs)
@@ -393,6 +385,7 @@ class PastPromotionAnalysis:
             month=months,
         )
 
+    @cached_response
     def build_past_performance(
         self, filters: PastPromotionFilters
     ) -> PastPromotionResponse:
@@ -13,66 +13,82 @@ from src.model.promotion.performance import (
     KPI,
     PerformanceResponse,
 )
+from src.services import filter_columns, ingestion_schemas
+from src.services.cleaning_rules import PROMOTION_RULES
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.dimension_table import DimensionTable
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import FilterSpec
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.response_cache import cached_response
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "df_hist_check.csv"
+# Bump whenever _read_and_clean or _clean changes (invalidates snapshots)
+CLEANING_VERSION = 6
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "year",
+    "month",
+    "brand_nm",
+    "segment",
+    "ppg_id",
+    "retailer",
+    "offer_type",
+    "promo_tactic",
+)
 logger = AppLogger.get_logger(__name__)
 
 
-class PerformanceAnalysis:
+class PerformanceAnalysis(DimensionOptions):
+    option_columns = OPTION_COLUMNS
 
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
 
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "promotion.performance",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
     def _load_df(
         self,
     ) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def reload(self) -> None:
+        """Re-read and re-clean the source file, then swap it in."""
+        DatasetRegistry.reload(
+            "promotion.performance",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
+    def _read_and_clean(self) -> pd.DataFrame:
         if not self.data_path.exists():
             msg = f"Data file not found: {self.data_path}"
             logger.error(msg)
             raise FileNotFoundError(msg)
 
-        df = pd.read_csv(self.data_path)
+        return self._clean(ingestion_schemas.PERFORMANCE.read(self.data_path))
 
-        df["segment"] = df["subsegment_name"].str.split("|").str[0]
+    def _clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Row-wise cleaning, so it also applies chunk by chunk."""
+        df = PROMOTION_RULES.apply(df)
+
+        df["segment"] = DimensionTable(df["subsegment_name"], {"segment": 0}).column(
+            "segment"
+        )
         df["year"] = np.where(df["year"] == 2022, 2023, df["year"])
         df["year"] = np.where(df["year"] == 2021, 2022, df["year"])
         df["month"] = pd.to_datetime(df["start_date"]).dt.month
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "unknown", "Display & TPR", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "No Tactic", "Feature & TPR", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature & TPR", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display & TPR", "Display", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature Only", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display Only", "Display", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "TPR Only", "TPR", df["promo_tactic"]
-        )
         df["ROI"] = df["roi"]
-        df["retailer"] = np.where(
-            df["retailer"] == "Target PT", "Target", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "Publix Total TA", "Publix", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "CVS Total Corp ex HI TA", "CVS", df["retailer"]
-        )
-        df["offer_mechanic"] = np.where(
-            df["offer_mechanic"] == "unknown", "special x off", df["offer_mechanic"]
-        )
         bins = [0, 0.10, 0.20, 0.30, 0.40, 0.50, 0.60, 0.70, 0.80]
         labels = [
             "0%-10%",
@@ -87,16 +103,11 @@ class PerformanceAnalysis:
         df["promo_depth"] = pd.cut(
             df["discount"], bins=bins, labels=labels, right=False
         )
-        df["offer_type"] = np.where(
-            df["offer_type"] == "unknown", "spend_reward", df["offer_type"]
-        )
-        df["offer_type"] = df["offer_type"].str.upper()
-        df["offer_type"] = df["offer_type"].replace("_", " ", regex=True)
-        df["brand_nm"] = df["ppg_id"].str.split("|").str[2]
-        df["retailer"] = df["retailer"].apply(lambda x: x.upper())
-        df["brand_nm"] = df["brand_nm"].fillna("").astype(str).str.strip()
+        ppgs = DimensionTable(df["ppg_id"], {"brand_nm": 2})
+        ppgs.table["brand_nm"] = ppgs.table["brand_nm"].str.strip()
+        df["brand_nm"] = ppgs.column("brand_nm", fill_missing="")
 
-        return df
+        return DimensionEncoder.encode(df)
 
     def format_number(self, x):
         if isinstance(x, (int, float)):
@@ -118,33 +129,16 @@ class PerformanceAnalysis:
     def _apply_filters(
         self, df: pd.DataFrame, filters: PerformanceFilters
     ) -> pd.DataFrame:
-        df_fil = df.copy()
-
-        if filters.brands and "All" not in filters.brands:
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-
-        if filters.segment and "All" not in filters.segment:
-            df_fil = df_fil[df_fil["segment"].isin(filters.segment)]
-
-        if filters.ppgs and "All" not in filters.ppgs:
-            df_fil = df_fil[df_fil["ppg_id"].isin(filters.ppgs)]
-
-        if filters.retailers and "All" not in filters.retailers:
-            df_fil = df_fil[df_fil["retailer"].isin(filters.retailers)]
-
-        if filters.offer_type and "All" not in filters.offer_type:
-            df_fil = df_fil[df_fil["offer_type"].isin(filters.offer_type)]
-
-        if filters.promo_tactics and "All" not in filters.promo_tactics:
-            df_fil = df_fil[df_fil["promo_tactic"].isin(filters.promo_tactics)]
-
-        if filters.year and "All" not in filters.year:
-            df_fil = df_fil[df_fil["year"].isin(filters.year)]
-
-        if filters.month and "All" not in filters.month:
-            df_fil = df_fil[df_fil["month"].isin(filters.month)]
-
-        return df_fil
+        dataset = self._dataset()
+        spec = FilterSpec.from_model(filters, filter_columns.PROMOTION)
+        return spec.apply(
+            df,
+            copy=False,
+            index=dataset.bitmaps,
+            partitions=dataset.partitions,
+            layout=dataset.layout,
+            selections=dataset.selections,
+        )
 
     def _df_to_table(self, df: pd.DataFrame) -> DFTable:
         columns: List[str] = [str(col) for col in df.columns]
@@ -203,7 +197,7 @@ class PerformanceAnalysis:
 
     def _offer_mechanics(self, df: pd.DataFrame) -> pd.DataFrame:
         df_new = (
-            df.groupby(["offer_mechanic", "retailer", "ppg_id"])
+            df.groupby(["offer_mechanic", "retailer", "ppg_id"], observed=True)
             .agg(
                 {
                     "baseline": "sum",
@@ -265,7 +259,7 @@ class PerformanceAnalysis:
 
     def _PPG(self, df: pd.DataFrame) -> pd.DataFrame:
         df_new = (
-            df.groupby(["ppg_id", "retailer"])
+            df.groupby(["ppg_id", "retailer"], observed=True)
             .agg(
                 {
                     "baseline": "sum",
@@ -326,7 +320,7 @@ class PerformanceAnalysis:
 
     def _subsegment(self, df: pd.DataFrame) -> pd.DataFrame:
         df_new = (
-            df.groupby(["subsegment_name", "retailer", "ppg_id"])
+            df.groupby(["subsegment_name", "retailer", "ppg_id"], observed=True)
             .agg(
                 {
                     "baseline": "sum",
@@ -388,7 +382,7 @@ class PerformanceAnalysis:
 
     def _retailer(self, df: pd.DataFrame) -> pd.DataFrame:
         df_new = (
-            df.groupby(["retailer", "ppg_id"])
+            df.groupby(["retailer", "ppg_id"], observed=True)
             .agg(
                 {
                     "baseline": "sum",
@@ -449,7 +443,7 @@ class PerformanceAnalysis:
     @staticmethod
     def build_options(df: pd.DataFrame, filters: PerformanceFilters) -> FilterOptions:
         # Base scope for all dependent fields (except brand itself)
-        df_base = df.copy()
+        df_base = df
         categories = (
             df["category"].dropna().unique().tolist()
             if "category" in df.columns
@@ -466,7 +460,7 @@ class PerformanceAnalysis:
         brands = sorted(df_base["brand_nm"].dropna().unique().tolist())
 
         # 2) Segment options -> filtered by selected brand, but NOT by segment itself
-        df_segment_scope = df_base.copy()
+        df_segment_scope = df_base
         if filters.brands:
             df_segment_scope = df_segment_scope[
                 df_segment_scope["brand_nm"].isin(filters.brands)
@@ -474,13 +468,13 @@ class PerformanceAnalysis:
         segment = sorted(df_segment_scope["segment"].dropna().unique().tolist())
 
         # 3) PPG options -> filtered by brand + segment
-        df_ppg_scope = df_segment_scope.copy()
+        df_ppg_scope = df_segment_scope
         if filters.segment:
             df_ppg_scope = df_ppg_scope[df_ppg_scope["segment"].isin(filters.segment)]
         ppgs = sorted(df_ppg_scope["ppg_id"].dropna().unique().tolist())
 
         # 4) Retailer options -> filtered by brand + segment + ppg
-        df_retailer_scope = df_ppg_scope.copy()
+        df_retailer_scope = df_ppg_scope
         if filters.ppgs:
             df_retailer_scope = df_retailer_scope[
                 df_retailer_scope["ppg_id"].isin(filters.ppgs)
@@ -532,6 +526,7 @@ class PerformanceAnalysis:
             logger.error(f"Unknown table name: {table_name}")
             raise ValueError(f"Unknown table name: {table_name}")
 
+    @cached_response
     def build_performance(self, filters: PerformanceFilters) -> PerformanceResponse:
         start_total = time.time()
         df = self._load_df()
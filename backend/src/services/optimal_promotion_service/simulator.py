@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 from pathlib import Path
-from typing import List, Any
+from typing import Dict, List, Any, Optional
 
 import numpy as np
 import pandas as pd
@@ -18,62 +18,150 @@ from src.model.promotion.simulation import (
     SalesLinePoint,
     EventROI,
 )
+from src.services import filter_columns, ingestion_schemas
+from src.services.cleaning_rules import PROMOTION_RULES
+from src.utility.composite_index import CompositeIndex
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.dimension_table import DimensionTable
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import FilterSpec, is_active
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.neighbours import NeighbourIndex
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "simulation_data.csv"
+# Bump whenever the cleaning in _read_and_clean changes (invalidates snapshots)
+CLEANING_VERSION = 6
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "brand_nm",
+    "segment",
+    "ppg_id",
+    "retailer",
+    "offer_type",
+    "promo_tactic",
+    "offer_mechanic",
+)
+# Event attributes the composite event index is keyed on
+EVENT_COLUMNS = (
+    "promo_tactic",
+    "offer_type",
+    "offer_mechanic",
+    "start_dates",
+    "promo_duration_days",
+    "discount",
+)
+# Historical events blended into the estimate of an event nothing matches
+EVENT_NEIGHBOURS = 10
+# Additive measures the estimate weights over those events
+EVENT_MEASURES = ("promo_investment", "incr_revenue", "baseline", "incremental_volume")
 logger = AppLogger.get_logger(__name__)
 
 
-def _is_active(value: List[Any] | None) -> bool:
-    return value is not None and len(value) > 0 and "All" not in value
+def _one_of(value: Any) -> List[Any] | None:
+    """Equality condition on a single optional value."""
+    return None if value is None else [value]
+
+
+def _week_start(dates: Any) -> pd.Series:
+    """Dates moved back to the Sunday before them, as event dates are indexed."""
+    dates = pd.to_datetime(pd.Series(dates))
+    return dates - pd.to_timedelta(dates.dt.dayofweek + 1, unit="D")
+
+
+def _event_week(dates: Any) -> np.ndarray:
+    """Week of year of events starting on ``dates``, taken after ``_week_start``."""
+    return _week_start(dates).dt.isocalendar().week.to_numpy(dtype=np.int64)
 
 
-class SimulationAnalysis:
+def _event_features(discount: Any, duration: Any, week: Any) -> np.ndarray:
+    """
+    Numeric event attributes compared by nearest-neighbour matching, one row
+    per event. The week of year sits on a circle so late December neighbours
+    early January.
+    """
+    angle = 2 * np.pi * (np.asarray(week, dtype=np.float64) - 1) / 52
+    return np.column_stack(
+        [
+            np.asarray(discount, dtype=np.float64),
+            np.asarray(duration, dtype=np.float64),
+            np.cos(angle),
+            np.sin(angle),
+        ]
+    )
+
+
+class SimulationAnalysis(DimensionOptions):
+    option_columns = OPTION_COLUMNS
 
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
-        self.df_raw = self._load_and_clean_df()
+
+    @property
+    def df_raw(self) -> pd.DataFrame:
+        return self._load_and_clean_df()
+
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "promotion.simulation",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
+    @staticmethod
+    def _event_index(dataset: Dataset) -> CompositeIndex:
+        """Row positions per distinct combination of the event attributes."""
+        return dataset.derived(
+            "events", lambda frame: CompositeIndex(frame, EVENT_COLUMNS)
+        )
+
+    @staticmethod
+    def _neighbour_index(dataset: Dataset) -> NeighbourIndex:
+        """Historical events per tactic/offer, searchable by similarity."""
+        return dataset.derived(
+            "event_neighbours",
+            lambda frame: NeighbourIndex(
+                frame,
+                list(filter_columns.PROMOTION_EVENT.values()),
+                _event_features(
+                    frame["discount"],
+                    frame["promo_duration_days"],
+                    _event_week(frame["start_date"]),
+                ),
+            ),
+        )
 
     def _load_and_clean_df(self) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def reload(self) -> None:
+        """Re-read and re-clean the source file, then swap it in."""
+        DatasetRegistry.reload(
+            "promotion.simulation",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
+    def _read_and_clean(self) -> pd.DataFrame:
         if not self.data_path.exists():
             msg = f"Data file not found: {self.data_path}"
             logger.error(msg)
             raise FileNotFoundError(msg)
 
-        df = pd.read_csv(self.data_path)
+        df = ingestion_schemas.PROMOTION_SIMULATION.read(self.data_path)
 
         # Text cleaning & feature engineering copied from Simulation_Tool
-        df["segment"] = df["subsegment_name"].str.split("|").str[0]
-        df["month"] = pd.to_datetime(df["start_date"]).dt.month
-
-        # Promo tactic standardization
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "unknown", "Display & TPR", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "No Tactic", "Feature & TPR", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature & TPR", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display & TPR", "Display", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Feature Only", "Feature", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "Display Only", "Display", df["promo_tactic"]
-        )
-        df["promo_tactic"] = np.where(
-            df["promo_tactic"] == "TPR Only", "TPR", df["promo_tactic"]
+        df = PROMOTION_RULES.apply(df)
+        df["segment"] = DimensionTable(df["subsegment_name"], {"segment": 0}).column(
+            "segment"
         )
+        df["month"] = pd.to_datetime(df["start_date"]).dt.month
 
         df["ROI"] = df["roi"]
-        df["offer_mechanic"] = np.where(
-            df["offer_mechanic"] == "unknown", "special x off", df["offer_mechanic"]
-        )
 
         # Discount bins
         bins = [0, 10, 20, 30, 40, 50, 60, 70, 80]
@@ -89,40 +177,18 @@ class SimulationAnalysis:
         ]
         df["promo_bins"] = pd.cut(df["discount"], bins=bins, labels=labels, right=False)
 
-        # Offer type cleaning
-        df["offer_type"] = np.where(
-            df["offer_type"] == "unknown", "spend_reward", df["offer_type"]
-        )
-        df["offer_type"] = df["offer_type"].str.upper()
-        df["offer_type"] = df["offer_type"].replace("_", " ", regex=True)
-
         # Dates normalized to last Sunday of the week
-        df["start_dates"] = pd.to_datetime(df["start_date"])
-        days_to_subtract = df["start_dates"].dt.dayofweek + 1
-        df["start_dates"] = df["start_dates"] - pd.to_timedelta(
-            days_to_subtract, unit="D"
-        )
-        df["start_dates"] = df["start_dates"].dt.date
+        df["start_dates"] = _week_start(df["start_date"]).dt.date
 
-        # Retailer cleaning
-        df["retailer"] = np.where(
-            df["retailer"] == "Target PT", "Target", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "Publix Total TA", "Publix", df["retailer"]
-        )
-        df["retailer"] = np.where(
-            df["retailer"] == "CVS Total Corp ex HI TA", "CVS", df["retailer"]
+        df["brand_nm"] = DimensionTable(df["ppg_id"], {"brand_nm": 2}).column(
+            "brand_nm"
         )
-        df["retailer"] = df["retailer"].apply(lambda x: x.upper())
 
-        df["brand_nm"] = df["ppg_id"].str.split("|").str[2]
-
-        return df
+        return DimensionEncoder.encode(df)
 
     def build_options(self, filters: GlobalFilters) -> SimulationOptions:
         """Return unique options for all global filters."""
-        df_base = self.df_raw
+        df_base = self.option_table()
         categories = (
             df_base["category"].dropna().unique().tolist()
             if "category" in df_base.columns
@@ -133,7 +199,7 @@ class SimulationAnalysis:
         brands = sorted(df_base["brand_nm"].dropna().unique().tolist())
 
         # 2) Segment options -> filtered by selected brand, but NOT by segment itself
-        df_segment_scope = df_base.copy()
+        df_segment_scope = df_base
         if filters.brands:
             df_segment_scope = df_segment_scope[
                 df_segment_scope["brand_nm"].isin(filters.brands)
@@ -141,13 +207,13 @@ class SimulationAnalysis:
         segment = sorted(df_segment_scope["segment"].dropna().unique().tolist())
 
         # 3) PPG options -> filtered by brand + segment
-        df_ppg_scope = df_segment_scope.copy()
+        df_ppg_scope = df_segment_scope
         if filters.segment:
             df_ppg_scope = df_ppg_scope[df_ppg_scope["segment"].isin(filters.segment)]
         ppgs = sorted(df_ppg_scope["ppg_id"].dropna().unique().tolist())
 
         # 4) Retailer options -> filtered by brand + segment + ppg
-        df_retailer_scope = df_ppg_scope.copy()
+        df_retailer_scope = df_ppg_scope
         if filters.ppgs:
             df_retailer_scope = df_retailer_scope[
                 df_retailer_scope["ppg_id"].isin(filters.ppgs)
@@ -174,40 +240,55 @@ class SimulationAnalysis:
             offer_mechanic=offer_mechanic,
         )
 
-    def _apply_global_filters(self, filters: GlobalFilters) -> pd.DataFrame:
-        df_fil = self.df_raw.copy()
-
-        if _is_active(filters.brands):
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-        if _is_active(filters.segment):
-            df_fil = df_fil[df_fil["segment"].isin(filters.segment)]
-        if _is_active(filters.ppgs):
-            df_fil = df_fil[df_fil["ppg_id"].isin(filters.ppgs)]
-        if _is_active(filters.retailers):
-            df_fil = df_fil[df_fil["retailer"].isin(filters.retailers)]
+    @staticmethod
+    def _take(dataset: Dataset, rows: Optional[np.ndarray]) -> pd.DataFrame:
+        frame = dataset.view()
+        return frame.copy() if rows is None else frame.take(rows)
+
+    def _apply_global_filters(
+        self, dataset: Dataset, filters: GlobalFilters
+    ) -> Optional[np.ndarray]:
+        """Positions of the rows in the global scope, None when unfiltered."""
+        spec = FilterSpec.from_model(filters, filter_columns.PROMOTION_SCOPE)
+        return spec.rows(
+            dataset.frame, index=dataset.bitmaps, selections=dataset.selections
+        )
 
-        return df_fil
+    @staticmethod
+    def _event_selection(event: SimulationEventFilters) -> Dict[str, List[Any]]:
+        """Event column -> accepted values, for the attributes the event sets."""
+        start_date = (
+            pd.to_datetime(event.start_date).date() if event.start_date else None
+        )
+        attributes = {
+            column: getattr(event, field)
+            for field, column in filter_columns.PROMOTION_EVENT.items()
+        }
+        attributes.update(
+            start_dates=_one_of(start_date),
+            promo_duration_days=_one_of(event.duration),
+            discount=_one_of(event.discount),
+        )
+        return {
+            column: values for column, values in attributes.items() if is_active(values)
+        }
 
     def _apply_event_filters(
-        self, df: pd.DataFrame, event: SimulationEventFilters
+        self,
+        dataset: Dataset,
+        global_rows: Optional[np.ndarray],
+        event: SimulationEventFilters,
     ) -> pd.DataFrame:
-        df_temp = df.copy()
-        if _is_active(event.promo_tactic):
-            df_temp = df_temp[df_temp["promo_tactic"].isin(event.promo_tactic)]
-        if _is_active(event.offer_type):
-            df_temp = df_temp[df_temp["offer_type"].isin(event.offer_type)]
-        if _is_active(event.offer_mechanic):
-            df_temp = df_temp[df_temp["offer_mechanic"].isin(event.offer_mechanic)]
-        if event.start_date:
-            df_temp = df_temp[
-                df_temp["start_dates"] == pd.to_datetime(event.start_date).date()
-            ]
-        if event.duration is not None:
-            df_temp = df_temp[df_temp["promo_duration_days"] == event.duration]
-        if event.discount is not None:
-            df_temp = df_temp[df_temp["discount"] == event.discount]
+        selection = self._event_selection(event)
+
+        # Resolve the event to its rows, then keep those in the global scope
+        rows = global_rows
+        if selection:
+            rows = self._event_index(dataset).rows(selection)
+            if global_rows is not None:
+                rows = np.intersect1d(rows, global_rows, assume_unique=True)
+        df_temp = self._take(dataset, rows)
         if event.redemption_rate is not None:
-            df_temp = df_temp.copy()
             df_temp["Redemption Rate"] = event.redemption_rate / 100.0
         return df_temp
 
@@ -217,6 +298,50 @@ class SimulationAnalysis:
         roi = (incr_rev / investment) + 1 if investment else 0.0
         return EventROI(promo_index=idx + 1, roi=round(float(roi), 2))
 
+    def _estimate_event(
+        self,
+        dataset: Dataset,
+        global_rows: Optional[np.ndarray],
+        event: SimulationEventFilters,
+        idx: int,
+    ) -> Optional[EventROI]:
+        """
+        ROI and volume uplift of an event no historical row matches exactly,
+        weighted by inverse distance over the most similar past events with
+        the same tactic/offer in the global scope. Needs the event's start
+        date, duration and discount; None otherwise.
+        """
+        if None in (event.start_date, event.duration, event.discount):
+            return None
+        selection = {
+            column: values
+            for column, values in self._event_selection(event).items()
+            if column in filter_columns.PROMOTION_EVENT.values()
+        }
+        point = _event_features(
+            event.discount, event.duration, _event_week([event.start_date])
+        )[0]
+        rows, distances = self._neighbour_index(dataset).nearest(
+            selection, point, EVENT_NEIGHBOURS, allowed=global_rows
+        )
+        if not len(rows):
+            return None
+
+        weights = 1.0 / (distances + 1e-6)
+        measures = dataset.derived(
+            "event_measures",
+            lambda frame: frame[list(EVENT_MEASURES)].to_numpy(dtype=np.float64),
+        )
+        investment, incr_rev, baseline, incr_volume = weights @ measures[rows]
+        roi = (incr_rev / investment) + 1 if investment else 0.0
+        uplift = (incr_volume / baseline) * 100 if baseline else 0.0
+        return EventROI(
+            promo_index=idx + 1,
+            roi=round(float(roi), 2),
+            volume_uplift=round(float(uplift), 2),
+            neighbours=len(rows),
+        )
+
     def _baseline_vs_promo(self, df: pd.DataFrame) -> List[SalesLinePoint]:
         baseline_sales = float(df["baseline"].sum()) if not df.empty else 0.0
         promo_sales = float(df["total_volume"].sum()) if not df.empty else 0.0
@@ -257,7 +382,8 @@ class SimulationAnalysis:
                     "promo_duration_days",
                     "discount",
                     "Redemption Rate",
-                ]
+                ],
+                observed=True,
             )
             .agg(
                 {
@@ -272,6 +398,8 @@ class SimulationAnalysis:
             )
             .reset_index()
         )
+        # Plain strings again, so the formatting below treats them as text
+        DimensionEncoder.decode(event_filtered_data)
         event_filtered_data["ROI"] = (
             event_filtered_data["incr_revenue"]
             / event_filtered_data["promo_investment"]
@@ -334,6 +462,10 @@ class SimulationAnalysis:
         df_local = df_local.apply(
             lambda col: col.round(2) if col.dtype != "object" else col
         )
+        # Discounts are read as floats; whole percents still show as "35"
+        df_local["Discount"] = df_local["Discount"].map(
+            lambda value: f"{value:g}" if isinstance(value, float) else value
+        )
 
         shape = df_local.shape[0]
         if df.shape[0] > 1000:
@@ -356,18 +488,23 @@ class SimulationAnalysis:
     ) -> SimulationResponse:
         start_total = time.time()
         logger.info("starting simulation")
-        df_global = self._apply_global_filters(global_filters)
+        dataset = self._dataset()
+        global_rows = self._apply_global_filters(dataset, global_filters)
+        df_global = self._take(dataset, global_rows)
 
         # Apply each event filter and collect results
         all_event_frames: List[pd.DataFrame] = []
         rois: List[EventROI] = []
         for idx, event in enumerate(event_filters):
-            df_event = self._apply_event_filters(df_global, event)
+            df_event = self._apply_event_filters(dataset, global_rows, event)
             if not df_event.empty:
                 df_event = df_event.copy()
                 df_event["input_number"] = idx
                 all_event_frames.append(df_event)
-            rois.append(self._roi_for_event(df_event, idx))
+            estimate = None
+            if df_event.empty:
+                estimate = self._estimate_event(dataset, global_rows, event, idx)
+            rois.append(estimate or self._roi_for_event(df_event, idx))
 
         event_df = (
             pd.concat(all_event_frames, axis=0) if all_event_frames else pd.DataFrame()
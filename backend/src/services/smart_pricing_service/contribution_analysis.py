@@ -6,10 +6,29 @@ import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
+from src.services import filter_columns, ingestion_schemas
+from src.services.cleaning_rules import PRICING_RULES
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import FilterSpec
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.response_cache import cached_response
+from src.utility.selections import SelectionCache
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "final_pricing_consolidated_file.csv"
+# Bump whenever the cleaning in _read_and_clean changes (invalidates snapshots)
+CLEANING_VERSION = 4
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "manufacturer_nm",
+    "brand_nm",
+    "ppg_nm",
+    "retailer_id",
+)
 logger = AppLogger.get_logger(__name__)
 
 
@@ -57,31 +76,37 @@ class ContributionResponse(BaseModel):
     contribution_by_driver: ContributionBreakdown
 
 
-class ContributionAnalysis:
+class ContributionAnalysis(DimensionOptions):
+    option_columns = OPTION_COLUMNS
 
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
 
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "pricing.contribution",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
     def load_and_clean_csv(
         self,
     ) -> pd.DataFrame:
+        """
+        Return the cleaned frame, loaded once per process via the registry.
+        """
+        return self._dataset().view()
+
+    def _read_and_clean(self) -> pd.DataFrame:
         """
         Load CSV and perform light cleaning shared across analytical endpoints.
         Mirror the cleaning used in other services to keep parity.
         """
         p = self.data_path
-        df = pd.read_csv(p)
+        df = ingestion_schemas.CONTRIBUTION.read(p)
         df = df.dropna(how="all")
-        df["retailer_id"] = df["retailer_id"].apply(lambda x: x.upper())
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Target PT", "Target", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Publix Total TA", "Publix", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "CVS Total Corp ex HI TA", "CVS", df["retailer_id"]
-        )
+        df = PRICING_RULES.apply(df)
         df["Distribution_coeff"] = np.where(
             df["Distribution_coeff"] >= 1, 1, df["Distribution_coeff"]
         )
@@ -127,26 +152,23 @@ class ContributionAnalysis:
         df["year"] = np.where(df["year"] == "2022", "2023", df["year"])
         df["year"] = np.where(df["year"] == "2021", "2022", df["year"])
 
-        return df
+        return DimensionEncoder.encode(df)
 
     @staticmethod
-    def apply_filters(df: pd.DataFrame, filters: ContributionFilters) -> pd.DataFrame:
+    def apply_filters(
+        df: pd.DataFrame,
+        filters: ContributionFilters,
+        index: Optional[BitmapIndex] = None,
+        selections: Optional[SelectionCache] = None,
+    ) -> pd.DataFrame:
         """
         Apply basic filters: manufacturer, brand, ppg, retailer.
         The frontend should send lists for these keys or None to skip.
         """
-        df_fil = df.copy()
-        if filters.categories and "category" in df_fil.columns:
-            df_fil = df_fil[df_fil["category"].isin(filters.categories)]
-        if filters.manufacturers and "All" not in filters.manufacturers:
-            df_fil = df_fil[df_fil["manufacturer_nm"].isin(filters.manufacturers)]
-        if filters.brands and "All" not in filters.brands:
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-        if filters.ppgs and "All" not in filters.ppgs:
-            df_fil = df_fil[df_fil["ppg_nm"].isin(filters.ppgs)]
-        if filters.retailers and "All" not in filters.retailers:
-            df_fil = df_fil[df_fil["retailer_id"].isin(filters.retailers)]
-        return df_fil
+        spec = FilterSpec.from_model(
+            filters, {"categories": "category", **filter_columns.PRICING}, ("category",)
+        )
+        return spec.apply(df, index=index, selections=selections)
 
     def _price_elasticity(
         self, df_filtered: pd.DataFrame, df_all: pd.DataFrame
@@ -158,7 +180,8 @@ class ContributionAnalysis:
 
         df_mod = (
             df_filtered.groupby(
-                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"]
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
             )
             .agg(
                 {
@@ -169,7 +192,10 @@ class ContributionAnalysis:
             .round(2)
         )
         df_mod_all = (
-            df_all.groupby(["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"])
+            df_all.groupby(
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
+            )
             .agg(
                 {
                     "Price Elasticity": "mean",
@@ -205,7 +231,8 @@ class ContributionAnalysis:
         df_all["Distribution Elasticity"] = df_all["Distribution_coeff"]
         df_mod = (
             df_filtered.groupby(
-                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"]
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
             )
             .agg(
                 {
@@ -216,7 +243,10 @@ class ContributionAnalysis:
             .round(2)
         )
         df_mod_all = (
-            df_all.groupby(["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"])
+            df_all.groupby(
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
+            )
             .agg(
                 {
                     "Distribution Elasticity": "mean",
@@ -257,7 +287,8 @@ class ContributionAnalysis:
         df_all["Cross Price Elasticity"] = df_all["com_price_coef"]
         df_mod = (
             df_filtered.groupby(
-                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"]
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
             )
             .agg(
                 {
@@ -268,7 +299,10 @@ class ContributionAnalysis:
             .round(2)
         )
         df_mod_all = (
-            df_all.groupby(["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"])
+            df_all.groupby(
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm"],
+                observed=True,
+            )
             .agg(
                 {
                     "Cross Price Elasticity": "mean",
@@ -326,7 +360,8 @@ class ContributionAnalysis:
 
         df_mod = (
             df_filtered.groupby(
-                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm", "year"]
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm", "year"],
+                observed=True,
             )
             .agg(
                 {
@@ -364,6 +399,7 @@ class ContributionAnalysis:
                 "Distribution_coeff",
                 "com_price_coef",
             ],
+            observed=True,
         ).reset_index()
 
         new_cols = [("{1} {0}".format(*tup)) for tup in df_mod.columns]
@@ -547,17 +583,21 @@ class ContributionAnalysis:
             retailers=retailers,
         )
 
+    @cached_response
     def compute_contribution(
         self,
         filters: ContributionFilters | Dict[str, Any],
     ) -> ContributionResponse:
-        df_all = self.load_and_clean_csv()
+        dataset = self._dataset()
+        df_all = dataset.view()
         filters_model = (
             filters
             if isinstance(filters, ContributionFilters)
             else ContributionFilters(**(filters or {}))
         )
-        df_filtered = self.apply_filters(df_all, filters_model)
+        df_filtered = self.apply_filters(
+            df_all, filters_model, dataset.bitmaps, dataset.selections
+        )
         price_e = self._price_elasticity(df_filtered, df_all)
         cross_price_e = self._cross_price_elasticity(df_filtered, df_all)
         distribution_e = self._distribution_elasticity(df_filtered, df_all)
@@ -5,7 +5,14 @@ import numpy as np
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 from pathlib import Path
+from src.services import ingestion_schemas
+from src.services.cleaning_rules import PRICING_RULES
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import Condition, FilterSpec, is_active
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.response_cache import cached_response
 from src.model.response import (
     DescriptiveResponse,
     TimeSeriesPoint,
@@ -15,28 +22,51 @@ from src.model.response import (
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "final_pricing_consolidated_file.csv"
+# Bump whenever _read_and_clean or _clean changes (invalidates snapshots)
+CLEANING_VERSION = 4
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "manufacturer_nm",
+    "brand_nm",
+    "ppg_nm",
+    "retailer_id",
+    "year",
+    "month",
+)
 logger = AppLogger.get_logger(__name__)
 
 
-class DescriptiveAnalysis:
+def _upper(retailers: Optional[List[str]]) -> Optional[List[str]]:
+    # Retailer ids are upper-cased at load time
+    return [r.upper() for r in retailers] if is_active(retailers) else None
+
+
+class DescriptiveAnalysis(DimensionOptions):
+    option_columns = OPTION_COLUMNS
 
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH):
         self.data_path = data_path
 
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "pricing.descriptive",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
     def load_and_clean_csv(self) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def _read_and_clean(self) -> pd.DataFrame:
         p = self.data_path
-        df = pd.read_csv(p)
+        return self._clean(ingestion_schemas.DESCRIPTIVE.read(p))
+
+    def _clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Row-wise cleaning, so it also applies chunk by chunk."""
         df = df.dropna(how="all")
-        df["retailer_id"] = df["retailer_id"].apply(lambda x: x.upper())
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Target PT", "Target", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Publix Total TA", "Publix", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "CVS Total Corp ex HI TA", "CVS", df["retailer_id"]
-        )
+        df = PRICING_RULES.apply(df)
         df["year"] = pd.to_datetime(df["year"].astype(str), format="%Y")
         df["year"] = df["year"].dt.strftime("%Y")  # **change**
         df["day"] = 1
@@ -81,63 +111,47 @@ class DescriptiveAnalysis:
         df["date"] = pd.to_datetime(
             df["year"].astype(str) + df["month"].astype(str), format="%Y%m"
         )
-        return df
+        return DimensionEncoder.encode(df)
 
     def apply_filters(
         self, df: pd.DataFrame, filters: DescriptiveFilters
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        df_fil = df.copy()
-        df_comp = pd.DataFrame(columns=df.columns)
         if not filters:
-            return df_fil, df_comp
-
-        if filters.categories and "All" not in filters.categories:
-            if "category" in df_fil.columns:
-                df_fil = df_fil[df_fil["category"].isin(filters.categories)]
-
-        if filters.manufacturers and "All" not in filters.manufacturers:
-            df_fil = df_fil[df_fil["manufacturer_nm"].isin(filters.manufacturers)]
-        if filters.brands and "All" not in filters.brands:
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-        if filters.ppgs and "All" not in filters.ppgs:
-            df_fil = df_fil[df_fil["ppg_nm"].isin(filters.ppgs)]
-        if filters.retailers and "All" not in filters.retailers:
-            rlist = [r.upper() for r in filters.retailers]
-            df_fil = df_fil[df_fil["retailer_id"].isin(rlist)]
-        if filters.years:
-            df_fil = df_fil[df_fil["year"].isin(filters.years)]
-        if filters.months:
-            try:
-                months_int = [int(m) for m in filters.months]
-                df_fil = df_fil[df_fil["date"].dt.month.isin(months_int)]
-            except Exception:
-                df_fil = df_fil[
-                    df_fil["date"].dt.month.astype(str).isin(filters.months)
-                ]
+            return df.copy(), pd.DataFrame(columns=df.columns)
+
+        period = FilterSpec(
+            [Condition("year", filters.years), Condition("month", filters.months)]
+        )
+        own = FilterSpec(
+            [
+                Condition("category", filters.categories, optional=True),
+                Condition("manufacturer_nm", filters.manufacturers),
+                Condition("brand_nm", filters.brands),
+                Condition("ppg_nm", filters.ppgs),
+                Condition("retailer_id", _upper(filters.retailers)),
+            ]
+        )
+        dataset = self._dataset()
+        indexes = {
+            "copy": False,
+            "index": dataset.bitmaps,
+            "partitions": dataset.partitions,
+            "layout": dataset.layout,
+            "selections": dataset.selections,
+        }
+        df_fil = (own + period).apply(df, **indexes)
 
+        df_comp = pd.DataFrame(columns=df.columns)
         if filters.include_competitor:
-            df_comp = df.copy()
-            if filters.competitor_manufacturers:
-                df_comp = df_comp[
-                    df_comp["manufacturer_nm"].isin(filters.competitor_manufacturers)
+            competitor = FilterSpec(
+                [
+                    Condition("manufacturer_nm", filters.competitor_manufacturers),
+                    Condition("brand_nm", filters.competitor_brands),
+                    Condition("ppg_nm", filters.competitor_ppgs),
+                    Condition("retailer_id", _upper(filters.competitor_retailers)),
                 ]
-            if filters.competitor_brands:
-                df_comp = df_comp[df_comp["brand_nm"].isin(filters.competitor_brands)]
-            if filters.competitor_ppgs:
-                df_comp = df_comp[df_comp["ppg_nm"].isin(filters.competitor_ppgs)]
-            if filters.competitor_retailers:
-                rlist_comp = [r.upper() for r in filters.competitor_retailers]
-                df_comp = df_comp[df_comp["retailer_id"].isin(rlist_comp)]
-            if filters.years:
-                df_comp = df_comp[df_comp["year"].isin(filters.years)]
-            if filters.months:
-                try:
-                    months_int = [int(m) for m in filters.months]
-                    df_comp = df_comp[df_comp["date"].dt.month.isin(months_int)]
-                except Exception:
-                    df_comp = df_comp[
-                        df_comp["date"].dt.month.astype(str).isin(filters.months)
-                    ]
+            )
+            df_comp = (competitor + period).apply(df, **indexes)
 
         return df_fil, df_comp
 
@@ -234,7 +248,7 @@ class DescriptiveAnalysis:
         )
 
         # ---- Base scope (for manu/brand/ppg/retailer) ----
-        df_base = df.copy()
+        df_base = df
 
         # NOTE: do NOT filter by year here
         if filters.months:
@@ -246,7 +260,7 @@ class DescriptiveAnalysis:
         manufacturers = sorted(df_base["manufacturer_nm"].dropna().unique().tolist())
 
         # ---- 2) Brand options (filtered by manufacturer) ----
-        df_brand_scope = df_base.copy()
+        df_brand_scope = df_base
         if filters.manufacturers:
             df_brand_scope = df_brand_scope[
                 df_brand_scope["manufacturer_nm"].isin(filters.manufacturers)
@@ -254,13 +268,13 @@ class DescriptiveAnalysis:
         brands = sorted(df_brand_scope["brand_nm"].dropna().unique().tolist())
 
         # ---- 3) PPG options (filtered by brand) ----
-        df_ppg_scope = df_brand_scope.copy()
+        df_ppg_scope = df_brand_scope
         if filters.brands:
             df_ppg_scope = df_ppg_scope[df_ppg_scope["brand_nm"].isin(filters.brands)]
         ppgs = sorted(df_ppg_scope["ppg_nm"].dropna().unique().tolist())
 
         # ---- 4) Retailer options (filtered by ppg) ----
-        df_retailer_scope = df_ppg_scope.copy()
+        df_retailer_scope = df_ppg_scope
         if filters.ppgs:
             df_retailer_scope = df_retailer_scope[
                 df_retailer_scope["ppg_nm"].isin(filters.ppgs)
@@ -268,7 +282,7 @@ class DescriptiveAnalysis:
         retailers = sorted(df_retailer_scope["retailer_id"].dropna().unique().tolist())
 
         # ---- Years & months options (do NOT filter by selected years) ----
-        df_time_scope = df.copy()
+        df_time_scope = df
         # you may optionally apply category / retailer filter here if you want them to depend
         if filters.retailers:
             df_time_scope = df_time_scope[
@@ -309,7 +323,7 @@ class DescriptiveAnalysis:
                 )
 
                 # 3) Competitor PPG options (filtered by competitor manu + competitor brand)
-                df_comp_ppg_scope = df_comp_brand_scope.copy()
+                df_comp_ppg_scope = df_comp_brand_scope
                 if filters.competitor_brands:
                     df_comp_ppg_scope = df_comp_ppg_scope[
                         df_comp_ppg_scope["brand_nm"].isin(filters.competitor_brands)
@@ -320,7 +334,7 @@ class DescriptiveAnalysis:
                 )
 
                 # 4) Competitor retailer options (optional: depend on ppgs)
-                df_comp_retailer_scope = df_comp_ppg_scope.copy()
+                df_comp_retailer_scope = df_comp_ppg_scope
                 if filters.competitor_ppgs:
                     df_comp_retailer_scope = df_comp_retailer_scope[
                         df_comp_retailer_scope["ppg_nm"].isin(filters.competitor_ppgs)
@@ -350,6 +364,7 @@ class DescriptiveAnalysis:
             competitor_retailers=competitor_retailers,
         )
 
+    @cached_response
     def compute_descriptive(self, filters: DescriptiveFilters) -> DescriptiveResponse:
         df = self.load_and_clean_csv()
         filter_obj = (
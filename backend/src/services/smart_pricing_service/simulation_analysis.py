@@ -8,10 +8,28 @@ import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
+from src.services import filter_columns, ingestion_schemas
+from src.services.cleaning_rules import PRICING_RULES
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import FilterSpec
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.selections import SelectionCache
 
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "final_pricing_consolidated_file.csv"
+# Bump whenever the cleaning in _read_and_clean changes (invalidates snapshots)
+CLEANING_VERSION = 4
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = (
+    "category",
+    "manufacturer_nm",
+    "brand_nm",
+    "ppg_nm",
+    "retailer_id",
+)
 logger = AppLogger.get_logger(__name__)
 
 
@@ -69,33 +87,38 @@ class SimulationResponse(BaseModel):
     context: Dict[str, float]
 
 
-class SimulationAnalysisService:
+class SimulationAnalysisService(DimensionOptions):
     """
     Returns a JSON-friendly payload
     for the frontend to render charts, cards, and tables.
     """
 
+    option_columns = OPTION_COLUMNS
+
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
 
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "pricing.simulation",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
     def _load_df(self) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def _read_and_clean(self) -> pd.DataFrame:
         if not self.data_path.exists():
             msg = f"Data file not found: {self.data_path}"
             logger.error(msg)
             raise FileNotFoundError(msg)
 
-        df = pd.read_csv(self.data_path)
-        df = df.dropna()
-        df["retailer_id"] = df["retailer_id"].apply(lambda x: x.upper())
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Target PT", "Target", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "Publix Total TA", "Publix", df["retailer_id"]
-        )
-        df["retailer_id"] = np.where(
-            df["retailer_id"] == "CVS Total Corp ex HI TA", "CVS", df["retailer_id"]
-        )
+        # dropna() considers every column of the file, so project afterwards
+        df = ingestion_schemas.PRICING_FILE.read(self.data_path)
+        df = ingestion_schemas.PRICING_SIMULATION.select(df.dropna())
+        df = PRICING_RULES.apply(df)
         df["year"] = pd.to_datetime(df["year"].astype(str), format="%Y")
         df["year"] = df["year"].dt.strftime("%Y")  # **change**
         df["day"] = 1
@@ -135,7 +158,7 @@ class SimulationAnalysisService:
         df["month_name"] = pd.Categorical(
             df["month_name"], categories=month_order, ordered=True
         )
-        return df
+        return DimensionEncoder.encode(df)
 
     def _convert_to_abbreviated(self, num: float) -> str:
         n = abs(num)
@@ -150,17 +173,14 @@ class SimulationAnalysisService:
         return f"{round(num / 1_000_000_000_000, 2)}T"
 
     @staticmethod
-    def _apply_filters(df: pd.DataFrame, filters: SimulationFilters) -> pd.DataFrame:
-        df_fil = df.copy()
-        if filters.manufacturers and "All" not in filters.manufacturers:
-            df_fil = df_fil[df_fil["manufacturer_nm"].isin(filters.manufacturers)]
-        if filters.brands and "All" not in filters.brands:
-            df_fil = df_fil[df_fil["brand_nm"].isin(filters.brands)]
-        if filters.ppgs and "All" not in filters.ppgs:
-            df_fil = df_fil[df_fil["ppg_nm"].isin(filters.ppgs)]
-        if filters.retailers and "All" not in filters.retailers:
-            df_fil = df_fil[df_fil["retailer_id"].isin(filters.retailers)]
-        return df_fil
+    def _apply_filters(
+        df: pd.DataFrame,
+        filters: SimulationFilters,
+        index: Optional[BitmapIndex] = None,
+        selections: Optional[SelectionCache] = None,
+    ) -> pd.DataFrame:
+        spec = FilterSpec.from_model(filters, filter_columns.PRICING)
+        return spec.apply(df, index=index, selections=selections)
 
     @staticmethod
     def _prepare_future_frame(df_fil: pd.DataFrame) -> pd.DataFrame:
@@ -183,7 +203,8 @@ class SimulationAnalysisService:
 
         df_future = (
             df_future.groupby(
-                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm", "year"]
+                ["manufacturer_nm", "brand_nm", "retailer_id", "ppg_nm", "year"],
+                observed=True,
             )
             .agg(
                 {
@@ -456,7 +477,7 @@ class SimulationAnalysisService:
         self, df: pd.DataFrame, filters: SimulationFilters
     ) -> SimulationOptions:
 
-        df_base = df.copy()
+        df_base = df
         categories = (
             df_base["category"].dropna().unique().tolist()
             if "category" in df_base.columns
@@ -467,7 +488,7 @@ class SimulationAnalysisService:
         manufacturers = sorted(df_base["manufacturer_nm"].dropna().unique().tolist())
 
         # 2) Brand options -> filtered by selected manufacturers, but NOT by brand itself
-        df_brand_scope = df_base.copy()
+        df_brand_scope = df_base
         if filters.manufacturers:
             df_brand_scope = df_brand_scope[
                 df_brand_scope["manufacturer_nm"].isin(filters.manufacturers)
@@ -476,14 +497,14 @@ class SimulationAnalysisService:
         brands = sorted(df_brand_scope["brand_nm"].dropna().unique().tolist())
 
         # 3) PPG options -> filtered by manufacturer + brand
-        df_ppg_scope = df_brand_scope.copy()
+        df_ppg_scope = df_brand_scope
         if filters.brands:
             df_ppg_scope = df_ppg_scope[df_ppg_scope["brand_nm"].isin(filters.brands)]
 
         ppgs = sorted(df_ppg_scope["ppg_nm"].dropna().unique().tolist())
 
         # 4) Retailer options -> filtered by manufacturer + brand + ppg
-        df_retailer_scope = df_ppg_scope.copy()
+        df_retailer_scope = df_ppg_scope
         if filters.ppgs:
             df_retailer_scope = df_retailer_scope[
                 df_retailer_scope["ppg_nm"].isin(filters.ppgs)
@@ -503,8 +524,11 @@ class SimulationAnalysisService:
         self, filters: SimulationFilters, adjustments: SimulationAdjustments
     ) -> SimulationResponse:
 
-        df = self._load_df()
-        df_filtered = self._apply_filters(df, filters)
+        dataset = self._dataset()
+        df = dataset.view()
+        df_filtered = self._apply_filters(
+            df, filters, dataset.bitmaps, dataset.selections
+        )
         df_future = self._prepare_future_frame(df_filtered)
         df_input = self._build_base_inputs(df_future)
 
@@ -10,11 +10,48 @@ import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
+from src.services import ingestion_schemas
+from src.services.cleaning_rules import SUMMARY_RULES
+from src.utility.dataset_registry import Dataset, DatasetRegistry
+from src.utility.encoding import DimensionEncoder
+from src.utility.filtering import Condition, FilterSpec
+from src.utility.hierarchy import DimensionOptions
 from src.utility.logger import AppLogger
+from src.utility.prefix_sums import PrefixSumIndex
+from src.utility.response_cache import cached_response
 
 # repo root -> .../RGM_Dasboard
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_PATH = ROOT_DIR / "data" / "final_pricing_consolidated_file.csv"
+# Bump whenever _read_and_clean or _clean changes (invalidates snapshots)
+CLEANING_VERSION = 4
+# Dimensions the /options cascade reads
+OPTION_COLUMNS = ("category", "manufacturer_nm", "retailer_id", "year")
+# Series the month prefix sums keep running revenue totals for
+SERIES_COLUMNS = ("category", "manufacturer_nm", "brand_nm", "ppg_nm", "retailer_id")
+MONTH_NAMES = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+# Months of each half/quarter a time period label ("2023 Q2") may name
+PERIOD_BUCKETS = {
+    "H1": range(1, 7),
+    "H2": range(7, 13),
+    "Q1": range(1, 4),
+    "Q2": range(4, 7),
+    "Q3": range(7, 10),
+    "Q4": range(10, 13),
+}
 logger = AppLogger.get_logger(__name__)
 
 
@@ -85,31 +122,50 @@ class FilterOptions(BaseModel):
     time_periods: List[str] = Field(default_factory=list)
 
 
-class Summary:
+class Summary(DimensionOptions):
     """
-    Pure-Python summary transformer. Reads the consolidated pricing file,
-    applies filters, and returns chart-ready payloads for the frontend.
+    Pure-Python summary transformer. Reads the consolidated pricing file
+    (cleaned once per process via the dataset registry), applies filters, and returns chart-ready payloads for the frontend.
     """
 
+    option_columns = OPTION_COLUMNS
+
     def __init__(self, data_path: Path = DEFAULT_DATA_PATH) -> None:
         self.data_path = data_path
 
+    def _dataset(self) -> Dataset:
+        return DatasetRegistry.get_dataset(
+            "pricing.summary",
+            self.data_path,
+            self._read_and_clean,
+            version=CLEANING_VERSION,
+        )
+
+    def prefix_sums(self) -> PrefixSumIndex:
+        """Running monthly revenue per series, for time-period totals."""
+        return self._dataset().derived(
+            "prefix_sums",
+            lambda frame: PrefixSumIndex.monthly(frame, SERIES_COLUMNS, ["revenue"]),
+        )
+
     def load_dataframe(self) -> pd.DataFrame:
+        return self._dataset().view()
+
+    def _read_and_clean(self) -> pd.DataFrame:
         if not self.data_path.exists():
             msg = f"Data file not found: {self.data_path}"
             logger.error(msg)
             raise FileNotFoundError(msg)
 
-        data = pd.read_csv(self.data_path, low_memory=False)
-        df = data.copy()
+        # dropna() considers every column of the file, so project afterwards
+        data = ingestion_schemas.PRICING_FILE.read(self.data_path, low_memory=False)
+        return self._clean(data)
 
-        retailer_map = {
-            "Target PT": "Target",
-            "Publix TOTAL TA": "Publix",
-            "CVS TOTAL Corp ex HI TA": "CVS",
-        }
-        df["retailer_id"] = df["retailer_id"].replace(retailer_map).str.upper()
-        df = df.dropna()
+    def _clean(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Row-wise cleaning, so it also applies chunk by chunk."""
+        df = data.copy()
+        df = SUMMARY_RULES.apply(df)
+        df = ingestion_schemas.SUMMARY.select(df.dropna())
 
         df["year"] = pd.to_datetime(df["year"].astype(str), format="%Y").dt.strftime(
             "%Y"
@@ -117,59 +173,72 @@ class Summary:
         df["year"] = np.where(df["year"] == "2022", "2023", df["year"])
         df["year"] = np.where(df["year"] == "2021", "2022", df["year"])
         df["day"] = 1
-        df["month_name"] = df["month"].map(
-            {
-                1: "Jan",
-                2: "Feb",
-                3: "Mar",
-                4: "Apr",
-                5: "May",
-                6: "Jun",
-                7: "Jul",
-                8: "Aug",
-                9: "Sep",
-                10: "Oct",
-                11: "Nov",
-                12: "Dec",
-            }
-        )
-        month_order = [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ]
+        df["month_name"] = df["month"].map(dict(enumerate(MONTH_NAMES, start=1)))
         df["month_name"] = pd.Categorical(
-            df["month_name"], categories=month_order, ordered=True
+            df["month_name"], categories=MONTH_NAMES, ordered=True
         )
-        return df
+        return DimensionEncoder.encode(df)
 
     @staticmethod
-    def _subset_for_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    def _period_months(period: str) -> List[int]:
+        """
+        Months a time period label ('2023', '2023 H1', '2023 Q2') spans.
+        Raises ValueError for a bucket other than H1/H2/Q1-Q4.
+        """
         if " " not in period:
-            return df[df["year"] == period].assign(time_period=period)
-
-        year, bucket = period.split(" ", 1)
-        if bucket.upper() in {"H1", "H2"}:
-            months = list(range(1, 7)) if bucket.upper() == "H1" else list(range(7, 13))
-        elif bucket.upper().startswith("Q"):
-            quarter = int(bucket[1])
-            start = (quarter - 1) * 3 + 1
-            months = [start, start + 1, start + 2]
-        else:
-            return df[df["year"] == year].assign(time_period=period)
+            return list(range(1, 13))
+        bucket = period.split(" ", 1)[1].strip().upper()
+        if bucket not in PERIOD_BUCKETS:
+            raise ValueError(
+                f"Unknown time period {period!r}: expected a year, optionally"
+                " followed by H1, H2 or Q1-Q4 (e.g. '2023', '2023 Q2')"
+            )
+        return list(PERIOD_BUCKETS[bucket])
 
-        return df[(df["year"] == year) & (df["month"].isin(months))].assign(
-            time_period=period
+    @classmethod
+    def _period_membership(cls, periods: List[str]) -> pd.DataFrame:
+        """
+        One (period, year, month, time_period) row per month each selected
+        time period spans. ``period`` is the label's position in ``periods``,
+        so a label selected twice stays two periods.
+        """
+        pairs = [
+            (position, label.split(" ", 1)[0], month, label)
+            for position, label in enumerate(periods)
+            for month in cls._period_months(label)
+        ]
+        return pd.DataFrame(pairs, columns=["period", "year", "month", "time_period"])
+
+    def _period_totals(self, membership: pd.DataFrame) -> pd.DataFrame:
+        """
+        Revenue per series and period of ``membership``, as two prefix-sum
+        lookups over each period's (contiguous) months. ``month``/
+        ``month_last`` are the first/last months with rows.
+        """
+        prefix = self.prefix_sums()
+        spans = membership.groupby("period", sort=True).agg(
+            year=("year", "first"),
+            first=("month", "min"),
+            last=("month", "max"),
+            time_period=("time_period", "first"),
         )
+        frames = []
+        for span in spans.itertuples():
+            if span.year.isdigit():
+                totals = prefix.totals(
+                    *prefix.month_range(int(span.year), span.first, span.last)
+                )
+            else:
+                totals = prefix.totals(0, 0)
+            frames.append(totals.assign(year=span.year, time_period=span.time_period))
+        if not frames:
+            frames.append(prefix.totals(0, 0).assign(year="", time_period=""))
+
+        totals = pd.concat(frames, ignore_index=True)
+        return totals.assign(
+            month=totals["first_slot"] % 12 + 1,
+            month_last=totals["last_slot"] % 12 + 1,
+        ).drop(columns=["rows", "first_slot", "last_slot"])
 
     def _format_number(self, n):
         if n is None:
@@ -190,7 +259,14 @@ class Summary:
             df_fair_share: dataframe with retailer/time filters applied (no manufacturer filter)
             df_fair_share_original: dataframe with only time filters applied (baseline for fair share)
         """
-        df_base = df.copy()
+        dataset = self._dataset()
+        # Only take effect on frames still holding the dataset's rows
+        indexes = {
+            "index": dataset.bitmaps,
+            "layout": dataset.layout,
+            "selections": dataset.selections,
+        }
+        retailers = FilterSpec([Condition("retailer_id", filters.retailers)])
 
         # if filters.categories and "category" in df_filtered.columns:
         #     df_filtered = df_filtered[df_filtered["category"].isin(filters.categories)]
@@ -199,11 +275,6 @@ class Summary:
         #         "Category filter provided but 'category' column not found; skipping category filter."
         #     )
 
-        if filters.retailers:
-            selected = [] if "All" in filters.retailers else filters.retailers
-            if selected:
-                df_base = df_base[df_base["retailer_id"].isin(selected)]
-
         time_periods = (
             None
             if not filters.time_periods or "All" in filters.time_periods
@@ -211,23 +282,20 @@ class Summary:
         )
 
         if time_periods:
-            df_fair_share = pd.concat(
-                [self._subset_for_period(df_base, p) for p in time_periods],
-                ignore_index=True,
-            )
-            df_fair_share_original = pd.concat(
-                [self._subset_for_period(df, p) for p in time_periods],
-                ignore_index=True,
+            # Period totals come from the prefix sums, no row is rescanned
+            df_fair_share_original = self._period_totals(
+                self._period_membership(time_periods)
             )
+            df_fair_share = retailers.apply(df_fair_share_original, copy=False)
         else:
+            # Only read from below, so no copy when unfiltered
+            df_base = retailers.apply(df, copy=False, **indexes)
             df_fair_share = df_base.assign(time_period=df_base["year"])
             df_fair_share_original = df.assign(time_period=df["year"])
 
-        df_filtered = df_fair_share.copy()
-        if filters.manufacturers:
-            selected = [] if "All" in filters.manufacturers else filters.manufacturers
-            if selected:
-                df_filtered = df_filtered[df_filtered["manufacturer_nm"].isin(selected)]
+        df_filtered = FilterSpec(
+            [Condition("manufacturer_nm", filters.manufacturers)]
+        ).apply(df_fair_share, copy=False, **indexes)
 
         return df_filtered, df_fair_share, df_fair_share_original
 
@@ -238,10 +306,10 @@ class Summary:
         min_year = df_filtered["year"].min()
         max_year = df_filtered["year"].max()
         month_min = df_filtered["month"].min()
-        month_max = df_filtered["month"].max()
-        start = df_filtered[df_filtered["month"] == month_min].iloc[0]
-        end = df_filtered[df_filtered["month"] == month_max].iloc[0]
-        return f"{start['month_name']} {min_year} - {end['month_name']} {max_year}"
+        # Period totals span several months; month_last holds the latest one
+        month_max = df_filtered.get("month_last", df_filtered["month"]).max()
+        start, end = MONTH_NAMES[month_min - 1], MONTH_NAMES[month_max - 1]
+        return f"{start} {min_year} - {end} {max_year}"
 
     @staticmethod
     def _kpis(df_filtered: pd.DataFrame) -> List[KPI]:
@@ -267,10 +335,14 @@ class Summary:
             return []
 
         rev_filtered = (
-            df_filtered.groupby("manufacturer_nm")["revenue"].sum().rename("revenue")
+            df_filtered.groupby("manufacturer_nm", observed=True)["revenue"]
+            .sum()
+            .rename("revenue")
         )
         rev_baseline = (
-            baseline.groupby("manufacturer_nm")["revenue"].sum().rename("revenue_fair")
+            baseline.groupby("manufacturer_nm", observed=True)["revenue"]
+            .sum()
+            .rename("revenue_fair")
         )
         total_filtered = rev_filtered.sum() or 1
         total_baseline = rev_baseline.sum() or 1
@@ -304,13 +376,13 @@ class Summary:
         period_col = "time_period" if "time_period" in df_filtered.columns else "year"
         df_mod = (
             df_filtered.assign(revenue=lambda d: d["revenue"] / 1e6)
-            .groupby(["manufacturer_nm", period_col])["revenue"]
+            .groupby(["manufacturer_nm", period_col], observed=True)["revenue"]
             .sum()
             .reset_index()
             .round(2)
         )
         series: List[RevenueSeries] = []
-        for manufacturer, group in df_mod.groupby("manufacturer_nm"):
+        for manufacturer, group in df_mod.groupby("manufacturer_nm", observed=True):
             points = [
                 SeriesPoint(period=row[period_col], value=float(row["revenue"]))
                 for _, row in group.sort_values(period_col).iterrows()
@@ -326,14 +398,18 @@ class Summary:
         period_col = "time_period" if "time_period" in df_filtered.columns else "year"
         df_mod = (
             df_filtered.assign(revenue=lambda d: d["revenue"] / 1e6)
-            .groupby(["manufacturer_nm", period_col])["revenue"]
+            .groupby(["manufacturer_nm", period_col], observed=True)["revenue"]
             .sum()
             .reset_index()
             .round(2)
         )
 
         pivot = df_mod.pivot_table(
-            index="manufacturer_nm", columns=period_col, values="revenue", fill_value=0
+            index="manufacturer_nm",
+            columns=period_col,
+            values="revenue",
+            fill_value=0,
+            observed=True,
         )
         pivot = pivot.sort_index(axis=1)
         periods = pivot.columns.tolist()
@@ -371,7 +447,7 @@ class Summary:
         if selected_manufacturers:
             filtered_df = df[df["manufacturer_nm"].isin(selected_manufacturers)]
         else:
-            filtered_df = df.copy()
+            filtered_df = df
 
         # Now build dependent options from filtered_df
         manufacturers = sorted(df["manufacturer_nm"].dropna().unique().tolist())
@@ -445,7 +521,13 @@ class Summary:
                 return hash(val) % 10_000_000
 
         # Aggregate revenue by retailer/period
-        df_mod = df.groupby(["retailer_id", period_col])["revenue"].sum().reset_index()
+        df_mod = (
+            df.groupby(["retailer_id", period_col], observed=True)["revenue"]
+            .sum()
+            .reset_index()
+        )
+        # Decoded so the "OTHERS" bucket below can share the column
+        DimensionEncoder.decode(df_mod)
 
         # Identify top retailers based on total revenue (across periods)
         top_retailers = (
@@ -584,12 +666,13 @@ class Summary:
 
         final_df = pd.merge(final_df, final_df2, on=["retailer_id"], how="left")
         df_mod = (
-            final_df.groupby(["retailer_id"])[
+            final_df.groupby(["retailer_id"], observed=True)[
                 ["rev_share_retailer", "rev_share_retailer_fair_share"]
             ]
             .mean()
             .reset_index()
         )
+        DimensionEncoder.decode(df_mod)
         df_mod["revenue_share"] = df_mod["rev_share_retailer"]
         df_mod["revenue_share"] = df_mod["revenue_share"].round(2)
         df_mod = df_mod.sort_values(by="revenue_share", ascending=False)
@@ -620,6 +703,7 @@ class Summary:
         retailer_share_list = [RetailerRevenueShare(**row) for row in df_mod_records]
         return retailer_share_list
 
+    @cached_response
     def build_summary(self, filters: SummaryFilters) -> SummaryResponse:
         df = self.load_dataframe()
         df_filtered, df_fair_share, df_fair_share_original = self._apply_filters(
@@ -0,0 +1,119 @@
+"""
+Streaming ingestion jobs for the history files.
+Each job reuses its loader's schema and row-wise cleaning.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Dict
+
+from src.services import ingestion_schemas
+from src.services.optimal_promotion_service import performance_analysis
+from src.services.smart_pricing_service import descriptive_analysis, summary
+from src.utility.logger import AppLogger
+from src.utility.streaming import Aggregate, StreamingIngest, StreamJob
+
+_PRICING_KEYS = ("category", "manufacturer_nm", "brand_nm", "ppg_nm", "retailer_id")
+
+_PROMOTION_KEYS = (
+    "retailer",
+    "segment",
+    "subsegment_name",
+    "brand_nm",
+    "ppg_id",
+    "promo_tactic",
+    "offer_type",
+    "offer_mechanic",
+)
+
+
+def jobs() -> Dict[str, StreamJob]:
+    performance = performance_analysis.PerformanceAnalysis()
+    pricing_summary = summary.Summary()
+    descriptive = descriptive_analysis.DescriptiveAnalysis()
+
+    declared = [
+        StreamJob(
+            name="promotion.performance",
+            source=performance.data_path,
+            schema=ingestion_schemas.PERFORMANCE,
+            clean=performance._clean,
+            version=performance_analysis.CLEANING_VERSION,
+            partition_by=("year",),
+            aggregates=(
+                Aggregate(
+                    "events",
+                    ("year", "month", *_PROMOTION_KEYS),
+                    (
+                        "baseline",
+                        "incremental_volume",
+                        "total_volume",
+                        "promo_investment",
+                        "incr_revenue",
+                        "volume_lift_pct",
+                        "Redemption Rate",
+                        "discount",
+                        "promo_duration_days",
+                        "no_promo_price_unit",
+                        "promo_price_unit",
+                        "avg_price_unit",
+                    ),
+                ),
+                Aggregate(
+                    "by_depth",
+                    ("year", "retailer", "brand_nm", "ppg_id", "promo_depth"),
+                    ("incr_revenue", "promo_investment", "volume_lift_pct"),
+                ),
+            ),
+        ),
+        StreamJob(
+            name="pricing.summary",
+            source=pricing_summary.data_path,
+            schema=ingestion_schemas.PRICING_FILE,
+            clean=pricing_summary._clean,
+            version=summary.CLEANING_VERSION,
+            partition_by=("year",),
+            aggregates=(
+                Aggregate("revenue", ("year", "month", *_PRICING_KEYS), ("revenue",)),
+            ),
+            read_kwargs={"low_memory": False},
+        ),
+        StreamJob(
+            name="pricing.descriptive",
+            source=descriptive.data_path,
+            schema=ingestion_schemas.DESCRIPTIVE,
+            clean=descriptive._clean,
+            version=descriptive_analysis.CLEANING_VERSION,
+            partition_by=("year",),
+            aggregates=(
+                Aggregate(
+                    "trend",
+                    ("date", *_PRICING_KEYS),
+                    ("price", "volume", "revenue", "acv_wtd_distribution"),
+                ),
+            ),
+        ),
+    ]
+    return {job.name: job for job in declared}
+
+
+def main() -> None:
+    available = jobs()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("jobs", nargs="*", metavar="job", help=", ".join(available))
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    args = parser.parse_args()
+    unknown = set(args.jobs) - set(available)
+    if unknown:
+        parser.error(f"unknown jobs: {', '.join(sorted(unknown))}")
+
+    AppLogger.init()
+    for name in args.jobs or available:
+        manifest = StreamingIngest(available[name], chunk_rows=args.chunk_rows).run()
+        print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
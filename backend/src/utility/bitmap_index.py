@@ -0,0 +1,68 @@
+"""Packed per-value row bitmaps over the dimension columns of a cached dataset."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self.rows = len(frame)
+        # column -> (distinct values, one packed bitmap per value + missing)
+        self._columns: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def bitmap(self, column: str, values: Sequence[Any]) -> np.ndarray:
+        """Packed bitmap of the rows whose ``column`` is one of ``values``."""
+        distinct, bitmaps = self._postings(column)
+        selected = np.append(
+            distinct.isin(values), any(pd.isna(value) for value in values)
+        )
+        if not selected.any():
+            return np.zeros(bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(bitmaps[selected], axis=0)
+
+    def contains(
+        self, column: str, values: Sequence[Any], rows: np.ndarray
+    ) -> np.ndarray:
+        """Per position in ``rows``: is its ``column`` one of ``values``?"""
+        bitmap = self.bitmap(column, values)
+        return ((bitmap[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+    def unpack(self, bitmap: np.ndarray) -> np.ndarray:
+        """Boolean row mask of a packed bitmap."""
+        return np.unpackbits(bitmap, count=self.rows).astype(bool)
+
+    def _postings(self, column: str) -> Tuple[pd.Index, np.ndarray]:
+        postings = self._columns.get(column)
+        if postings is None:
+            with self._lock:
+                postings = self._columns.get(column)
+                if postings is None:
+                    postings = self._build(self.frame[column])
+                    self._columns[column] = postings
+        return postings
+
+    def _build(self, series: pd.Series) -> Tuple[pd.Index, np.ndarray]:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            distinct = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+            distinct = pd.Index(uniques)
+
+        # Missing values (code -1) go to the extra last bitmap
+        slots = np.where(codes < 0, len(distinct), codes)
+        rows = np.arange(self.rows)
+        bitmaps = np.zeros((len(distinct) + 1, (self.rows + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(
+            bitmaps,
+            (slots, rows >> 3),
+            (np.uint8(0x80) >> (rows & 7)).astype(np.uint8),
+        )
+        return distinct, bitmaps
@@ -0,0 +1,16 @@
+"""
+Distinct dimension tuples of a dataset: the option cascades find the same
+values, in the same order of first appearance, as on the full frame.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import pandas as pd
+
+
+def distinct_combinations(frame: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """Distinct tuples of the ``columns`` present in ``frame``, in row order."""
+    present = [column for column in columns if column in frame.columns]
+    return frame[present].drop_duplicates(ignore_index=True)
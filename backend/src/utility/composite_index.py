@@ -0,0 +1,61 @@
+"""Hash index from the distinct tuples of a fixed set of columns to their rows."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _normalize(key: Sequence[Any]) -> Tuple[Any, ...]:
+    # NaN never equals itself, so it would never be found again
+    return tuple(None if pd.isna(value) else value for value in key)
+
+
+class CompositeIndex:
+    def __init__(self, frame: pd.DataFrame, columns: Sequence[str]) -> None:
+        self.columns = tuple(columns)
+        groups = frame.groupby(
+            list(self.columns), sort=False, observed=True, dropna=False
+        ).indices
+        keys = [key if isinstance(key, tuple) else (key,) for key in groups]
+        self.keys = pd.DataFrame(keys, columns=list(self.columns))
+        self._rows = [np.asarray(rows, dtype=np.intp) for rows in groups.values()]
+        self._slots = {_normalize(key): slot for slot, key in enumerate(keys)}
+        self._values: Dict[str, List[Any]] = {
+            column: self.keys[column].drop_duplicates().tolist()
+            for column in self.columns
+        }
+
+    def rows(self, selection: Mapping[str, Sequence[Any]]) -> np.ndarray:
+        """
+        Ascending positions of the rows whose tuple matches ``selection``
+        (indexed column -> accepted values; columns left out match all).
+        """
+        candidates = [
+            (
+                list(dict.fromkeys(selection[column]))
+                if column in selection
+                else self._values[column]
+            )
+            for column in self.columns
+        ]
+        if math.prod(len(values) for values in candidates) <= len(self.keys):
+            slots = set()
+            for key in itertools.product(*candidates):
+                slot = self._slots.get(_normalize(key))
+                if slot is not None:
+                    slots.add(slot)
+        else:
+            hit = np.ones(len(self.keys), dtype=bool)
+            for column, values in selection.items():
+                hit &= self.keys[column].isin(values).to_numpy()
+            slots = np.flatnonzero(hit)
+
+        parts = [self._rows[slot] for slot in slots]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(parts))
@@ -0,0 +1,68 @@
+"""Column projection and explicit dtypes for CSV ingestion."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping
+
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+# Column kinds
+TEXT = "text"  # read as strings
+FLOAT = "float"  # read as float64
+INTEGER = "integer"  # quantities feeding arithmetic: inferred, kept at int64
+CODE = "code"  # labels only compared or grouped: downcast to the narrowest int
+
+_READ_DTYPES = {TEXT: str, FLOAT: "float64"}
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    columns: Mapping[str, str]
+
+    def project(self, *names: str) -> "CsvSchema":
+        """Schema restricted to ``names`` (in file order)."""
+        unknown = set(names) - set(self.columns)
+        if unknown:
+            raise KeyError(f"Columns not in schema: {sorted(unknown)}")
+        return CsvSchema({c: k for c, k in self.columns.items() if c in names})
+
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Keep only the schema's columns of an already loaded frame."""
+        return df[[column for column in self.columns if column in df.columns]]
+
+    def _read_csv_kwargs(self) -> Dict[str, Any]:
+        return {
+            "usecols": lambda column: column in self.columns,
+            "dtype": {
+                column: _READ_DTYPES[kind]
+                for column, kind in self.columns.items()
+                if kind in _READ_DTYPES
+            },
+        }
+
+    def _downcast(self, df: pd.DataFrame) -> pd.DataFrame:
+        for column, kind in self.columns.items():
+            if kind == CODE and column in df.columns:
+                if is_integer_dtype(df[column]):
+                    df[column] = pd.to_numeric(df[column], downcast="integer")
+        return df
+
+    def read(self, path: Path, **kwargs: Any) -> pd.DataFrame:
+        df = pd.read_csv(path, **self._read_csv_kwargs(), **kwargs)
+        return self._downcast(df)
+
+    def read_chunks(
+        self, path: Path, chunksize: int, **kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Like ``read``, but yields frames of at most ``chunksize`` rows. Integer
+        widths are chosen per chunk, so they may differ between chunks.
+        """
+        with pd.read_csv(
+            path, chunksize=chunksize, **self._read_csv_kwargs(), **kwargs
+        ) as reader:
+            for chunk in reader:
+                yield self._downcast(chunk)
@@ -0,0 +1,310 @@
+"""
+Process-wide registry of cleaned datasets, loaded once per source file
+version and shared by every request.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.logger import AppLogger
+from src.utility.partitions import PartitionIndex
+from src.utility.selections import SelectionCache
+from src.utility.settings import settings
+from src.utility.snapshot import Fingerprint, SnapshotStore
+from src.utility.sorted_layout import SortedLayout, arrange
+
+logger = AppLogger.get_logger(__name__)
+
+Loader = Callable[[], pd.DataFrame]
+DatasetKey = Tuple[str, str]
+
+# Datasets already handed out to the current request, keyed like the registry
+_pinned: ContextVar[Optional[Dict[DatasetKey, "Dataset"]]] = ContextVar(
+    "pinned_datasets", default=None
+)
+
+
+@dataclass
+class Dataset:
+    """A cleaned frame together with the bookkeeping reported by ``stats()``."""
+
+    name: str
+    path: Path
+    frame: pd.DataFrame
+    loaded_at: float
+    load_seconds: float
+    loader: Optional[Loader] = None
+    cleaning_version: int = 1
+    source: str = "csv"
+    fingerprint: Optional[Fingerprint] = None
+    layout_columns: Tuple[str, ...] = ()
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def rows(self) -> int:
+        return int(len(self.frame))
+
+    @property
+    def version(self) -> str:
+        """Short id of the source file contents plus the cleaning version."""
+        if self.fingerprint is None:
+            return f"{int(self.loaded_at)}.v{self.cleaning_version}"
+        return self.fingerprint.key(self.cleaning_version)
+
+    def view(self) -> pd.DataFrame:
+        """Shallow copy of the cached frame (see ``DatasetRegistry``)."""
+        return self.frame.copy(deep=False)
+
+    def derived(self, name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        ``build(frame)``, computed on first use and cached with this dataset
+        version. Concurrent first calls wait for a single build.
+
+        This is the lifetime of every structure computed from a cleaned frame
+        (indexes, lookup tables, caches): built at most once per version and
+        dropped with it, since a reload creates a new ``Dataset``.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = build(self.frame)
+                    self._derived[name] = value
+        return value
+
+    @property
+    def bitmaps(self) -> BitmapIndex:
+        """Row bitmaps per dimension value, for ``FilterSpec.apply``."""
+        return self.derived("bitmaps", BitmapIndex)
+
+    @property
+    def partitions(self) -> PartitionIndex:
+        """Row positions per (year, month), for ``FilterSpec.apply``."""
+        return self.derived("partitions", PartitionIndex)
+
+    @property
+    def layout(self) -> Optional[SortedLayout]:
+        """Key ranges of the sorted rows, when the dataset has a sorted layout."""
+        if not self.layout_columns:
+            return None
+        return self.derived(
+            "layout", lambda frame: SortedLayout(frame, self.layout_columns)
+        )
+
+    @property
+    def selections(self) -> SelectionCache:
+        """Row positions of recently used filters, for ``FilterSpec.apply``."""
+        return self.derived(
+            "selections",
+            lambda frame: SelectionCache(frame, settings.selection_cache_entries),
+        )
+
+    def is_stale(self) -> bool:
+        """True when the source file's size or mtime no longer match."""
+        if self.fingerprint is None or not self.path.exists():
+            return False
+        stat = self.path.stat()
+        return (stat.st_size, stat.st_mtime_ns) != (
+            self.fingerprint.size,
+            self.fingerprint.mtime_ns,
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        selections = self._derived.get("selections")
+        return {
+            "name": self.name,
+            "path": str(self.path),
+            "rows": self.rows,
+            "columns": int(self.frame.shape[1]),
+            "loaded_at": time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(self.loaded_at)
+            ),
+            "load_seconds": round(self.load_seconds, 3),
+            "source": self.source,
+            "version": self.version,
+            "selections": selections.stats() if selections is not None else None,
+        }
+
+
+class DatasetRegistry:
+    """
+    Loads each dataset once and shares it across requests.
+
+    Frames handed out by ``get`` are shallow copies of the cached frame: they
+    share the underlying buffers, so callers must treat them as read-only and
+    ``.copy()`` before mutating values in place. Adding or replacing columns
+    on the returned frame is safe and does not leak into the cache.
+    """
+
+    _datasets: Dict[DatasetKey, Dataset] = {}
+    _locks: Dict[DatasetKey, threading.Lock] = {}
+    _guard = threading.Lock()
+
+    @classmethod
+    def _key(cls, name: str, path: Path) -> DatasetKey:
+        return name, str(path)
+
+    @classmethod
+    def _lock_for(cls, key: DatasetKey) -> threading.Lock:
+        with cls._guard:
+            return cls._locks.setdefault(key, threading.Lock())
+
+    @classmethod
+    def get_dataset(
+        cls, name: str, path: Path, loader: Loader, version: int = 1
+    ) -> Dataset:
+        """
+        Return the cached dataset, running ``loader`` on first use.
+        Concurrent first requests for the same dataset wait for a single load.
+        """
+        key = cls._key(name, path)
+        pinned = _pinned.get()
+        if pinned is not None and key in pinned:
+            return pinned[key]
+
+        dataset = cls._datasets.get(key)
+        if dataset is None:
+            with cls._lock_for(key):
+                dataset = cls._datasets.get(key)
+                if dataset is None:
+                    dataset = cls._load(name, path, loader, version)
+                    cls._datasets[key] = dataset
+
+        if pinned is not None:
+            pinned[key] = dataset
+        return dataset
+
+    @classmethod
+    def get(
+        cls, name: str, path: Path, loader: Loader, version: int = 1
+    ) -> pd.DataFrame:
+        return cls.get_dataset(name, path, loader, version).view()
+
+    @classmethod
+    def _load(cls, name: str, path: Path, loader: Loader, version: int) -> Dataset:
+        start = time.time()
+        path = Path(path)
+        fingerprint = Fingerprint.of(path) if path.exists() else None
+
+        layout = tuple(settings.sorted_layouts.get(name, ()))
+
+        frame, source = None, "csv"
+        if fingerprint is None or not SnapshotStore.enabled():
+            frame = arrange(loader(), layout)
+        else:
+            # Only one worker process parses the CSV; the rest wait here and
+            # then map the snapshot it wrote.
+            with SnapshotStore.lock(name, path):
+                frame = SnapshotStore.read(name, path, fingerprint, version)
+                source = "snapshot" if frame is not None else "csv"
+                if frame is None:
+                    frame = arrange(loader(), layout)
+                    SnapshotStore.write(name, path, fingerprint, version, frame)
+                    # Swap the private copy for the shared mapping
+                    mapped = SnapshotStore.read(name, path, fingerprint, version)
+                    if mapped is not None:
+                        frame = mapped
+            # No-op unless the snapshot predates the configured layout
+            frame = arrange(frame, layout)
+
+        elapsed = time.time() - start
+        logger.info(
+            "Loaded dataset %s from %s | rows=%s | %.3f seconds",
+            name,
+            source,
+            len(frame),
+            elapsed,
+        )
+        return Dataset(
+            name=name,
+            path=path,
+            frame=frame,
+            loaded_at=time.time(),
+            load_seconds=elapsed,
+            loader=loader,
+            cleaning_version=version,
+            source=source,
+            fingerprint=fingerprint,
+            layout_columns=layout,
+        )
+
+    @classmethod
+    def reload(cls, name: str, path: Path, loader: Loader, version: int = 1) -> Dataset:
+        """
+        Re-run ``loader`` and swap the result in. Requests keep receiving the
+        previous frame until the new one is fully loaded and cleaned.
+        """
+        key = cls._key(name, path)
+        with cls._lock_for(key):
+            dataset = cls._load(name, path, loader, version)
+            # A single dict assignment: in-flight requests keep the frame they
+            # already hold, new lookups see the new one
+            cls._datasets[key] = dataset
+        return dataset
+
+    @classmethod
+    def refresh_stale(cls, stable: Callable[[Dataset], bool] = lambda _: True) -> int:
+        """
+        Reload every dataset whose source file changed on disk and for which
+        ``stable`` agrees the change is complete. Returns the number reloaded.
+        A failed reload is logged and the previous version stays in service.
+        """
+        reloaded = 0
+        for dataset in list(cls._datasets.values()):
+            if dataset.loader is None or not dataset.is_stale():
+                continue
+            if not stable(dataset):
+                continue
+            try:
+                cls.reload(
+                    dataset.name,
+                    dataset.path,
+                    dataset.loader,
+                    dataset.cleaning_version,
+                )
+                reloaded += 1
+            except Exception as exc:
+                logger.error(f"Reload of {dataset.name} failed, keeping old: {exc}")
+        return reloaded
+
+    @classmethod
+    @contextmanager
+    def pinned(cls) -> Iterator[Dict[DatasetKey, Dataset]]:
+        """
+        Pin dataset versions for the duration of a request. Yields the
+        datasets the request touched, so callers can report their versions.
+        """
+        used: Dict[DatasetKey, Dataset] = {}
+        token = _pinned.set(used)
+        try:
+            yield used
+        finally:
+            _pinned.reset(token)
+
+    @classmethod
+    def invalidate(cls, name: Optional[str] = None) -> None:
+        """Drop one dataset (all source paths) or, with no name, every dataset."""
+        with cls._guard:
+            for key in list(cls._datasets):
+                if name is None or key[0] == name:
+                    cls._datasets.pop(key, None)
+
+    @classmethod
+    def datasets(cls) -> List[Dataset]:
+        return list(cls._datasets.values())
+
+    @classmethod
+    def stats(cls) -> List[Dict[str, Any]]:
+        return [dataset.describe() for dataset in list(cls._datasets.values())]
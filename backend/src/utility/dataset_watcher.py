@@ -0,0 +1,66 @@
+"""Background hot reload of data files that have changed and stopped changing."""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.utility.dataset_registry import DatasetRegistry
+from src.utility.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+
+class DatasetWatcher:
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Last seen (size, mtime_ns) of files that changed but are not yet reloaded
+        self._pending: Dict[str, Tuple[int, int]] = {}
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="dataset-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching data files every {self.interval:g}s for changes")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as exc:
+                logger.error(f"Dataset watcher poll failed: {exc}")
+
+    def poll_once(self) -> int:
+        # A changed file is reloaded once its size and mtime held still for a
+        # whole poll interval; decided per file, before any reload starts
+        settled = set()
+        pending: Dict[str, Tuple[int, int]] = {}
+        for dataset in DatasetRegistry.datasets():
+            if not dataset.is_stale():
+                continue
+            path = str(dataset.path)
+            stat = dataset.path.stat()
+            current = (stat.st_size, stat.st_mtime_ns)
+            if self._pending.get(path) == current:
+                settled.add(path)
+            pending[path] = current
+        self._pending = pending
+
+        reloaded = DatasetRegistry.refresh_stale(
+            stable=lambda dataset: str(dataset.path) in settled
+        )
+        if reloaded:
+            logger.info(f"Hot-reloaded {reloaded} dataset(s)")
+        return reloaded
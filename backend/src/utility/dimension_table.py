@@ -0,0 +1,57 @@
+"""
+Components of delimited key columns (``ppg_id``, ``subsegment_name``), split
+once per distinct key and broadcast back to the rows.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utility.encoding import DIMENSION_COLUMNS, DimensionEncoder
+
+
+class DimensionTable:
+    """
+    ``table`` holds one row per distinct key: the key itself and each named
+    component. ``codes`` maps every source row to its ``table`` row (-1 for a
+    missing key). Components may be cleaned in ``table`` before broadcasting.
+    """
+
+    def __init__(
+        self, keys: pd.Series, components: Mapping[str, int], sep: str = "|"
+    ) -> None:
+        self.codes, uniques = pd.factorize(keys)
+        parts = pd.Series(np.asarray(uniques, dtype=object)).str.split(sep, regex=False)
+        self.table = pd.DataFrame(
+            {
+                keys.name: np.asarray(uniques, dtype=object),
+                **{name: parts.str[position] for name, position in components.items()},
+            }
+        )
+
+    def column(self, name: str, fill_missing: Optional[str] = None) -> pd.Categorical:
+        """
+        Component ``name`` for every source row, as a Categorical over the
+        component's dimension dictionary. Rows whose key or component is
+        missing get ``fill_missing`` (NaN when not given).
+        """
+        values = self.table[name]
+        missing_rows = (self.codes == -1).any() or values.isna().any()
+        if fill_missing is not None:
+            values = values.fillna(fill_missing)
+
+        extra = [fill_missing] if fill_missing is not None and missing_rows else []
+        categories = DimensionEncoder.dictionary(
+            DIMENSION_COLUMNS.get(name, name), [*values, *extra]
+        )
+        # Last slot serves the -1 code of missing keys
+        value_codes = np.append(
+            categories.get_indexer(values),
+            categories.get_loc(fill_missing) if extra else -1,
+        )
+        return pd.Categorical.from_codes(
+            value_codes[self.codes], dtype=pd.CategoricalDtype(categories)
+        )
@@ -0,0 +1,91 @@
+"""
+Load-time categorical encoding of dimension columns, over one process-wide
+dictionary per dimension.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+# Column name -> dimension whose dictionary it is encoded against
+DIMENSION_COLUMNS: Dict[str, str] = {
+    "retailer": "retailer",
+    "retailer_id": "retailer",
+    "manufacturer_nm": "manufacturer",
+    "brand_nm": "brand",
+    "ppg_nm": "ppg_nm",
+    "ppg_id": "ppg_id",
+    "segment": "segment",
+    "subsegment_name": "subsegment",
+    "promo_tactic": "promo_tactic",
+    "offer_type": "offer_type",
+    "offer_mechanic": "offer_mechanic",
+}
+
+
+class DimensionEncoder:
+    """
+    Encodes dimension columns as Categoricals over shared dictionaries. Group
+    by them with ``observed=True``: pandas < 3 otherwise emits a group for
+    every unused category.
+    """
+
+    _dictionaries: Dict[str, pd.Index] = {}
+    _guard = threading.Lock()
+
+    @classmethod
+    def dictionary(cls, dimension: str, values: Iterable = ()) -> pd.Index:
+        """
+        Return the dictionary for ``dimension``, first extending it with any
+        of ``values`` it does not contain yet. Unchanged dictionaries are
+        returned as the same Index object.
+        """
+        new = pd.Index(pd.Series(values).dropna().unique())
+        with cls._guard:
+            current = cls._dictionaries.get(dimension)
+            if current is not None and new.isin(current).all():
+                return current
+            merged = set(new) if current is None else set(current) | set(new)
+            categories = pd.Index(sorted(merged), dtype=new.dtype)
+            cls._dictionaries[dimension] = categories
+            return categories
+
+    @classmethod
+    def encode(
+        cls, df: pd.DataFrame, columns: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """Encode the dimension columns present in ``df`` in place."""
+        columns = DIMENSION_COLUMNS if columns is None else columns
+        for column, dimension in columns.items():
+            if column not in df.columns:
+                continue
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                continue
+            categories = cls.dictionary(dimension, df[column])
+            df[column] = pd.Categorical(df[column], categories=categories)
+        return df
+
+    @staticmethod
+    def decode(
+        df: pd.DataFrame, columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Turn encoded columns back into plain strings. Meant for small result
+        frames that get values outside the dictionary (e.g. an "OTHERS" row)
+        assigned to them.
+        """
+        columns = DIMENSION_COLUMNS if columns is None else columns
+        for column in columns:
+            if column in df.columns and isinstance(
+                df[column].dtype, pd.CategoricalDtype
+            ):
+                df[column] = df[column].astype(df[column].cat.categories.dtype)
+        return df
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._guard:
+            cls._dictionaries.clear()
@@ -0,0 +1,219 @@
+"""
+Mask-composition filtering shared by every service. A condition whose values
+are None, empty or contain "All" does not filter.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.frames import shares_rows
+from src.utility.partitions import PartitionIndex
+from src.utility.selections import SelectionCache
+from src.utility.sorted_layout import SortedLayout
+
+ALL = "All"
+
+
+def is_active(values: Optional[Sequence[Any]]) -> bool:
+    """Whether a filter value list restricts anything."""
+    return values is not None and len(values) > 0 and ALL not in values
+
+
+@dataclass(frozen=True)
+class Condition:
+    column: str
+    values: Optional[Sequence[Any]]
+    # Compare ``key(df[column])`` instead of the column itself
+    key: Optional[Callable[[pd.Series], pd.Series]] = None
+    # Skip the condition when the frame has no such column
+    optional: bool = False
+
+    def active(self, df: pd.DataFrame) -> bool:
+        if self.optional and self.column not in df.columns:
+            return False
+        return is_active(self.values)
+
+    def mask(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Hits for every row of ``df``, or only for the positions ``rows``."""
+        series = df[self.column]
+        if rows is not None:
+            series = series.take(rows)
+        if self.key is not None:
+            series = self.key(series)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Test each category once and broadcast through the codes; the
+            # extra slot serves the -1 code of missing values
+            hits = np.append(
+                series.cat.categories.isin(self.values),
+                any(pd.isna(value) for value in self.values),
+            )
+            return hits[series.cat.codes.to_numpy()]
+        return series.isin(self.values).to_numpy()
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    conditions: Sequence[Condition]
+
+    @classmethod
+    def from_model(
+        cls, filters: Any, columns: Mapping[str, str], optional: Sequence[str] = ()
+    ) -> "FilterSpec":
+        """
+        One condition per ``field -> column`` of ``columns``, taking the
+        values from the request model field of the same name. Columns listed
+        in ``optional`` may be missing from the frame.
+        """
+        return cls(
+            [
+                Condition(
+                    column, getattr(filters, field, None), optional=column in optional
+                )
+                for field, column in columns.items()
+            ]
+        )
+
+    def __add__(self, other: "FilterSpec") -> "FilterSpec":
+        return FilterSpec([*self.conditions, *other.conditions])
+
+    def mask(
+        self, df: pd.DataFrame, index: Optional[BitmapIndex] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Rows passing every active condition, or None when none is active.
+        With an ``index`` over ``df``'s rows, plain column conditions are
+        answered from its bitmaps instead of scanning the columns.
+        """
+        use_index = index is not None and shares_rows(
+            df,
+            index.frame,
+            [c.column for c in self.conditions if c.key is None and c.active(df)],
+        )
+        combined = bitmap = None
+        for condition in self.conditions:
+            if not condition.active(df):
+                continue
+            if use_index and condition.key is None:
+                bits = index.bitmap(condition.column, condition.values)
+                bitmap = bits if bitmap is None else bitmap & bits
+                continue
+            hits = condition.mask(df)
+            combined = hits if combined is None else combined & hits
+        if bitmap is not None:
+            hits = index.unpack(bitmap)
+            combined = hits if combined is None else combined & hits
+        return combined
+
+    def rows(
+        self,
+        df: pd.DataFrame,
+        index: Optional[BitmapIndex] = None,
+        partitions: Optional[PartitionIndex] = None,
+        layout: Optional[SortedLayout] = None,
+        selections: Optional[SelectionCache] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Ascending positions of the rows passing every active condition, or
+        None when none is active. With a ``layout`` or ``partitions`` over
+        ``df``'s rows, conditions on their columns select the candidate rows
+        first (the layout's key ranges take precedence) and the other
+        conditions are only evaluated on those rows. With ``selections`` over
+        ``df``'s rows, the positions are looked up there first and shared
+        (read-only) with later callers.
+        """
+        active = [c for c in self.conditions if c.active(df)]
+        if not active:
+            return None
+
+        if (
+            selections is not None
+            and selections.max_entries > 0
+            and shares_rows(df, selections.frame, [c.column for c in active])
+        ):
+            key = selections.key(active)
+            if key is not None:
+                return selections.get_or_compute(
+                    key, lambda: self._rows(df, active, index, partitions, layout)
+                )
+        return self._rows(df, active, index, partitions, layout)
+
+    def _rows(
+        self,
+        df: pd.DataFrame,
+        active: Sequence[Condition],
+        index: Optional[BitmapIndex],
+        partitions: Optional[PartitionIndex],
+        layout: Optional[SortedLayout],
+    ) -> np.ndarray:
+        selection: Dict[str, Sequence[Any]] = {}
+        pruner: Any = None
+        if (
+            layout is not None
+            and layout.columns
+            and shares_rows(df, layout.frame, layout.columns)
+        ):
+            # Only a leading run of the sort key narrows to ranges
+            for column in layout.columns:
+                condition = next(
+                    (c for c in active if c.key is None and c.column == column), None
+                )
+                if condition is None:
+                    break
+                selection[column] = condition.values
+            pruner = layout if selection else None
+        if (
+            pruner is None
+            and partitions is not None
+            and partitions.columns
+            and shares_rows(df, partitions.frame, partitions.columns)
+        ):
+            for condition in active:
+                if condition.key is None and condition.column in partitions.columns:
+                    selection.setdefault(condition.column, condition.values)
+            pruner = partitions if selection else None
+        if pruner is None:
+            return np.flatnonzero(self.mask(df, index))
+
+        rows = pruner.rows(selection)
+        use_index = index is not None and shares_rows(
+            df, index.frame, [c.column for c in active if c.key is None]
+        )
+        for condition in active:
+            if selection.get(condition.column) is condition.values:
+                continue
+            if not len(rows):
+                break
+            if use_index and condition.key is None:
+                hits = index.contains(condition.column, condition.values, rows)
+            else:
+                hits = condition.mask(df, rows)
+            rows = rows[hits]
+        return rows
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        copy: bool = True,
+        index: Optional[BitmapIndex] = None,
+        partitions: Optional[PartitionIndex] = None,
+        layout: Optional[SortedLayout] = None,
+        selections: Optional[SelectionCache] = None,
+    ) -> pd.DataFrame:
+        """
+        The selected rows as a new frame. Without an active condition the
+        frame is copied, or returned as is when ``copy`` is False. Likewise,
+        selected rows forming one contiguous run come back as a slice sharing
+        ``df``'s buffers when ``copy`` is False.
+        """
+        rows = self.rows(df, index, partitions, layout, selections)
+        if rows is None:
+            return df.copy() if copy else df
+        if not copy and len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            return df.iloc[rows[0] : rows[-1] + 1]
+        return df.take(rows)
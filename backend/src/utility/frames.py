@@ -0,0 +1,55 @@
+"""
+Whether a frame still holds the rows a per-dataset structure was built on.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Tuple
+
+import pandas as pd
+
+
+def _memory(series: pd.Series) -> Tuple[Any, Tuple[Any, ...]]:
+    """The array holding ``series``' values and where its memory lies."""
+    values = series.array
+    if isinstance(values, pd.arrays.ArrowExtensionArray):
+        chunked = values.__arrow_array__()
+        return chunked, tuple(
+            (
+                chunk.offset,
+                len(chunk),
+                tuple(
+                    0 if buffer is None else buffer.address
+                    for buffer in chunk.buffers()
+                ),
+            )
+            for chunk in chunked.chunks
+        )
+    array = values.codes if isinstance(values, pd.Categorical) else series.to_numpy()
+    return array, (array.__array_interface__["data"][0], array.shape, array.strides)
+
+
+def shares_rows(df: pd.DataFrame, frame: pd.DataFrame, columns: Iterable[str]) -> bool:
+    """
+    Whether ``df``'s ``columns`` are ``frame``'s own arrays, whole and in the
+    same order, as in ``frame`` itself or a shallow copy of it
+    (``Dataset.view``). Row positions found on those columns of ``frame`` are
+    then exactly what a scan of ``df`` would find. Filtered, reordered or
+    recomputed columns live in other memory and do not qualify.
+    """
+    if df is frame:
+        return True
+    if len(df) != len(frame):
+        return False
+    for column in columns:
+        if column not in df.columns or column not in frame.columns:
+            return False
+        ours, theirs = df[column], frame[column]
+        if ours.dtype != theirs.dtype:
+            return False
+        # Keep both arrays alive while comparing: a copy made by ``to_numpy``
+        # must not be freed and its address reused by the other one
+        ours, theirs = _memory(ours), _memory(theirs)
+        if ours[1] != theirs[1]:
+            return False
+    return True
@@ -0,0 +1,98 @@
+"""
+Dictionary-encoded option table of a dataset, served whole for client-side
+cascading.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from fastapi import Request, Response
+
+from src.utility.combinations import distinct_combinations
+from src.utility.dataset_registry import Dataset
+from src.utility.response_cache import not_modified
+
+
+class DimensionHierarchy:
+    def __init__(self, name: str, version: str, table: pd.DataFrame) -> None:
+        self.body = json.dumps(
+            self._encode(name, version, table), separators=(",", ":")
+        ).encode()
+        self.gzipped = gzip.compress(self.body)
+        self.etag = f'W/"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+
+    @classmethod
+    def of(cls, dataset: Dataset, table: pd.DataFrame) -> "DimensionHierarchy":
+        """The hierarchy of ``table``, cached with the dataset version."""
+        return dataset.derived(
+            "hierarchy", lambda _: cls(dataset.name, dataset.version, table)
+        )
+
+    @staticmethod
+    def _encode(name: str, version: str, table: pd.DataFrame) -> Dict[str, Any]:
+        dictionaries: Dict[str, List[Any]] = {}
+        codes = []
+        for column in table.columns:
+            values = table[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Shared dictionaries also hold other datasets' values
+                values = values.cat.remove_unused_categories()
+                column_codes, uniques = values.cat.codes, values.cat.categories
+            else:
+                column_codes, uniques = pd.factorize(values, sort=True)
+            dictionaries[column] = pd.Index(uniques).tolist()
+            codes.append(np.asarray(column_codes, dtype=np.int64))
+
+        rows = np.column_stack(codes).tolist() if codes else []
+        return {
+            "dataset": name,
+            "version": version,
+            "columns": list(table.columns),
+            "dictionaries": dictionaries,
+            "rows": rows,
+        }
+
+    def response(self, request: Request) -> Response:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if not_modified(request, self.etag):
+            return Response(status_code=304, headers=headers)
+
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(
+                self.gzipped, media_type="application/json", headers=headers
+            )
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class DimensionOptions:
+    """
+    Option table and hierarchy of a service's dataset (``_dataset()``) over
+    its ``option_columns``.
+    """
+
+    option_columns: Sequence[str] = ()
+
+    def _dataset(self) -> Dataset:
+        raise NotImplementedError
+
+    def option_table(self) -> pd.DataFrame:
+        """Distinct combinations of the option dimensions, for ``build_options``."""
+        columns = self.option_columns
+        return self._dataset().derived(
+            "options", lambda frame: distinct_combinations(frame, columns)
+        )
+
+    def hierarchy(self) -> DimensionHierarchy:
+        """The option table, dictionary-encoded for client-side cascading."""
+        return DimensionHierarchy.of(self._dataset(), self.option_table())
@@ -0,0 +1,111 @@
+"""
+Nearest-neighbour search over standardized numeric features, per group of
+rows; KD-trees when scipy is installed, brute force otherwise.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - depends on the deployment
+    cKDTree = None
+
+
+def _member(rows: np.ndarray, allowed: np.ndarray) -> np.ndarray:
+    """Per entry of ``rows``: is it in the ascending array ``allowed``?"""
+    if not len(allowed):
+        return np.zeros(len(rows), dtype=bool)
+    at = np.searchsorted(allowed, rows).clip(max=len(allowed) - 1)
+    return allowed[at] == rows
+
+
+class NeighbourIndex:
+    def __init__(
+        self, frame: pd.DataFrame, groups: Sequence[str], features: np.ndarray
+    ) -> None:
+        """``features`` holds one raw feature vector per row of ``frame``."""
+        values = np.asarray(features, dtype=np.float64)
+        scale = values.std(axis=0) if len(values) else np.ones(values.shape[1])
+        self.scale = np.where(scale > 0, scale, 1.0)
+        points = values / self.scale
+
+        grouped = frame.groupby(
+            list(groups), sort=False, observed=True, dropna=False
+        ).indices
+        keys = [key if isinstance(key, tuple) else (key,) for key in grouped]
+        self.keys = pd.DataFrame(keys, columns=list(groups))
+        # column -> value -> positions of the groups holding it
+        self._groups: Dict[str, Dict[Any, List[int]]] = {}
+        for column in self.keys.columns:
+            postings: Dict[Any, List[int]] = {}
+            for group, value in enumerate(self.keys[column].tolist()):
+                postings.setdefault(value, []).append(group)
+            self._groups[column] = postings
+        self._rows = [np.asarray(rows, dtype=np.intp) for rows in grouped.values()]
+        self._points = [points[rows] for rows in self._rows]
+        self._trees: List[Any] = [
+            cKDTree(group) if cKDTree is not None else None for group in self._points
+        ]
+
+    def nearest(
+        self,
+        selection: Mapping[str, Sequence[Any]],
+        point: Sequence[float],
+        k: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions and distances of the ``k`` rows nearest to ``point`` (raw
+        feature values) among the groups matching ``selection`` (group column
+        -> accepted values; columns left out match all), and among the
+        ascending positions ``allowed`` when given. Closest first.
+        """
+        point = np.asarray(point, dtype=np.float64) / self.scale
+        hit = np.ones(len(self.keys), dtype=bool)
+        for column, values in selection.items():
+            match = np.zeros(len(self.keys), dtype=bool)
+            for value in values:
+                match[self._groups[column].get(value, [])] = True
+            hit &= match
+
+        found = [self._query(group, point, k, allowed) for group in np.flatnonzero(hit)]
+        if not found:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        rows = np.concatenate([rows for rows, _ in found])
+        distances = np.concatenate([distances for _, distances in found])
+        order = np.argsort(distances, kind="stable")[:k]
+        return rows[order], distances[order]
+
+    def _query(
+        self,
+        group: int,
+        point: np.ndarray,
+        k: int,
+        allowed: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        rows, points, tree = self._rows[group], self._points[group], self._trees[group]
+        if tree is None:
+            if allowed is not None:
+                keep = _member(rows, allowed)
+                rows, points = rows[keep], points[keep]
+            distances = np.linalg.norm(points - point, axis=1)
+            order = np.argsort(distances, kind="stable")[:k]
+            return rows[order], distances[order]
+
+        # Widen the search until enough of the neighbours are allowed
+        wanted = k
+        while True:
+            distances, at = tree.query(point, k=min(wanted, len(rows)))
+            distances, at = np.atleast_1d(distances), np.atleast_1d(at)
+            found = rows[at]
+            if allowed is None:
+                return found, distances
+            keep = _member(found, allowed)
+            if keep.sum() >= k or wanted >= len(rows):
+                return found[keep][:k], distances[keep][:k]
+            wanted *= 4
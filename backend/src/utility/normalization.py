@@ -0,0 +1,64 @@
+"""
+Declarative value normalization for the data loaders, evaluated once per
+distinct value of a column.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utility.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+Step = Union[Mapping[Any, Any], Callable[[Any], Any]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    column: str
+    steps: Tuple[Step, ...]
+
+    def rewrite(self, value: Any) -> Any:
+        for step in self.steps:
+            if isinstance(step, Mapping):
+                value = step.get(value, value)
+            else:
+                value = step(value)
+        return value
+
+
+class RuleSet:
+    """Named, ordered collection of rules shared by one or more loaders."""
+
+    def __init__(self, name: str, rules: Sequence[Rule]) -> None:
+        self.name = name
+        self.rules = tuple(rules)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rewrite the rule columns of ``df`` in place and return it."""
+        timings: Dict[str, str] = {}
+        for rule in self.rules:
+            if rule.column not in df.columns:
+                continue
+            start = time.perf_counter()
+            codes, uniques = pd.factorize(df[rule.column])
+            # One extra slot so the -1 code of missing values maps back to NaN
+            lookup = np.empty(len(uniques) + 1, dtype=object)
+            lookup[:-1] = [rule.rewrite(value) for value in uniques]
+            lookup[-1] = np.nan
+            df[rule.column] = pd.Series(lookup[codes], index=df.index)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            timings[rule.column] = f"{elapsed_ms:.1f}ms ({len(uniques)} values)"
+
+        logger.info(
+            "Normalized %s | %s",
+            self.name,
+            ", ".join(f"{column}={timing}" for column, timing in timings.items()),
+        )
+        return df
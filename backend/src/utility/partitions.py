@@ -0,0 +1,42 @@
+"""Row positions per (year, month) partition of a cached dataset."""
+
+from __future__ import annotations
+
+from typing import Any, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+PARTITION_COLUMNS = ("year", "month")
+
+
+class PartitionIndex:
+    def __init__(
+        self, frame: pd.DataFrame, columns: Sequence[str] = PARTITION_COLUMNS
+    ) -> None:
+        self.frame = frame
+        self.columns = tuple(column for column in columns if column in frame.columns)
+        self._parts: List[np.ndarray] = []
+        self.keys = pd.DataFrame(columns=list(self.columns))
+        if not self.columns:
+            return
+
+        groups = frame.groupby(
+            list(self.columns), sort=True, observed=True, dropna=False
+        ).indices
+        keys = [key if isinstance(key, tuple) else (key,) for key in groups]
+        self.keys = pd.DataFrame(keys, columns=list(self.columns))
+        self._parts = [np.asarray(rows, dtype=np.intp) for rows in groups.values()]
+
+    def rows(self, selection: Mapping[str, Sequence[Any]]) -> np.ndarray:
+        """
+        Ascending positions of the rows whose partition matches ``selection``
+        (partition column -> accepted values; columns left out match all).
+        """
+        hit = np.ones(len(self.keys), dtype=bool)
+        for column, values in selection.items():
+            hit &= self.keys[column].isin(values).to_numpy()
+        parts = [self._parts[i] for i in np.flatnonzero(hit)]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(parts))
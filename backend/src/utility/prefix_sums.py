@@ -0,0 +1,94 @@
+"""
+Per-series running totals over time slots: the total of a contiguous slot
+range is the difference of two prefix values.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PrefixSumIndex:
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        series: Sequence[str],
+        slots: np.ndarray,
+        measures: Sequence[str],
+    ) -> None:
+        self.measures = list(measures)
+        self.slots = int(slots.max()) + 1 if len(slots) else 0
+        self.first_year = 0
+
+        grouped = frame.groupby(list(series), observed=True, dropna=False, sort=False)
+        # One row per series, in order of first appearance
+        self.series = grouped.size().index.to_frame(index=False)
+        ids = grouped.ngroup().to_numpy()
+
+        # [series, slot + 1, measure]; the last measure counts rows
+        values = np.column_stack(
+            [frame[m].to_numpy(dtype=np.float64) for m in self.measures]
+            + [np.ones(len(frame))]
+        )
+        cums = np.zeros((len(self.series), self.slots + 1, values.shape[1]))
+        np.add.at(cums, (ids, slots + 1), values)
+        self._cums = np.cumsum(cums, axis=1)
+
+    @classmethod
+    def monthly(
+        cls,
+        frame: pd.DataFrame,
+        series: Sequence[str],
+        measures: Sequence[str],
+    ) -> "PrefixSumIndex":
+        """Index over (year, month) slots; ``year`` may hold strings."""
+        years = frame["year"].astype(int).to_numpy()
+        first_year = int(years.min()) if len(years) else 0
+        slots = (years - first_year) * 12 + frame["month"].to_numpy(dtype=int) - 1
+        index = cls(frame, series, slots, measures)
+        index.first_year = first_year
+        return index
+
+    def month_range(self, year: int, first: int, last: int) -> Tuple[int, int]:
+        """Slot range [start, end) of months ``first``..``last`` of ``year``."""
+        base = (year - self.first_year) * 12
+        return base + first - 1, base + last
+
+    def totals(self, start: int, end: int) -> pd.DataFrame:
+        """
+        Series with rows in slots [start, end): the series columns, the summed
+        measures, ``rows``, and ``first_slot``/``last_slot`` holding rows.
+        """
+        start, end = max(start, 0), min(end, self.slots)
+        if start >= end:
+            present = np.zeros(len(self.series), dtype=bool)
+            edges = np.empty(0, dtype=np.int64)
+            empty = np.zeros((0, len(self.measures) + 1))
+            return self._frame(present, empty, edges, edges)
+
+        totals = self._cums[:, end] - self._cums[:, start]
+        present = totals[:, -1] > 0
+        # Running row counts are non-decreasing, so counting the slots whose
+        # count has not moved yet (or no longer moves) locates the edges
+        counts = self._cums[present, start : end + 1, -1]
+        first = start + (counts[:, 1:] == counts[:, :1]).sum(axis=1)
+        last = start + (counts[:, :-1] < counts[:, -1:]).sum(axis=1) - 1
+        return self._frame(present, totals[present], first, last)
+
+    def _frame(
+        self,
+        present: np.ndarray,
+        totals: np.ndarray,
+        first: np.ndarray,
+        last: np.ndarray,
+    ) -> pd.DataFrame:
+        out = self.series.loc[present].reset_index(drop=True)
+        for i, measure in enumerate(self.measures):
+            out[measure] = totals[:, i]
+        out["rows"] = totals[:, -1].astype(np.int64)
+        out["first_slot"] = first
+        out["last_slot"] = last
+        return out
@@ -0,0 +1,211 @@
+"""
+Filter-keyed, single-flight cache of endpoint responses per dataset version,
+and the strong ETags of its keys.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from src.utility.filtering import ALL
+from src.utility.result_store import SqliteResultStore
+from src.utility.settings import settings
+
+T = TypeVar("T")
+
+
+def canonical(filters: Any) -> str:
+    """Order-insensitive, "All"-insensitive JSON form of a filter model or dict."""
+    if isinstance(filters, BaseModel):
+        filters = filters.model_dump(mode="json")
+    values: Dict[str, Any] = {}
+    for field, value in (filters or {}).items():
+        if isinstance(value, (list, tuple)):
+            value = (
+                None
+                if all(item == ALL for item in value)
+                else sorted(value, key=lambda item: (str(type(item)), str(item)))
+            )
+        values[field] = value
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        store: Optional[SqliteResultStore] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Second level shared with the other workers
+        self.store = store
+        # key -> (expiry time, response), least recently used first
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        # key -> result of the computation in progress
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.coalesced = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], T],
+        scope: Optional[Tuple[str, str]] = None,
+    ) -> T:
+        """
+        The cached value of ``key``, else ``compute()``; concurrent identical
+        calls wait for that one computation, cache enabled or not. ``scope``
+        (dataset name, version) lets the shared store drop other versions'
+        entries; without it the store is not used.
+        """
+        shared = self.store is not None and scope is not None and self.enabled
+        with self._lock:
+            if self.enabled:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                if self.enabled:
+                    self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            value = self.store.get(key) if shared else None
+            if value is None:
+                value = compute()
+                if shared:
+                    self.store.put(key, scope, value)
+        except BaseException as exc:
+            with self._lock:
+                del self._flights[key]
+            flight.set_exception(exc)
+            raise
+        with self._lock:
+            if self.enabled:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                self._evict(time.monotonic())
+            del self._flights[key]
+        flight.set_result(value)
+        return value
+
+    def _evict(self, now: float) -> None:
+        expired = [key for key, (expiry, _) in self._entries.items() if expiry <= now]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            expired.append(None)
+        self.evictions += len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "store": self.store.stats() if self.store is not None else None,
+            }
+
+
+response_cache = ResponseCache(
+    settings.response_cache_entries,
+    settings.response_cache_ttl_seconds,
+    (
+        SqliteResultStore(
+            settings.response_cache_path,
+            int(settings.response_cache_max_mb * 1024 * 1024),
+            settings.response_cache_ttl_seconds,
+        )
+        if settings.response_cache_backend == "sqlite"
+        else None
+    ),
+)
+
+
+def _key(qualname: str, service: Any, filters: Any) -> Tuple[str, ...]:
+    dataset = service._dataset()
+    return (qualname, dataset.name, dataset.version, canonical(filters))
+
+
+def cached_response(method: Callable[[Any, Any], T]) -> Callable[[Any, Any], T]:
+    """
+    Cache ``method(self, filters)`` per dataset version (``self._dataset()``)
+    and canonical filters. Responses are shared: callers must not mutate them.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, filters: Any) -> T:
+        key = _key(method.__qualname__, self, filters)
+        return response_cache.get_or_compute(
+            key, lambda: method(self, filters), scope=key[1:3]
+        )
+
+    return wrapper
+
+
+def etag(method: Callable[[Any], Any], filters: Any) -> str:
+    """Strong ETag of ``method(filters)`` for a bound ``@cached_response`` method."""
+    key = _key(method.__qualname__, method.__self__, filters)
+    return f'"{hashlib.sha1(repr(key).encode()).hexdigest()[:20]}"'
+
+
+def not_modified(request: Request, tag: str) -> bool:
+    """Whether the request's ``If-None-Match`` matches ``tag``."""
+    if_none_match = request.headers.get("if-none-match", "")
+    return if_none_match.strip() == "*" or tag in (
+        candidate.strip() for candidate in if_none_match.split(",")
+    )
+
+
+def conditional(
+    request: Request,
+    response: Response,
+    method: Callable[[Any], T],
+    filters: Any,
+) -> T | Response:
+    """
+    ``method(filters)`` with its ETag set on ``response``, or an empty 304 when
+    the client already holds that ETag.
+    """
+    headers = {"ETag": etag(method, filters), "Cache-Control": "no-cache"}
+    if not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return method(filters)
@@ -0,0 +1,151 @@
+"""
+SQLite store of pickled responses shared by the workers of a host. Entries
+are unpickled, so the file must only be writable by the service itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from src.utility.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    version TEXT NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_dataset ON responses (dataset, version);
+"""
+
+
+class SqliteResultStore:
+    def __init__(self, path: Path, max_bytes: int, ttl_seconds: float) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # sqlite3 connections must stay on the thread that opened them
+        self._local = threading.local()
+        self.hits = self.misses = self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The stored response for ``key``, or None (also on any error)."""
+        digest, now = self._digest(key), time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires > ?",
+                (digest, now),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, digest)
+            )
+            value = pickle.loads(row[0])
+        except Exception as exc:
+            self.errors += 1
+            logger.warning(f"Ignoring unreadable cached response: {exc}")
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, scope: Tuple[str, str], value: Any) -> None:
+        """
+        Store ``value`` under ``key`` for ``scope`` (dataset name, version),
+        dropping other versions of the dataset and evicting past the size cap.
+        """
+        dataset, version = scope
+        now = time.time()
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(blob) > self.max_bytes:
+                return
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self._digest(key),
+                        dataset,
+                        version,
+                        now + self.ttl_seconds,
+                        now,
+                        len(blob),
+                        blob,
+                    ),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE expires <= ?"
+                    " OR (dataset = ? AND version <> ?)",
+                    (now, dataset, version),
+                )
+                # Keep the most recently read entries that fit in the budget
+                connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key)"
+                    "  AS total FROM responses)"
+                    " WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+        except Exception as exc:
+            self.errors += 1
+            logger.warning(f"Could not store response for {dataset}: {exc}")
+
+    def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM responses")
+        except sqlite3.Error as exc:
+            logger.warning(f"Could not clear the response store: {exc}")
+
+    def stats(self) -> Dict[str, Any]:
+        entries = size = None
+        try:
+            entries, size = (
+                self._connection()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+                .fetchone()
+            )
+        except sqlite3.Error:
+            pass
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
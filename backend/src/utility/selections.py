@@ -0,0 +1,67 @@
+"""Row positions of recently used filters of a cached dataset."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SelectionKey = FrozenSet[Tuple[str, FrozenSet[Any]]]
+
+
+class SelectionCache:
+    def __init__(self, frame: pd.DataFrame, max_entries: int) -> None:
+        self.frame = frame
+        self.max_entries = max_entries
+        # key -> row positions, least recently used first
+        self._entries: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(conditions: Sequence[Any]) -> Optional[SelectionKey]:
+        """Order-insensitive key of active conditions; None if not cacheable."""
+        if any(condition.key is not None for condition in conditions):
+            return None
+        try:
+            return frozenset(
+                (
+                    condition.column,
+                    frozenset(
+                        None if pd.isna(value) else value for value in condition.values
+                    ),
+                )
+                for condition in conditions
+            )
+        except TypeError:  # unhashable filter values
+            return None
+
+    def get_or_compute(
+        self, key: SelectionKey, compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rows
+            self.misses += 1
+
+        rows = compute()
+        rows.flags.writeable = False
+        with self._lock:
+            self._entries[key] = rows
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,49 @@
+"""
+Runtime settings for the backend, overridable with ``RGM_``-prefixed
+environment variables (or a ``.env`` file).
+"""
+
+from pathlib import Path
+from typing import Dict, List, Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="RGM_", env_file=".env", extra="ignore"
+    )
+
+    # Columnar snapshots of cleaned frames (see src.utility.snapshot)
+    snapshot_enabled: bool = True
+    snapshot_dir: Path = ROOT_DIR / "data" / ".snapshots"
+    # Memory-map snapshots so uvicorn workers share one copy of each dataset
+    snapshot_mmap: bool = True
+
+    # Seconds between checks of the data files for hot reload (0 disables)
+    reload_poll_seconds: float = 30.0
+
+    # Partitioned Parquet output of src.services.streaming_jobs
+    stream_dir: Path = ROOT_DIR / "data" / "partitioned"
+    stream_chunk_rows: int = 200_000
+
+    # Cached row selections per dataset version (see src.utility.selections)
+    selection_cache_entries: int = 128
+
+    # Filter-keyed response cache (see src.utility.response_cache); 0 disables
+    response_cache_entries: int = 256
+    response_cache_ttl_seconds: float = 600.0
+    # "sqlite" also shares responses between workers (see src.utility.result_store)
+    response_cache_backend: Literal["memory", "sqlite"] = "memory"
+    response_cache_path: Path = ROOT_DIR / "data" / ".cache" / "responses.sqlite"
+    response_cache_max_mb: float = 256.0
+
+    # Dataset name -> composite key to store its rows sorted by, as JSON (see
+    # src.utility.sorted_layout). Datasets left out keep their file order; sorted
+    # ones list rows and first-appearance values in key order.
+    sorted_layouts: Dict[str, List[str]] = {}
+
+
+settings = Settings()
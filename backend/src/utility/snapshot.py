@@ -0,0 +1,138 @@
+"""
+Memory-mapped Arrow IPC snapshots of cleaned frames, keyed by the source
+file's fingerprint and the cleaning version. Skipped without pyarrow.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from src.utility.logger import AppLogger
+from src.utility.settings import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+    feather = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = AppLogger.get_logger(__name__)
+
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: Path) -> "Fingerprint":
+        stat = path.stat()
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+        return cls(
+            size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=digest.hexdigest()
+        )
+
+    def key(self, version: int) -> str:
+        raw = f"{self.size}:{self.mtime_ns}:{self.sha256}:v{version}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Reads and writes Arrow IPC snapshots under ``settings.snapshot_dir``."""
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.snapshot_enabled and pa is not None
+
+    @staticmethod
+    def _prefix(name: str, source: Path) -> str:
+        source_id = hashlib.sha1(str(Path(source).resolve()).encode()).hexdigest()[:8]
+        return f"{name}-{source_id}"
+
+    @classmethod
+    def _path(cls, name: str, source: Path, key: str) -> Path:
+        return settings.snapshot_dir / f"{cls._prefix(name, source)}.{key}.arrow"
+
+    @classmethod
+    @contextmanager
+    def lock(cls, name: str, source: Path) -> Iterator[None]:
+        """
+        Cross-process lock around building one dataset's snapshot. Without
+        fcntl (or with snapshots disabled) this is a no-op.
+        """
+        if not cls.enabled() or fcntl is None:
+            yield
+            return
+        settings.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = settings.snapshot_dir / f"{cls._prefix(name, source)}.lock"
+        with open(lock_path, "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    @classmethod
+    def read(
+        cls, name: str, source: Path, fingerprint: Fingerprint, version: int
+    ) -> Optional[pd.DataFrame]:
+        if not cls.enabled():
+            return None
+        path = cls._path(name, source, fingerprint.key(version))
+        if not path.exists():
+            return None
+        try:
+            table = feather.read_table(path, memory_map=settings.snapshot_mmap)
+            # split_blocks keeps one block per column so pandas does not
+            # consolidate (and thereby copy) the mapped buffers
+            return table.to_pandas(split_blocks=True)
+        except Exception as exc:
+            logger.warning(f"Ignoring unreadable snapshot {path.name}: {exc}")
+            return None
+
+    @classmethod
+    def write(
+        cls,
+        name: str,
+        source: Path,
+        fingerprint: Fingerprint,
+        version: int,
+        frame: pd.DataFrame,
+    ) -> None:
+        if not cls.enabled():
+            return
+        path = cls._path(name, source, fingerprint.key(version))
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(frame)
+            # Uncompressed so the file can be memory-mapped as-is
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except Exception as exc:
+            logger.warning(f"Could not write snapshot for {name}: {exc}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        for stale in path.parent.glob(f"{cls._prefix(name, source)}.*.arrow"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
@@ -0,0 +1,84 @@
+"""
+Optional sorted physical layout of a cached dataset, resolving filters on
+the sort key to contiguous row ranges.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _codes(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Sort-order codes of a column (-1 for missing) and the value per code."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def arrange(frame: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """``frame`` stably sorted by ``columns``; returned as is when already so."""
+    columns = [column for column in columns if column in frame.columns]
+    if not columns:
+        return frame
+    # lexsort takes the primary key last
+    order = np.lexsort([_codes(frame[column])[0] for column in reversed(columns)])
+    if (order == np.arange(len(frame))).all():
+        return frame
+    return frame.take(order).reset_index(drop=True)
+
+
+class SortedLayout:
+    def __init__(self, frame: pd.DataFrame, columns: Sequence[str]) -> None:
+        self.frame = frame
+        self.columns = tuple(column for column in columns if column in frame.columns)
+        self._codes: List[np.ndarray] = []
+        self._lookup: List[Dict[Any, int]] = []
+        for column in self.columns:
+            codes, values = _codes(frame[column])
+            self._codes.append(codes)
+            self._lookup.append({value: code for code, value in enumerate(values)})
+
+    def slices(self, selection: Mapping[str, Sequence[Any]]) -> List[Tuple[int, int]]:
+        """
+        Row ranges [start, stop) matching ``selection`` (key column ->
+        accepted values) on the leading key columns it names.
+        """
+        ranges = [(0, len(self.frame))]
+        for level, column in enumerate(self.columns):
+            if column not in selection or not ranges:
+                break
+            lookup = self._lookup[level]
+            wanted = sorted(
+                {
+                    -1 if pd.isna(value) else lookup[value]
+                    for value in selection[column]
+                    if pd.isna(value) or value in lookup
+                }
+            )
+            codes = self._codes[level]
+            narrowed = []
+            # Inside a range the earlier levels are fixed, so codes ascend
+            for start, stop in ranges:
+                run = codes[start:stop]
+                lows = np.searchsorted(run, wanted, side="left")
+                highs = np.searchsorted(run, wanted, side="right")
+                narrowed.extend(
+                    (start + int(low), start + int(high))
+                    for low, high in zip(lows, highs)
+                    if high > low
+                )
+            ranges = narrowed
+        return ranges
+
+    def rows(self, selection: Mapping[str, Sequence[Any]]) -> np.ndarray:
+        """Ascending positions of the rows in ``slices(selection)``."""
+        ranges = self.slices(selection)
+        if not ranges:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(
+            [np.arange(start, stop, dtype=np.intp) for start, stop in ranges]
+        )
@@ -0,0 +1,209 @@
+"""
+Chunked ingestion of large CSV files into partitioned Parquet, aggregating
+as the chunks are read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_integer_dtype
+
+from src.utility.csv_schema import CsvSchema
+from src.utility.encoding import DIMENSION_COLUMNS, DimensionEncoder
+from src.utility.logger import AppLogger
+from src.utility.settings import settings
+from src.utility.snapshot import Fingerprint
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+    pq = None
+
+logger = AppLogger.get_logger(__name__)
+
+# Fold per-chunk partial aggregates into the running total this often
+_MERGE_EVERY = 8
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """Sums of ``values`` plus a ``rows`` count per combination of ``keys``."""
+
+    name: str
+    keys: Sequence[str]
+    values: Sequence[str]
+
+    def partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        grouped = chunk.groupby(list(self.keys), observed=True, dropna=False)
+        out = grouped[list(self.values)].sum()
+        out["rows"] = grouped.size()
+        # Chunks are encoded against different dictionaries; merge on values
+        return DimensionEncoder.decode(out.reset_index(), self.keys)
+
+    def merge(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        combined = pd.concat(frames, ignore_index=True)
+        return (
+            combined.groupby(list(self.keys), dropna=False, sort=False)[
+                [*self.values, "rows"]
+            ]
+            .sum()
+            .reset_index()
+        )
+
+
+@dataclass
+class StreamJob:
+    name: str
+    source: Path
+    schema: CsvSchema
+    # The loader's row-wise cleaning (e.g. ``Summary._clean``)
+    clean: Callable[[pd.DataFrame], pd.DataFrame]
+    version: int = 1
+    partition_by: Sequence[str] = ()
+    aggregates: Sequence[Aggregate] = ()
+    read_kwargs: Mapping[str, Any] = field(default_factory=dict)
+
+
+class StreamingIngest:
+    """Runs one ``StreamJob``."""
+
+    def __init__(
+        self,
+        job: StreamJob,
+        out_dir: Optional[Path] = None,
+        chunk_rows: Optional[int] = None,
+    ) -> None:
+        self.job = job
+        self.out_dir = Path(out_dir or settings.stream_dir)
+        self.chunk_rows = chunk_rows or settings.stream_chunk_rows
+        # Arrow type of every column seen so far, to type all-null chunks
+        self._types: Dict[str, Any] = {}
+
+    def run(self) -> Dict[str, Any]:
+        if pq is None:
+            raise RuntimeError("Streaming ingestion needs pyarrow")
+        job = self.job
+        if not Path(job.source).exists():
+            msg = f"Data file not found: {job.source}"
+            logger.error(msg)
+            raise FileNotFoundError(msg)
+
+        start = time.time()
+        target = self.out_dir / job.name
+        tmp = self.out_dir / f".{job.name}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        (tmp / "aggregates").mkdir(parents=True)
+
+        totals: Dict[str, List[pd.DataFrame]] = {agg.name: [] for agg in job.aggregates}
+        rows_read = rows_written = chunks = 0
+        try:
+            for chunk in job.schema.read_chunks(
+                job.source, self.chunk_rows, **job.read_kwargs
+            ):
+                rows_read += len(chunk)
+                cleaned = job.clean(chunk)
+                rows_written += len(cleaned)
+
+                for agg in job.aggregates:
+                    totals[agg.name].append(agg.partial(cleaned))
+                    if len(totals[agg.name]) >= _MERGE_EVERY:
+                        totals[agg.name] = [agg.merge(totals[agg.name])]
+
+                pq.write_to_dataset(
+                    self._to_arrow(cleaned),
+                    tmp / "data",
+                    partition_cols=list(job.partition_by) or None,
+                    basename_template=f"part-{chunks:05d}-{{i}}.parquet",
+                )
+                chunks += 1
+                logger.info(
+                    "Streamed %s chunk %s | rows=%s | %.1f seconds so far",
+                    job.name,
+                    chunks,
+                    rows_read,
+                    time.time() - start,
+                )
+
+            aggregate_rows = {}
+            for agg in job.aggregates:
+                frames = totals[agg.name]
+                result = agg.merge(frames) if frames else pd.DataFrame()
+                aggregate_rows[agg.name] = int(len(result))
+                pq.write_table(
+                    pa.Table.from_pandas(result, preserve_index=False),
+                    tmp / "aggregates" / f"{agg.name}.parquet",
+                )
+
+            manifest = {
+                "name": job.name,
+                "source": str(job.source),
+                "version": Fingerprint.of(Path(job.source)).key(job.version),
+                "chunk_rows": self.chunk_rows,
+                "chunks": chunks,
+                "rows_read": rows_read,
+                "rows_written": rows_written,
+                "partition_by": list(job.partition_by),
+                "aggregates": aggregate_rows,
+                "seconds": round(time.time() - start, 3),
+            }
+            with open(tmp / "_manifest.json", "w") as fh:
+                json.dump(manifest, fh, indent=2)
+            self._swap(tmp, target)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        logger.info(
+            "Streamed %s | chunks=%s | rows=%s | %.3f seconds",
+            job.name,
+            chunks,
+            rows_read,
+            manifest["seconds"],
+        )
+        return manifest
+
+    def _to_arrow(self, df: pd.DataFrame) -> "pa.Table":
+        """
+        Convert a cleaned chunk with a column layout that does not depend on
+        the chunk: dimension columns as plain strings (their dictionaries grow
+        from chunk to chunk), integers at full width, all-null columns typed
+        like the other chunks.
+        """
+        df = df.copy(deep=False)
+        for column in df.columns:
+            dtype = df[column].dtype
+            if column in DIMENSION_COLUMNS and isinstance(dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(dtype.categories.dtype)
+            elif is_integer_dtype(dtype) and not is_bool_dtype(dtype):
+                df[column] = df[column].astype("int64")
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for index, column in enumerate(table.schema):
+            if pa.types.is_null(column.type):
+                table = table.set_column(
+                    index,
+                    column.name,
+                    pa.nulls(len(table), self._types.get(column.name, pa.string())),
+                )
+            else:
+                self._types.setdefault(column.name, column.type)
+        return table
+
+    @staticmethod
+    def _swap(tmp: Path, target: Path) -> None:
+        old = target.with_name(f".{target.name}.old")
+        shutil.rmtree(old, ignore_errors=True)
+        if target.exists():
+            os.replace(target, old)
+        os.replace(tmp, target)
+        shutil.rmtree(old, ignore_errors=True)
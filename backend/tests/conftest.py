@@ -0,0 +1,69 @@
+"""
+Shared fixtures: a small synthetic dataset and the naive scan every index
+structure must agree with.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+import pytest
+
+Selection = Dict[str, Sequence[Any]]
+
+COLUMNS = ("brand_nm", "retailer", "ppg_id", "year", "month")
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """Dimension columns of mixed kinds (with missing values) and a measure."""
+    rng = np.random.default_rng(7)
+    n = 600
+    retailers = rng.choice(["R1", "R2", "R3", "R4"], n).astype(object)
+    retailers[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            # Categorical with an unused category, as the dimension encoder builds
+            "brand_nm": pd.Categorical(
+                rng.choice(["A", "B", "C", "D"], n),
+                categories=["A", "B", "C", "D", "E"],
+            ),
+            "retailer": retailers,
+            "ppg_id": rng.choice(["P1", "P2", "P3"], n),
+            "year": rng.choice([2022, 2023, 2024], n),
+            "month": rng.integers(1, 13, n),
+            "revenue": rng.random(n) * 100,
+        }
+    )
+
+
+@pytest.fixture
+def scan() -> Callable[[pd.DataFrame, Selection], np.ndarray]:
+    """Ascending positions of the rows matching every column of a selection."""
+
+    def _scan(df: pd.DataFrame, selection: Selection) -> np.ndarray:
+        hits = np.ones(len(df), dtype=bool)
+        for column, values in selection.items():
+            hits &= df[column].isin(values).to_numpy()
+        return np.flatnonzero(hits)
+
+    return _scan
+
+
+@pytest.fixture
+def selections(frame: pd.DataFrame) -> List[Selection]:
+    """Random selections of 1-3 columns, sometimes naming absent values."""
+    rng = np.random.default_rng(11)
+    out: List[Selection] = []
+    for _ in range(150):
+        columns = rng.choice(COLUMNS, rng.integers(1, 4), replace=False)
+        selection: Selection = {}
+        for column in columns:
+            values = pd.unique(frame[column].dropna()).tolist()
+            picked = rng.choice(len(values), rng.integers(1, 4), replace=False)
+            chosen = [values[i] for i in picked]
+            if rng.random() < 0.1:
+                chosen.append("absent")
+            selection[str(column)] = chosen
+        out.append(selection)
+    return out
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model.promotion.performance import PerformanceFilters
+from src.services.optimal_promotion_service.performance_analysis import (
+    OPTION_COLUMNS,
+    PerformanceAnalysis,
+)
+from src.utility.combinations import distinct_combinations
+from src.utility.dataset_registry import Dataset
+from src.utility.hierarchy import DimensionOptions
+
+
+@pytest.fixture
+def events() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    n = 400
+    brands = rng.choice(["Alpha", "Beta", "Gamma"], n)
+    segments = rng.choice(["Floor", "Surface"], n).astype(object)
+    segments[rng.random(n) < 0.05] = None
+    return pd.DataFrame(
+        {
+            "category": "SurfaceCare",
+            "year": rng.choice([2022, 2023], n),
+            "month": rng.integers(1, 13, n),
+            "brand_nm": brands,
+            "segment": segments,
+            "ppg_id": [f"{b}-{rng.integers(3)}" for b in brands],
+            "retailer": rng.choice(["R1", "R2", "R3", "R4"], n),
+            "offer_type": rng.choice(["BOGO", "PRICE OFF"], n),
+            "promo_tactic": rng.choice(["Display", "Feature", "TPR"], n),
+            "incr_revenue": rng.random(n),
+        }
+    )
+
+
+def test_distinct_combinations_keep_first_appearance_order(events):
+    table = distinct_combinations(events, ["brand_nm", "segment", "missing"])
+
+    assert list(table.columns) == ["brand_nm", "segment"]
+    expected = list(dict.fromkeys(zip(events["brand_nm"], events["segment"])))
+    assert list(zip(table["brand_nm"], table["segment"])) == expected
+    assert table.index.equals(pd.RangeIndex(len(table)))
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"brands": ["Beta"]},
+        {"brands": ["Alpha", "Gamma"], "segment": ["Floor"]},
+        {"year": [2023], "month": [1, 2, 3], "ppgs": ["Beta-1", "Alpha-2"]},
+        {"segment": ["Surface"], "ppgs": ["absent"]},
+    ],
+)
+def test_options_from_the_table_match_the_full_frame(events, filters):
+    model = PerformanceFilters(**filters)
+    table = distinct_combinations(events, OPTION_COLUMNS)
+
+    assert PerformanceAnalysis.build_options(
+        table, model
+    ) == PerformanceAnalysis.build_options(events, model)
+
+
+def test_option_table_is_cached_with_the_dataset(events):
+    class Options(DimensionOptions):
+        option_columns = ("brand_nm", "segment")
+
+        def __init__(self, frame: pd.DataFrame) -> None:
+            self.dataset = Dataset("events", Path("events.csv"), frame, 0.0, 0.0)
+
+        def _dataset(self) -> Dataset:
+            return self.dataset
+
+    service = Options(events)
+    table = service.option_table()
+
+    assert service.option_table() is table
+    assert table.equals(distinct_combinations(events, ["brand_nm", "segment"]))
+    # A reload brings a new Dataset and with it a new table
+    service.dataset = Dataset("events", Path("events.csv"), events.head(5), 1.0, 0.0)
+    assert len(service.option_table()) < len(table)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.utility.composite_index import CompositeIndex
+
+COLUMNS = ["brand_nm", "retailer", "ppg_id", "year"]
+
+
+def test_rows_match_scan(frame, scan, selections):
+    index = CompositeIndex(frame, COLUMNS)
+    for selection in selections:
+        selection = {c: v for c, v in selection.items() if c in COLUMNS}
+        assert np.array_equal(index.rows(selection), scan(frame, selection))
+
+
+def test_probe_and_table_paths_agree(frame, scan):
+    index = CompositeIndex(frame, COLUMNS)
+    # Fully specified: a handful of candidate tuples, resolved by hash probes
+    narrow = {"brand_nm": ["A"], "retailer": ["R1"], "ppg_id": ["P2"], "year": [2023]}
+    # One column open: more candidate tuples than distinct ones, table filter
+    wide = {"ppg_id": ["P1", "P3"]}
+    for selection in [narrow, wide, {}]:
+        assert np.array_equal(index.rows(selection), scan(frame, selection))
+
+
+def test_missing_values_are_indexed(frame):
+    index = CompositeIndex(frame, ["retailer"])
+    assert np.array_equal(
+        index.rows({"retailer": [None]}),
+        np.flatnonzero(frame["retailer"].isna().to_numpy()),
+    )
+
+
+def test_duplicate_and_absent_values(frame, scan):
+    index = CompositeIndex(frame, COLUMNS)
+    selection = {"ppg_id": ["P1", "P1", "absent"], "year": [2022, 2022]}
+    assert np.array_equal(index.rows(selection), scan(frame, selection))
+    assert len(index.rows({"brand_nm": ["E"]})) == 0
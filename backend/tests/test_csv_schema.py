@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utility.csv_schema import CODE, FLOAT, INTEGER, TEXT, CsvSchema
+
+SCHEMA = CsvSchema(
+    {
+        "ppg_id": TEXT,
+        "year": CODE,
+        "week": CODE,
+        "units": INTEGER,
+        "price": FLOAT,
+    }
+)
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "history.csv"
+    path.write_text(
+        "ppg_id,year,week,units,price,unused\n"
+        "001,2023,1,10,2,x\n"
+        "002,2024,,300,2.5,y\n"
+        "010,2024,52,70000,3,z\n"
+    )
+    return path
+
+
+def test_read_applies_each_kind(source):
+    df = SCHEMA.read(source)
+
+    assert list(df.columns) == ["ppg_id", "year", "week", "units", "price"]
+    assert df["ppg_id"].tolist() == ["001", "002", "010"]
+    assert df["year"].dtype == np.int16
+    assert df["units"].dtype == np.int64
+    assert df["price"].dtype == np.float64
+    # A code column with missing values stays as pandas parsed it
+    assert df["week"].dtype == np.float64
+    assert df["week"].isna().tolist() == [False, True, False]
+
+
+def test_project_keeps_file_order_and_rejects_unknown_columns(source):
+    projected = SCHEMA.project("price", "ppg_id")
+    assert list(projected.columns) == ["ppg_id", "price"]
+    assert list(projected.read(source).columns) == ["ppg_id", "price"]
+
+    with pytest.raises(KeyError):
+        SCHEMA.project("ppg_id", "missing")
+
+
+def test_select_drops_columns_outside_the_schema(source):
+    loaded = pd.read_csv(source)
+    assert list(SCHEMA.project("year").select(loaded).columns) == ["year"]
+
+
+def test_read_chunks_yields_the_same_values(source):
+    whole = SCHEMA.read(source)
+    chunks = list(SCHEMA.read_chunks(source, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    joined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(joined, whole, check_dtype=False)
@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.utility.dataset_registry import DatasetRegistry
+from src.utility.dataset_watcher import DatasetWatcher
+from src.utility.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+    monkeypatch.setattr(DatasetRegistry, "_datasets", {})
+    monkeypatch.setattr(DatasetRegistry, "_locks", {})
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "history.csv"
+    path.write_text("brand_nm,revenue\nA,1.0\n")
+    return path
+
+
+def rewrite(path: Path, text: str) -> None:
+    """Change ``path`` with an mtime that differs even on coarse clocks."""
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def load(path: Path) -> pd.DataFrame:
+    return DatasetRegistry.get(
+        "history", path, lambda: pd.read_csv(path)[["brand_nm", "revenue"]]
+    )
+
+
+def test_refresh_stale_reloads_changed_files_only(source):
+    assert load(source)["revenue"].tolist() == [1.0]
+    assert DatasetRegistry.refresh_stale() == 0
+
+    rewrite(source, "brand_nm,revenue\nA,2.0\nB,3.0\n")
+    assert DatasetRegistry.refresh_stale(stable=lambda _: False) == 0
+    assert load(source)["revenue"].tolist() == [1.0]
+
+    assert DatasetRegistry.refresh_stale() == 1
+    assert load(source)["revenue"].tolist() == [2.0, 3.0]
+    assert DatasetRegistry.refresh_stale() == 0
+
+
+def test_failed_reload_keeps_the_previous_version(source):
+    load(source)
+    # The loader needs a revenue column
+    rewrite(source, "brand_nm\nA\n")
+
+    assert DatasetRegistry.refresh_stale() == 0
+    assert load(source)["revenue"].tolist() == [1.0]
+
+
+def test_pinned_request_keeps_its_version_across_a_reload(source):
+    with DatasetRegistry.pinned() as used:
+        before = load(source)
+        rewrite(source, "brand_nm,revenue\nA,2.0\n")
+        assert DatasetRegistry.refresh_stale() == 1
+        assert load(source)["revenue"].tolist() == before["revenue"].tolist()
+        (dataset,) = used.values()
+        pinned_version = dataset.version
+
+    with DatasetRegistry.pinned() as used:
+        assert load(source)["revenue"].tolist() == [2.0]
+        (dataset,) = used.values()
+        assert dataset.version != pinned_version
+
+
+def test_watcher_reloads_once_a_change_has_settled(source):
+    load(source)
+    watcher = DatasetWatcher(interval=0)
+    assert watcher.poll_once() == 0
+
+    rewrite(source, "brand_nm,revenue\nA,2.0\n")
+    assert watcher.poll_once() == 0
+    # Still being written: the second poll sees another size/mtime
+    rewrite(source, "brand_nm,revenue\nA,2.0\nB,3.0\n")
+    assert watcher.poll_once() == 0
+    assert load(source)["revenue"].tolist() == [1.0]
+
+    assert watcher.poll_once() == 1
+    assert load(source)["revenue"].tolist() == [2.0, 3.0]
+    assert watcher.poll_once() == 0
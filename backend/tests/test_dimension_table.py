@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from src.utility.dimension_table import DimensionTable
+from src.utility.encoding import DimensionEncoder
+
+KEYS = pd.Series(
+    ["S|R1|brandA|1", None, "S|R2|brandB|2", "S|R1", "S|R1|brandA|1", "S|R3|brandA|3"],
+    name="ppg_id",
+)
+
+
+@pytest.fixture(autouse=True)
+def dictionaries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DimensionEncoder, "_dictionaries", {})
+
+
+def row_wise(keys: pd.Series, position: int) -> pd.Series:
+    return keys.str.split("|", regex=False).str[position]
+
+
+def test_column_matches_splitting_every_row():
+    column = DimensionTable(KEYS, {"brand_nm": 2}).column("brand_nm")
+
+    expected = row_wise(KEYS, 2)
+    assert pd.Series(column).isna().tolist() == expected.isna().tolist()
+    assert pd.Series(column).dropna().tolist() == expected.dropna().tolist()
+    assert column.categories is DimensionEncoder.dictionary("brand")
+
+
+def test_missing_keys_and_components_get_the_fill_value():
+    column = DimensionTable(KEYS, {"brand_nm": 2}).column("brand_nm", "Unknown")
+
+    assert list(column) == row_wise(KEYS, 2).fillna("Unknown").tolist()
+    assert "Unknown" in column.categories
+
+
+def test_fill_value_only_joins_the_dictionary_when_used():
+    complete = KEYS.dropna().loc[lambda keys: keys.str.count("\\|") == 3]
+    column = DimensionTable(complete, {"brand_nm": 2}).column("brand_nm", "Unknown")
+
+    assert list(column) == row_wise(complete, 2).tolist()
+    assert "Unknown" not in column.categories
+
+
+def test_cleaned_components_are_broadcast():
+    table = DimensionTable(KEYS, {"segment": 0, "retailer": 1})
+    table.table["retailer"] = table.table["retailer"].str.lower()
+
+    assert len(table.table) == KEYS.nunique()
+    assert list(table.column("retailer", "none")) == (
+        row_wise(KEYS, 1).str.lower().fillna("none").tolist()
+    )
+    assert list(table.column("segment", "none")) == (
+        row_wise(KEYS, 0).fillna("none").tolist()
+    )
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utility.encoding import DimensionEncoder
+
+
+@pytest.fixture(autouse=True)
+def dictionaries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DimensionEncoder, "_dictionaries", {})
+
+
+def test_encode_keeps_values_and_missing_entries():
+    raw = pd.DataFrame(
+        {
+            "brand_nm": ["B", "A", None, "B"],
+            "retailer_id": ["R2", "R1", "R1", np.nan],
+            "revenue": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    encoded = DimensionEncoder.encode(raw.copy())
+
+    assert isinstance(encoded["brand_nm"].dtype, pd.CategoricalDtype)
+    assert isinstance(encoded["retailer_id"].dtype, pd.CategoricalDtype)
+    assert encoded["revenue"].dtype == np.float64
+    for column in ("brand_nm", "retailer_id"):
+        assert encoded[column].isna().tolist() == raw[column].isna().tolist()
+        assert (
+            encoded[column].astype(object).dropna().tolist()
+            == raw[column].dropna().tolist()
+        )
+    assert encoded["brand_nm"].isin(["B"]).tolist() == [True, False, False, True]
+
+
+def test_columns_of_one_dimension_share_a_dictionary():
+    pricing = DimensionEncoder.encode(pd.DataFrame({"retailer_id": ["R2", "R1"]}))
+    promotion = DimensionEncoder.encode(pd.DataFrame({"retailer": ["R1"]}))
+
+    assert promotion["retailer"].cat.categories is (
+        pricing["retailer_id"].cat.categories
+    )
+
+
+def test_dictionary_grows_sorted_with_new_values():
+    first = DimensionEncoder.dictionary("brand", ["B", "A"])
+    assert DimensionEncoder.dictionary("brand", ["A"]) is first
+
+    grown = DimensionEncoder.dictionary("brand", ["C", "AA"])
+    assert grown.tolist() == ["A", "AA", "B", "C"]
+    frame = DimensionEncoder.encode(pd.DataFrame({"brand_nm": ["C", "A"]}))
+    assert frame["brand_nm"].cat.categories is grown
+
+
+def test_categorical_columns_are_left_alone():
+    own = pd.Categorical(["x", "y"], categories=["y", "x"])
+    frame = DimensionEncoder.encode(pd.DataFrame({"brand_nm": own}))
+    assert frame["brand_nm"].cat.categories.tolist() == ["y", "x"]
+
+
+def test_decode_restores_plain_values():
+    raw = pd.DataFrame({"offer_mechanic": ["BOGO", None, "TPR"]})
+    encoded = DimensionEncoder.encode(raw.copy())
+    decoded = DimensionEncoder.decode(encoded, ["offer_mechanic"])
+
+    assert not isinstance(decoded["offer_mechanic"].dtype, pd.CategoricalDtype)
+    decoded.loc[1, "offer_mechanic"] = "OTHERS"
+    assert decoded["offer_mechanic"].tolist() == ["BOGO", "OTHERS", "TPR"]
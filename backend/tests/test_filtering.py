@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.filtering import Condition, FilterSpec
+from src.utility.partitions import PartitionIndex
+from src.utility.selections import SelectionCache
+from src.utility.sorted_layout import SortedLayout, arrange
+
+
+def _spec(selection):
+    return FilterSpec(
+        [Condition(column, values) for column, values in selection.items()]
+    )
+
+
+def test_rows_match_scan(frame, scan, selections):
+    for selection in selections:
+        assert np.array_equal(_spec(selection).rows(frame), scan(frame, selection))
+
+
+def test_bitmap_rows_match_scan(frame, scan, selections):
+    index = BitmapIndex(frame)
+    view = frame.copy(deep=False)
+    for selection in selections:
+        expected = scan(frame, selection)
+        assert np.array_equal(_spec(selection).rows(frame, index=index), expected)
+        assert np.array_equal(_spec(selection).rows(view, index=index), expected)
+
+
+def test_partition_pruned_rows_match_scan(frame, scan, selections):
+    index, partitions = BitmapIndex(frame), PartitionIndex(frame)
+    for selection in selections:
+        expected = scan(frame, selection)
+        spec = _spec(selection)
+        assert np.array_equal(spec.rows(frame, partitions=partitions), expected)
+        assert np.array_equal(
+            spec.rows(frame, index=index, partitions=partitions), expected
+        )
+
+
+def test_layout_ranged_rows_match_scan(frame, scan, selections):
+    columns = ["brand_nm", "retailer", "ppg_id"]
+    df = arrange(frame, columns)
+    indexes = {
+        "index": BitmapIndex(df),
+        "partitions": PartitionIndex(df),
+        "layout": SortedLayout(df, columns),
+    }
+    for selection in selections:
+        expected = scan(df, selection)
+        assert np.array_equal(_spec(selection).rows(df, **indexes), expected)
+        assert np.array_equal(
+            _spec(selection).rows(df, layout=indexes["layout"]), expected
+        )
+
+
+def test_contiguous_selection_is_a_slice(frame):
+    columns = ["brand_nm", "retailer"]
+    df = arrange(frame, columns)
+    layout = SortedLayout(df, columns)
+    out = FilterSpec([Condition("brand_nm", ["B"])]).apply(
+        df, copy=False, layout=layout
+    )
+    assert (out["brand_nm"] == "B").all()
+    assert len(out) == (df["brand_nm"] == "B").sum()
+    assert np.shares_memory(out["revenue"].to_numpy(), df["revenue"].to_numpy())
+
+
+def test_indexes_are_not_used_on_other_rows(frame, scan, selections):
+    columns = ["brand_nm", "retailer"]
+    base = arrange(frame, columns)
+    index, partitions = BitmapIndex(base), PartitionIndex(base)
+    layout = SortedLayout(base, columns)
+    selections_cache = SelectionCache(base, 64)
+    # Fresh RangeIndex like the indexed frame, but other rows or values
+    reordered = base.iloc[::-1].reset_index(drop=True)
+    filtered = base[base["revenue"] > 50].reset_index(drop=True)
+    recomputed = base.assign(month=base["month"] % 6 + 1)
+    for df in (reordered, filtered, recomputed):
+        for selection in selections[:40]:
+            spec = _spec(selection)
+            rows = spec.rows(
+                df,
+                index=index,
+                partitions=partitions,
+                layout=layout,
+                selections=selections_cache,
+            )
+            assert np.array_equal(rows, scan(df, selection))
+
+
+def test_inactive_conditions_do_not_filter(frame):
+    spec = FilterSpec(
+        [
+            Condition("brand_nm", None),
+            Condition("retailer", []),
+            Condition("ppg_id", ["P1", "All"]),
+            Condition("category", ["x"], optional=True),
+        ]
+    )
+    assert spec.mask(frame) is None
+    assert spec.rows(frame) is None
+    assert spec.rows(frame, index=BitmapIndex(frame)) is None
+    assert spec.apply(frame, copy=False) is frame
+    applied = spec.apply(frame)
+    assert applied is not frame and applied.equals(frame)
+
+
+def test_apply_matches_take(frame, scan, selections):
+    index = BitmapIndex(frame)
+    for selection in selections[:30]:
+        expected = frame.take(scan(frame, selection))
+        pd.testing.assert_frame_equal(_spec(selection).apply(frame), expected)
+        pd.testing.assert_frame_equal(
+            _spec(selection).apply(frame, copy=False, index=index), expected
+        )
+
+
+def test_key_conditions_compare_the_derived_values(frame):
+    spec = FilterSpec([Condition("month", [1], key=lambda series: series % 6)])
+    assert np.array_equal(
+        spec.rows(frame), np.flatnonzero((frame["month"] % 6 == 1).to_numpy())
+    )
+
+
+def test_missing_values_can_be_selected_in_categoricals(frame):
+    df = frame.assign(retailer=frame["retailer"].astype("category"))
+    rows = FilterSpec([Condition("retailer", [np.nan, "R1"])]).rows(df)
+    expected = frame["retailer"].isna() | (frame["retailer"] == "R1")
+    assert np.array_equal(rows, np.flatnonzero(expected.to_numpy()))
+
+
+def test_from_model_maps_fields_to_columns(frame, scan):
+    filters = SimpleNamespace(brands=["A", "C"], ppgs=["All"], categories=["x"])
+    spec = FilterSpec.from_model(
+        filters,
+        {"brands": "brand_nm", "ppgs": "ppg_id", "categories": "category"},
+        optional=["category"],
+    )
+    assert np.array_equal(spec.rows(frame), scan(frame, {"brand_nm": ["A", "C"]}))
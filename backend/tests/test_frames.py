@@ -0,0 +1,33 @@
+import pandas as pd
+
+from src.utility.frames import shares_rows
+
+COLUMNS = ["brand_nm", "retailer", "ppg_id", "year", "revenue"]
+
+
+def test_frame_and_its_shallow_copies_share_rows(frame):
+    assert shares_rows(frame, frame, COLUMNS)
+    assert shares_rows(frame.copy(deep=False), frame, COLUMNS)
+    # New columns on a view do not matter unless they are compared
+    view = frame.copy(deep=False)
+    view["month"] = view["month"] + 1
+    assert shares_rows(view, frame, COLUMNS)
+    assert not shares_rows(view, frame, ["month"])
+
+
+def test_copies_and_other_rows_do_not(frame):
+    assert not shares_rows(frame.copy(), frame, COLUMNS)
+    assert not shares_rows(frame.head(10), frame, COLUMNS)
+    assert not shares_rows(frame.iloc[::-1].reset_index(drop=True), frame, COLUMNS)
+    assert not shares_rows(frame.drop(columns="ppg_id"), frame, COLUMNS)
+    assert not shares_rows(
+        frame.assign(year=frame["year"].astype("int32")), frame, ["year"]
+    )
+
+
+def test_string_columns_compare_their_buffers():
+    frame = pd.DataFrame({"brand_nm": pd.array(["A", "B", None], dtype="string")})
+    assert shares_rows(frame.copy(deep=False), frame, ["brand_nm"])
+    reordered = frame.iloc[::-1].reset_index(drop=True)
+    assert not shares_rows(reordered, frame, ["brand_nm"])
+    assert not shares_rows(frame.assign(brand_nm=["A", "B", "C"]), frame, ["brand_nm"])
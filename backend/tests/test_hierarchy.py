@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.controller.hierarchy_routes import add_hierarchy_route
+from src.utility.dataset_registry import Dataset
+from src.utility.hierarchy import DimensionOptions
+
+
+class Options(DimensionOptions):
+    option_columns = ("brand_nm", "retailer", "year")
+
+    def __init__(self, frame: pd.DataFrame, loaded_at: float = 0.0) -> None:
+        self.dataset = Dataset("events", Path("events.csv"), frame, loaded_at, 0.0)
+
+    def _dataset(self) -> Dataset:
+        return self.dataset
+
+
+@pytest.fixture
+def service(frame: pd.DataFrame) -> Options:
+    return Options(frame)
+
+
+@pytest.fixture
+def client(service: Options) -> TestClient:
+    router = APIRouter()
+    add_hierarchy_route(router, "/hierarchy", lambda: service, "test options")
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def decode(body: dict) -> List[tuple]:
+    """The tuples back from their dictionaries and codes."""
+    dictionaries = [body["dictionaries"][column] for column in body["columns"]]
+    return [
+        tuple(
+            values[code] if code >= 0 else None
+            for values, code in zip(dictionaries, row)
+        )
+        for row in body["rows"]
+    ]
+
+
+def test_hierarchy_encodes_the_option_table(client, service):
+    response = client.get("/hierarchy", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    body = response.json()
+    assert body["dataset"] == "events"
+    assert body["version"] == service.dataset.version
+    # Unused categories of the shared dictionaries are left out
+    assert body["dictionaries"]["brand_nm"] == ["A", "B", "C", "D"]
+    assert decode(body) == [
+        tuple(None if pd.isna(value) else value for value in row)
+        for row in service.option_table().itertuples(index=False)
+    ]
+
+
+def test_gzip_and_revalidation(client):
+    plain = client.get("/hierarchy", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/hierarchy", headers={"Accept-Encoding": "gzip"})
+
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == plain.json()
+    etag = zipped.headers["etag"]
+    assert plain.headers["etag"] == etag
+
+    for match in (etag, f'"other", {etag}', "*"):
+        revalidated = client.get("/hierarchy", headers={"If-None-Match": match})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+    assert client.get("/hierarchy", headers={"If-None-Match": '"other"'}).json()
+
+
+def test_new_dataset_version_changes_the_etag(frame, client, service):
+    etag = client.get("/hierarchy").headers["etag"]
+    service.dataset = Options(frame.head(50), loaded_at=1.0).dataset
+
+    response = client.get("/hierarchy", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_missing_data_file_is_a_server_error(service, client, monkeypatch):
+    def missing() -> Dataset:
+        raise FileNotFoundError("Data file not found: events.csv")
+
+    monkeypatch.setattr(service, "_dataset", missing)
+    response = client.get("/hierarchy")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Data file not found: events.csv"}
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from src.utility import neighbours
+from src.utility.neighbours import NeighbourIndex
+
+GROUPS = ["ppg_id", "retailer"]
+
+
+def _brute_force(frame, features, selection, point, k, allowed=None):
+    scale = features.std(axis=0)
+    hits = np.ones(len(frame), dtype=bool)
+    for column, values in selection.items():
+        hits &= frame[column].isin(values).to_numpy()
+    if allowed is not None:
+        hits &= np.isin(np.arange(len(frame)), allowed)
+    rows = np.flatnonzero(hits)
+    distances = np.linalg.norm(features[rows] / scale - point / scale, axis=1)
+    order = np.argsort(distances, kind="stable")[:k]
+    return rows[order], distances[order]
+
+
+@pytest.fixture(params=["kdtree", "brute"])
+def tree_kind(request, monkeypatch):
+    if request.param == "brute":
+        monkeypatch.setattr(neighbours, "cKDTree", None)
+    return request.param
+
+
+def test_nearest_matches_brute_force(frame, tree_kind):
+    rng = np.random.default_rng(5)
+    features = rng.random((len(frame), 3)) * [100, 30, 1]
+    index = NeighbourIndex(frame, GROUPS, features)
+    allowed = np.flatnonzero(rng.random(len(frame)) < 0.5)
+    for selection in [
+        {},
+        {"ppg_id": ["P1"]},
+        {"ppg_id": ["P2", "P3"], "retailer": ["R1"]},
+        {"ppg_id": ["absent"]},
+    ]:
+        for limit in [None, allowed]:
+            point = rng.random(3) * [100, 30, 1]
+            got = index.nearest(selection, point, 7, allowed=limit)
+            expected = _brute_force(frame, features, selection, point, 7, limit)
+            assert np.array_equal(got[0], expected[0])
+            assert np.allclose(got[1], expected[1])
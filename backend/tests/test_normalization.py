@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from src.services.cleaning_rules import PROMOTION_RULES
+from src.utility.normalization import Rule, RuleSet
+
+
+def test_steps_apply_in_order_per_distinct_value():
+    calls = []
+
+    def shout(value):
+        calls.append(value)
+        return value.upper()
+
+    rules = RuleSet("test", [Rule("brand_nm", ({"a": "b"}, shout, {"B": "Z"}))])
+    df = pd.DataFrame({"brand_nm": ["a", "b", "c", "a", "c"], "other": range(5)})
+
+    out = rules.apply(df)
+    assert out is df
+    assert df["brand_nm"].tolist() == ["Z", "Z", "C", "Z", "C"]
+    assert df["other"].tolist() == list(range(5))
+    # Mapped before the call, so "a" reaches it as "b"; once per distinct value
+    assert sorted(calls) == ["b", "b", "c"]
+
+
+def test_missing_values_and_columns_are_left_alone():
+    rules = RuleSet("test", [Rule("retailer", (str.upper,)), Rule("absent", (str,))])
+    df = pd.DataFrame({"retailer": ["x", None, np.nan, "y"]}, index=[10, 11, 12, 13])
+
+    rules.apply(df)
+    assert df["retailer"].iloc[[0, 3]].tolist() == ["X", "Y"]
+    assert df["retailer"].iloc[[1, 2]].isna().all()
+    assert "absent" not in df.columns
+    assert df.index.tolist() == [10, 11, 12, 13]
+
+
+def test_promotion_rules_normalize_loader_values():
+    raw = pd.DataFrame(
+        {
+            "promo_tactic": ["unknown", "No Tactic", "TPR Only", "Display Only"],
+            "retailer": ["Target PT", "CVS Total Corp ex HI TA", "walmart", None],
+            "offer_mechanic": ["unknown", "bogo", "unknown", "tpr"],
+            "offer_type": ["unknown", "price_off", "bogo", "unknown"],
+        }
+    )
+    cleaned = PROMOTION_RULES.apply(raw.copy())
+
+    assert cleaned["promo_tactic"].tolist() == ["Display", "Feature", "TPR", "Display"]
+    assert cleaned["retailer"].tolist()[:3] == ["TARGET", "CVS", "WALMART"]
+    assert pd.isna(cleaned["retailer"].iloc[3])
+    assert cleaned["offer_mechanic"].tolist() == [
+        "special x off",
+        "bogo",
+        "special x off",
+        "tpr",
+    ]
+    assert cleaned["offer_type"].tolist() == [
+        "SPEND REWARD",
+        "PRICE OFF",
+        "BOGO",
+        "SPEND REWARD",
+    ]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.utility.filtering import Condition, FilterSpec
+from src.utility.partitions import PartitionIndex
+
+
+def test_rows_match_scan(frame, scan):
+    index = PartitionIndex(frame)
+    assert index.columns == ("year", "month")
+    for selection in [
+        {"year": [2023]},
+        {"month": [1, 12]},
+        {"year": [2022, 2024], "month": [6, 7, 8]},
+        {"year": [1999]},
+        {},
+    ]:
+        assert np.array_equal(index.rows(selection), scan(frame, selection))
+
+
+def test_pruning_only_applies_to_the_partitioned_rows(frame, scan):
+    index = PartitionIndex(frame)
+    spec = FilterSpec([Condition("year", [2023]), Condition("ppg_id", ["P2"])])
+    selection = {"year": [2023], "ppg_id": ["P2"]}
+    for df in (
+        frame,
+        frame.copy(deep=False),
+        frame.head(10),
+        frame.iloc[::-1].reset_index(drop=True),
+    ):
+        assert np.array_equal(spec.rows(df, partitions=index), scan(df, selection))
+
+
+def test_frame_without_time_columns(frame, scan):
+    df = frame.drop(columns=["year", "month"])
+    index = PartitionIndex(df)
+    assert index.columns == ()
+    spec = FilterSpec([Condition("ppg_id", ["P1"])])
+    assert np.array_equal(spec.rows(df, partitions=index), scan(df, {"ppg_id": ["P1"]}))
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.smart_pricing_service.summary import Summary
+from src.utility.prefix_sums import PrefixSumIndex
+
+SERIES = ["brand_nm", "retailer"]
+
+
+def _naive(frame: pd.DataFrame, year: int, first: int, last: int) -> pd.DataFrame:
+    rows = frame[(frame["year"] == year) & frame["month"].between(first, last)]
+    slot = (rows["year"] - frame["year"].min()) * 12 + rows["month"] - 1
+    return (
+        rows.assign(slot=slot)
+        .groupby(SERIES, observed=True, dropna=False)
+        .agg(
+            revenue=("revenue", "sum"),
+            rows=("revenue", "size"),
+            first_slot=("slot", "min"),
+            last_slot=("slot", "max"),
+        )
+        .reset_index()
+    )
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.assign(brand_nm=df["brand_nm"].astype(str))
+    return df.sort_values(SERIES, na_position="first").reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "year, first, last",
+    [(2022, 1, 12), (2023, 4, 6), (2024, 7, 12), (2023, 5, 5), (1999, 1, 12)],
+)
+def test_range_totals_match_scan(frame, year, first, last):
+    index = PrefixSumIndex.monthly(frame, SERIES, ["revenue"])
+    got = index.totals(*index.month_range(year, first, last))
+    expected = _naive(frame, year, first, last)
+    got, expected = _sorted(got), _sorted(expected)
+    assert len(got) == len(expected)
+    pd.testing.assert_frame_equal(
+        got[SERIES], expected[SERIES], check_dtype=False, check_categorical=False
+    )
+    assert np.allclose(got["revenue"], expected["revenue"])
+    for column in ["rows", "first_slot", "last_slot"]:
+        assert got[column].tolist() == expected[column].tolist()
+
+
+def test_ranges_outside_the_index_are_empty(frame):
+    index = PrefixSumIndex.monthly(frame, SERIES, ["revenue"])
+    assert index.totals(-24, 0).empty
+    assert index.totals(index.slots, index.slots + 12).empty
+    assert list(index.totals(5, 5).columns) == SERIES + [
+        "revenue",
+        "rows",
+        "first_slot",
+        "last_slot",
+    ]
+
+
+def test_period_totals_match_scan(frame):
+    df = frame.assign(year=frame["year"].astype(str))
+    index = PrefixSumIndex.monthly(df, SERIES, ["revenue"])
+    service = SimpleNamespace(prefix_sums=lambda: index)
+    periods = ["2023 Q2", "2024", "1999 Q1", "2022 H2", "2023 Q2"]
+
+    totals = Summary._period_totals(service, Summary._period_membership(periods))
+
+    for period in dict.fromkeys(periods):
+        year, months = period.split(" ", 1)[0], Summary._period_months(period)
+        rows = df[(df["year"] == year) & df["month"].isin(months)]
+        expected = rows.groupby(SERIES, observed=True, dropna=False)["revenue"].sum()
+        got = totals[totals["time_period"] == period]
+        # A period selected twice is counted twice
+        assert len(got) == len(expected) * periods.count(period)
+        assert np.isclose(got["revenue"].sum(), expected.sum() * periods.count(period))
+        if len(rows):
+            assert got["month"].min() == rows["month"].min()
+            assert got["month_last"].max() == rows["month"].max()
+
+
+def test_period_totals_without_periods(frame):
+    index = PrefixSumIndex.monthly(frame, SERIES, ["revenue"])
+    service = SimpleNamespace(prefix_sums=lambda: index)
+    totals = Summary._period_totals(service, Summary._period_membership([]))
+    assert totals.empty
+    assert {"revenue", "year", "month", "month_last", "time_period"} <= set(
+        totals.columns
+    )
@@ -0,0 +1,248 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from src.utility import response_cache as rc
+from src.utility.response_cache import (
+    ResponseCache,
+    cached_response,
+    canonical,
+    conditional,
+)
+from src.utility.result_store import SqliteResultStore
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rc, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+class Filters(BaseModel):
+    brand: Optional[List[str]] = None
+    retailer: Optional[List[str]] = None
+    year: Optional[int] = None
+
+
+def test_canonical_ignores_order_and_all_spellings():
+    assert canonical(
+        {"brand": ["B", "A"], "retailer": ["R2", "R1"], "year": 2023}
+    ) == canonical({"year": 2023, "retailer": ["R1", "R2"], "brand": ["A", "B"]})
+    assert (
+        canonical({"brand": None})
+        == canonical({"brand": []})
+        == canonical({"brand": ["All"]})
+    )
+    assert canonical(Filters(brand=["B", "A"])) == canonical(
+        {"brand": ["A", "B"], "retailer": None, "year": None}
+    )
+    # Repeated values are counted by some services
+    assert canonical({"brand": ["A", "A"]}) != canonical({"brand": ["A"]})
+    assert canonical({"brand": ["A"]}) != canonical({"retailer": ["A"]})
+
+
+def test_ttl_expiry(clock):
+    cache = ResponseCache(8, 60)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_compute("k", compute) == 1
+    clock.now += 59
+    assert cache.get_or_compute("k", compute) == 1
+    clock.now += 1
+    assert cache.get_or_compute("k", compute) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction(clock):
+    cache = ResponseCache(2, 60)
+    for key in ["a", "b"]:
+        cache.get_or_compute(key, lambda: key)
+    cache.get_or_compute("a", lambda: pytest.fail("a is cached"))
+    cache.get_or_compute("c", lambda: "c")
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    # "b" was the least recently used
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.get_or_compute("c", lambda: pytest.fail("c is cached")) == "c"
+
+
+@pytest.mark.parametrize("entries, ttl", [(0, 60), (8, 0)])
+def test_disabled_cache_recomputes(entries, ttl):
+    cache = ResponseCache(entries, ttl)
+    assert not cache.enabled
+    first = cache.get_or_compute("k", object)
+    assert cache.get_or_compute("k", object) is not first
+    assert cache.stats()["entries"] == cache.stats()["misses"] == 0
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _flight(cache, key, compute, followers=3):
+    """Run a leader blocked in ``compute`` and ``followers`` identical requests."""
+    release = threading.Event()
+    results, errors = [], []
+
+    def blocked():
+        release.wait(5)
+        return compute()
+
+    def request():
+        try:
+            results.append(cache.get_or_compute(key, blocked))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=request) for _ in range(followers + 1)]
+    threads[0].start()
+    _wait_for(lambda: cache.stats()["in_flight"] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    _wait_for(lambda: cache.stats()["coalesced"] == followers)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+@pytest.mark.parametrize("entries", [0, 8])
+def test_single_flight(entries):
+    cache = ResponseCache(entries, 60)
+    calls = []
+    results, errors = _flight(cache, "k", lambda: calls.append(1) or object())
+    assert not errors
+    assert len(calls) == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    stats = cache.stats()
+    assert stats["in_flight"] == 0
+    assert stats["misses"] == (1 if cache.enabled else 0)
+
+
+def test_single_flight_propagates_errors():
+    cache = ResponseCache(8, 60)
+
+    def fail():
+        raise ValueError("boom")
+
+    results, errors = _flight(cache, "k", fail)
+    assert not results
+    assert len(errors) == 4 and all(isinstance(e, ValueError) for e in errors)
+    # Failures are not cached
+    assert cache.stats()["entries"] == cache.stats()["in_flight"] == 0
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_shared_store_between_caches(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    first = ResponseCache(8, 60, SqliteResultStore(path, 1 << 20, 60))
+    second = ResponseCache(8, 60, SqliteResultStore(path, 1 << 20, 60))
+    scope = ("sales", "v1")
+    assert first.get_or_compute("k", lambda: {"total": 1}, scope=scope) == {"total": 1}
+    # Another worker finds it in the store
+    assert second.get_or_compute("k", lambda: pytest.fail("stored"), scope=scope) == {
+        "total": 1
+    }
+    assert second.store.stats()["hits"] == 1
+    # Without a scope the store is not used
+    assert second.get_or_compute("other", lambda: 2) == 2
+    assert second.store.stats()["entries"] == 1
+
+
+class Service:
+    def __init__(self) -> None:
+        self.version = "v1"
+        self.calls = 0
+
+    def _dataset(self):
+        return SimpleNamespace(name="sales", version=self.version)
+
+    @cached_response
+    def build(self, filters: Filters) -> dict:
+        self.calls += 1
+        return {"calls": self.calls, "brand": filters.brand}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(rc, "response_cache", ResponseCache(8, 60))
+    return Service()
+
+
+def test_cached_response_keys_by_filters_and_dataset_version(service):
+    first = service.build(Filters(brand=["B", "A"]))
+    assert service.build(Filters(brand=["A", "B"], retailer=["All"])) is first
+    assert service.build(Filters(brand=["A"]))["calls"] == 2
+
+    service.version = "v2"
+    assert service.build(Filters(brand=["A", "B"]))["calls"] == 3
+    assert rc.response_cache.stats()["misses"] == 3
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+
+    @app.post("/build")
+    def build(payload: Filters, request: Request, response: Response):
+        return conditional(request, response, service.build, payload)
+
+    return TestClient(app)
+
+
+def test_etag_and_not_modified(client, service):
+    first = client.post("/build", json={"brand": ["B", "A"]})
+    tag = first.headers["etag"]
+    assert first.status_code == 200
+    assert tag.startswith('"') and not tag.startswith("W/")
+    assert first.headers["cache-control"] == "no-cache"
+
+    reordered = client.post("/build", json={"brand": ["A", "B"], "retailer": []})
+    assert reordered.headers["etag"] == tag
+    assert reordered.json() == first.json()
+
+    for header in [tag, f'"other", {tag}', "*"]:
+        cached = client.post(
+            "/build", json={"brand": ["A", "B"]}, headers={"If-None-Match": header}
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == tag
+
+    other = client.post("/build", json={"brand": ["A"]}, headers={"If-None-Match": tag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != tag
+    assert service.calls == 2
+
+
+def test_new_dataset_version_invalidates(client, service):
+    first = client.post("/build", json={"brand": ["A"]})
+    service.version = "v2"
+    stale = client.post(
+        "/build",
+        json={"brand": ["A"]},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert stale.status_code == 200
+    assert stale.headers["etag"] != first.headers["etag"]
+    assert stale.json()["calls"] == 2
@@ -0,0 +1,93 @@
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from src.utility import result_store
+from src.utility.result_store import SqliteResultStore
+
+SCOPE = ("sales", "v1")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_store, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "cache" / "responses.sqlite"
+
+
+def _size(value) -> int:
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_put_get_across_instances(path):
+    writer = SqliteResultStore(path, 1 << 20, 60)
+    reader = SqliteResultStore(path, 1 << 20, 60)
+    key = ("build", "sales", "v1", '{"brand": null}')
+    assert reader.get(key) is None
+    writer.put(key, SCOPE, {"rows": [1, 2, 3]})
+    assert reader.get(key) == {"rows": [1, 2, 3]}
+    assert reader.stats()["hits"] == reader.stats()["misses"] == 1
+    assert reader.stats()["entries"] == 1
+
+
+def test_size_eviction_keeps_recently_read(path, clock):
+    value = "x" * 1000
+    store = SqliteResultStore(path, 2 * _size(value), 60)
+    store.put("k1", SCOPE, value)
+    clock.now += 1
+    store.put("k2", SCOPE, value)
+    clock.now += 1
+    assert store.get("k1") == value
+    clock.now += 1
+    store.put("k3", SCOPE, value)
+    assert store.get("k2") is None
+    assert store.get("k1") == store.get("k3") == value
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_oversize_entry_is_not_stored(path):
+    store = SqliteResultStore(path, 100, 60)
+    store.put("big", SCOPE, "x" * 1000)
+    assert store.get("big") is None
+    assert store.stats()["entries"] == 0
+
+
+def test_new_version_drops_older_versions(path):
+    store = SqliteResultStore(path, 1 << 20, 60)
+    store.put("old", ("sales", "v1"), 1)
+    store.put("other", ("promotions", "v1"), 2)
+    store.put("new", ("sales", "v2"), 3)
+    assert store.get("old") is None
+    assert store.get("other") == 2
+    assert store.get("new") == 3
+
+
+def test_entries_expire(path, clock):
+    store = SqliteResultStore(path, 1 << 20, 60)
+    store.put("k", SCOPE, 1)
+    clock.now += 59
+    assert store.get("k") == 1
+    clock.now += 1
+    assert store.get("k") is None
+
+
+def test_unreadable_entry_is_a_miss(path):
+    store = SqliteResultStore(path, 1 << 20, 60)
+    store.put("k", SCOPE, 1)
+    store._connection().execute("UPDATE responses SET value = x'00'")
+    assert store.get("k") is None
+    assert store.stats()["errors"] == 1
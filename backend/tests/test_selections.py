@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utility.bitmap_index import BitmapIndex
+from src.utility.filtering import Condition, FilterSpec
+from src.utility.partitions import PartitionIndex
+from src.utility.selections import SelectionCache
+from src.utility.sorted_layout import SortedLayout, arrange
+
+
+def _spec(selection):
+    return FilterSpec(
+        [Condition(column, values) for column, values in selection.items()]
+    )
+
+
+def test_rows_match_scan_with_every_index(frame, scan, selections):
+    layout_columns = ["brand_nm", "retailer", "ppg_id"]
+    sorted_frame = arrange(frame, layout_columns)
+    for df, layout in [
+        (frame, None),
+        (sorted_frame, SortedLayout(sorted_frame, layout_columns)),
+    ]:
+        indexes = {
+            "index": BitmapIndex(df),
+            "partitions": PartitionIndex(df),
+            "layout": layout,
+            "selections": SelectionCache(df, 32),
+        }
+        for selection in selections:
+            expected = scan(df, selection)
+            spec = _spec(selection)
+            assert np.array_equal(spec.rows(df), expected)
+            assert np.array_equal(spec.rows(df, index=indexes["index"]), expected)
+            assert np.array_equal(spec.rows(df, **indexes), expected)
+            # Second lookup answers from the selection cache
+            assert np.array_equal(spec.rows(df, **indexes), expected)
+
+
+def test_selection_cache_is_order_insensitive(frame, scan):
+    cache = SelectionCache(frame, 8)
+    first = FilterSpec(
+        [Condition("ppg_id", ["P1", "P3"]), Condition("year", [2023, 2022])]
+    ).rows(frame, selections=cache)
+    second = FilterSpec(
+        [Condition("year", [2022, 2023]), Condition("ppg_id", ["P3", "P1"])]
+    ).rows(frame, selections=cache)
+    assert second is first
+    assert not second.flags.writeable
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert np.array_equal(
+        first, scan(frame, {"ppg_id": ["P1", "P3"], "year": [2022, 2023]})
+    )
+
+
+def test_selection_cache_skips_key_conditions_and_other_frames(frame):
+    cache = SelectionCache(frame, 8)
+    keyed = FilterSpec([Condition("month", [1], key=lambda series: series % 6)])
+    assert np.array_equal(
+        keyed.rows(frame, selections=cache),
+        np.flatnonzero((frame["month"] % 6 == 1).to_numpy()),
+    )
+    FilterSpec([Condition("ppg_id", ["P1"])]).rows(frame.head(10), selections=cache)
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("entries", [0, 2])
+def test_selection_cache_bound(frame, entries):
+    cache = SelectionCache(frame, entries)
+    for ppg in ["P1", "P2", "P3"]:
+        FilterSpec([Condition("ppg_id", [ppg])]).rows(frame, selections=cache)
+    assert cache.stats()["entries"] == entries
+
+
+def test_selection_cache_keys_by_column():
+    df = pd.DataFrame({"left": ["a", "a", "b"], "right": ["b", "a", "a"]})
+    cache = SelectionCache(df, 8)
+    left = FilterSpec([Condition("left", ["a"])]).rows(df, selections=cache)
+    right = FilterSpec([Condition("right", ["a"])]).rows(df, selections=cache)
+    assert left.tolist() == [0, 1]
+    assert right.tolist() == [1, 2]
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utility import snapshot
+from src.utility.settings import settings
+from src.utility.snapshot import Fingerprint, SnapshotStore
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def store_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "snapshot_enabled", True)
+    monkeypatch.setattr(settings, "snapshot_dir", tmp_path / "snapshots")
+    return tmp_path / "snapshots"
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "history.csv"
+    path.write_text("brand_nm,revenue\nA,1.5\nB,2.0\n")
+    return path
+
+
+@pytest.fixture
+def cleaned() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "brand_nm": pd.Categorical(["A", "B", "A"], categories=["A", "B", "C"]),
+            "retailer": ["R1", None, "R2"],
+            "year": np.array([2023, 2023, 2024], dtype=np.int16),
+            "revenue": [1.5, np.nan, 3.25],
+        }
+    )
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_write_then_read_round_trips(store_dir, source, cleaned, monkeypatch, mmap):
+    monkeypatch.setattr(settings, "snapshot_mmap", mmap)
+    fingerprint = Fingerprint.of(source)
+    SnapshotStore.write("pricing", source, fingerprint, 1, cleaned)
+
+    read = SnapshotStore.read("pricing", source, fingerprint, 1)
+    pd.testing.assert_frame_equal(read, cleaned)
+    assert not list(store_dir.glob("*.tmp"))
+
+
+def test_read_misses_other_versions_and_changed_sources(store_dir, source, cleaned):
+    fingerprint = Fingerprint.of(source)
+    SnapshotStore.write("pricing", source, fingerprint, 1, cleaned)
+    assert SnapshotStore.read("pricing", source, fingerprint, 2) is None
+
+    source.write_text("brand_nm,revenue\nA,9.0\n")
+    assert SnapshotStore.read("pricing", source, Fingerprint.of(source), 1) is None
+
+
+def test_write_replaces_the_stale_snapshot_of_the_same_source(
+    store_dir, source, cleaned
+):
+    SnapshotStore.write("pricing", source, Fingerprint.of(source), 1, cleaned)
+    SnapshotStore.write("pricing", source, Fingerprint.of(source), 2, cleaned)
+    assert len(list(store_dir.glob("*.arrow"))) == 1
+    assert SnapshotStore.read("pricing", source, Fingerprint.of(source), 2) is not None
+
+
+def test_unreadable_snapshot_is_ignored(store_dir, source, cleaned):
+    fingerprint = Fingerprint.of(source)
+    SnapshotStore.write("pricing", source, fingerprint, 1, cleaned)
+    (path,) = store_dir.glob("*.arrow")
+    path.write_bytes(b"not arrow")
+    assert SnapshotStore.read("pricing", source, fingerprint, 1) is None
+
+
+def test_disabled_store_neither_writes_nor_reads(
+    store_dir, source, cleaned, monkeypatch
+):
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+    fingerprint = Fingerprint.of(source)
+    SnapshotStore.write("pricing", source, fingerprint, 1, cleaned)
+    assert not store_dir.exists()
+    assert SnapshotStore.read("pricing", source, fingerprint, 1) is None
+
+
+@pytest.mark.skipif(snapshot.fcntl is None, reason="needs fcntl")
+def test_lock_excludes_other_holders(store_dir, source):
+    fcntl = snapshot.fcntl
+    with SnapshotStore.lock("pricing", source):
+        (lock_path,) = store_dir.glob("*.lock")
+        # flock locks belong to the open file, so a second open conflicts
+        # even within this process
+        with open(lock_path, "w") as fh:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    with open(lock_path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fh, fcntl.LOCK_UN)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from src.utility.sorted_layout import SortedLayout, arrange
+
+KEY = ["brand_nm", "retailer", "ppg_id"]
+
+
+def test_arrange_sorts_stably_by_the_key(frame):
+    df = arrange(frame, KEY)
+    expected = frame.assign(_pos=np.arange(len(frame))).sort_values(
+        KEY + ["_pos"], kind="stable", na_position="first"
+    )
+    pd.testing.assert_frame_equal(
+        df, expected.drop(columns="_pos").reset_index(drop=True)
+    )
+    assert arrange(df, KEY) is df
+
+
+def test_leading_prefix_matches_scan(frame, scan):
+    df = arrange(frame, KEY)
+    layout = SortedLayout(df, KEY)
+    rng = np.random.default_rng(3)
+    for _ in range(100):
+        depth = rng.integers(1, len(KEY) + 1)
+        selection = {}
+        for column in KEY[:depth]:
+            values = pd.unique(df[column].dropna()).tolist() + ["absent"]
+            picked = rng.choice(len(values), rng.integers(1, 3), replace=False)
+            selection[column] = [values[i] for i in picked]
+        assert np.array_equal(layout.rows(selection), scan(df, selection))
+        slices = layout.slices(selection)
+        # Disjoint, ascending ranges
+        assert all(a < b for a, b in slices)
+        assert all(b <= c for (_, b), (c, _) in zip(slices, slices[1:]))
+
+
+def test_selection_past_a_gap_only_uses_the_prefix(frame, scan):
+    df = arrange(frame, KEY)
+    layout = SortedLayout(df, KEY)
+    # ppg_id is not narrowed without retailer, so only brand_nm applies
+    selection = {"brand_nm": ["A"], "ppg_id": ["P1"]}
+    assert np.array_equal(layout.rows(selection), scan(df, {"brand_nm": ["A"]}))
+
+
+def test_missing_values_sort_first_and_are_selectable(frame, scan):
+    df = arrange(frame, ["retailer"])
+    layout = SortedLayout(df, ["retailer"])
+    missing = df["retailer"].isna().to_numpy()
+    assert missing[: missing.sum()].all()
+    assert np.array_equal(layout.rows({"retailer": [np.nan]}), np.flatnonzero(missing))
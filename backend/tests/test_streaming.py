@@ -0,0 +1,136 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utility.csv_schema import CODE, FLOAT, TEXT, CsvSchema
+from src.utility.encoding import DimensionEncoder
+from src.utility.streaming import Aggregate, StreamingIngest, StreamJob
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+SCHEMA = CsvSchema(
+    {
+        "brand_nm": TEXT,
+        "retailer": TEXT,
+        "promo": TEXT,
+        "year": CODE,
+        "month": CODE,
+        "revenue": FLOAT,
+    }
+)
+
+KEYS = ("year", "brand_nm", "retailer")
+
+
+@pytest.fixture(autouse=True)
+def dictionaries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DimensionEncoder, "_dictionaries", {})
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    rng = np.random.default_rng(3)
+    n = 500
+    promo = np.where(rng.random(n) < 0.5, "TPR", None)
+    # Whole chunks without a promo value, as at the start of a history file
+    promo[:60] = None
+    frame = pd.DataFrame(
+        {
+            # Brands appear over time, so chunk dictionaries differ
+            "brand_nm": [f"B{int(i * 6 / n)}{rng.integers(2)}" for i in range(n)],
+            "retailer": rng.choice(["r1", "r2", "r3"], n),
+            "promo": promo,
+            "year": rng.choice([2022, 2023], n),
+            "month": rng.integers(1, 13, n),
+            "revenue": np.round(rng.normal(50, 40, n), 2),
+        }
+    )
+    path = tmp_path / "history.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[df["revenue"] > 0].copy()
+    df["retailer"] = df["retailer"].str.upper()
+    # As under pandas < 3: an all-missing chunk then converts to Arrow nulls
+    df["promo"] = df["promo"].astype(object)
+    return DimensionEncoder.encode(df)
+
+
+def job(source: Path) -> StreamJob:
+    return StreamJob(
+        name="history",
+        source=source,
+        schema=SCHEMA,
+        clean=clean,
+        partition_by=("year",),
+        aggregates=(Aggregate("revenue", KEYS, ("revenue",)),),
+    )
+
+
+def plain(df: pd.DataFrame) -> pd.DataFrame:
+    """Comparable values: no categoricals, fixed column and row order."""
+    df = DimensionEncoder.decode(df.copy(), ["brand_nm", "retailer"])
+    df = df.astype({c: "int64" for c in ("year", "month") if c in df.columns})
+    columns = sorted(df.columns)
+    return df[columns].sort_values(columns, ignore_index=True)
+
+
+def test_stream_matches_a_whole_file_load(source, tmp_path):
+    whole = clean(SCHEMA.read(source))
+    manifest = StreamingIngest(job(source), tmp_path / "out", chunk_rows=13).run()
+
+    target = tmp_path / "out" / "history"
+    assert json.loads((target / "_manifest.json").read_text()) == manifest
+    assert manifest["chunks"] == 39
+    assert manifest["rows_read"] == 500
+    assert manifest["rows_written"] == len(whole)
+
+    data = pq.read_table(target / "data").to_pandas()
+    data["year"] = data["year"].astype("int64")
+    assert sorted(path.name for path in (target / "data").iterdir()) == [
+        "year=2022",
+        "year=2023",
+    ]
+    pd.testing.assert_frame_equal(
+        plain(data), plain(whole), check_dtype=False, check_categorical=False
+    )
+
+    totals = pq.read_table(target / "aggregates" / "revenue.parquet").to_pandas()
+    grouped = whole.groupby(list(KEYS), observed=True)["revenue"]
+    expected = grouped.sum().to_frame().assign(rows=grouped.size()).reset_index()
+    pd.testing.assert_frame_equal(
+        plain(totals), plain(expected), check_dtype=False, check_exact=False
+    )
+
+
+def test_rerun_replaces_the_previous_output(source, tmp_path):
+    out = tmp_path / "out"
+    StreamingIngest(job(source), out, chunk_rows=100).run()
+    StreamingIngest(job(source), out, chunk_rows=250).run()
+
+    assert sorted(path.name for path in out.iterdir()) == ["history"]
+    assert len(pq.read_table(out / "history" / "data")) == len(
+        clean(SCHEMA.read(source))
+    )
+
+
+def test_failed_run_keeps_the_previous_output(source, tmp_path):
+    out = tmp_path / "out"
+    StreamingIngest(job(source), out, chunk_rows=100).run()
+    before = (out / "history" / "_manifest.json").read_text()
+
+    def broken(df: pd.DataFrame) -> pd.DataFrame:
+        raise ValueError("bad chunk")
+
+    failing = job(source)
+    failing.clean = broken
+    with pytest.raises(ValueError):
+        StreamingIngest(failing, out, chunk_rows=100).run()
+
+    assert sorted(path.name for path in out.iterdir()) == ["history"]
+    assert (out / "history" / "_manifest.json").read_text() == before
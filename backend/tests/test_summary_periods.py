@@ -0,0 +1,36 @@
+import pytest
+
+from src.services.smart_pricing_service.summary import Summary
+
+
+@pytest.mark.parametrize(
+    "label, months",
+    [
+        ("2023", list(range(1, 13))),
+        ("2023 H1", list(range(1, 7))),
+        ("2023 h2", list(range(7, 13))),
+        ("2023 Q3", [7, 8, 9]),
+        ("2023  q4 ", [10, 11, 12]),
+    ],
+)
+def test_period_months(label, months):
+    assert Summary._period_months(label) == months
+
+
+@pytest.mark.parametrize("label", ["2023 Q5", "2023 Q", "2023 QX", "2023 X"])
+def test_unknown_buckets_are_rejected(label):
+    with pytest.raises(ValueError, match="Unknown time period"):
+        Summary._period_months(label)
+    with pytest.raises(ValueError):
+        Summary._period_membership(["2023 Q1", label])
+
+
+def test_membership_has_a_row_per_month_of_each_selected_period():
+    membership = Summary._period_membership(["2022 Q4", "2023 H1", "2022 Q4"])
+
+    assert membership["period"].value_counts().sort_index().tolist() == [3, 6, 3]
+    first = membership[membership["period"] == 0]
+    assert first["year"].tolist() == ["2022"] * 3
+    assert first["month"].tolist() == [10, 11, 12]
+    assert set(membership["time_period"]) == {"2022 Q4", "2023 H1"}
+    assert Summary._period_membership([]).empty